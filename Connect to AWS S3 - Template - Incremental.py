@@ -1,254 +1,520 @@
-"""
-    The "Connect to AWS S3 - Template" file showcases how to pull data from an AWS S3 Bucket, looping through all files within the AWS S3 Bucket, then loading the data into a Pandas DataFrame
-
-    Data Pipeline Process:
-
-        Step 1: Install Required Python Packages
-
-        Step 2: Install Required Python Libraries
-
-        Step 3: Setup the credentials to connect to the AWS S3 Bucket
-
-        Step 4: Connect to the AWS S3 Bucket
-
-        Step 5: Collect a list of file names for all files within the AWS S3 Bucket
-
-        Step 6: Extract the data from the file(s) within the AWS S3 Bucket and load into a Pandas DataFrame
-
-        Step 7: Select the columns to keep from the Pandas DataFrame
-"""
-
-
-##############################################################################################################
-# Step 1: Install Required Python Packages
-    # Install all of the require Python packages in order to perform the necessary actions within the Python notebook
-        # This section is only used for tools that require you to install all of the necessary packages before each time the code is executed, such as Databricks
-##############################################################################################################
-
-
-# Install the boto3 Python package
-    # Used to connect to AWS services, like S3 Bucket	
-%pip install boto3
-
-# Install the datetime Python package
-    # Used when working with and manipulating dates and times	
-%pip install datetime
-
-# Install the pandas Python package
-    # Used to store data in Series and DataFrames	
-%pip install pandas
-
-# Restart the kernel to use updated packages
-    # Databricks specific command that is required to use any newly install Python packages listed above
-%restart_python
-
-
-##############################################################################################################
-# Step 2: Install Required Python Libraries
-    # Install all of the require Python libraries in order to perform the necessary actions within the Python notebook
-##############################################################################################################
-
-
-# Used when working with and manipulating dates and times
-from datetime import datetime, timedelta
-
-# Enables the ability to connect to multiple AWS services, such as S3 Bucket
-import boto3
-
-# Enables the ability to utilize DataFrames, which are 2 dimension data structures, such as a 2-dimension arrays or a tables with rows and columns
-import pandas as pd
-
-
-##############################################################################################################
-# Step 3: Setup the credentials to connect to the AWS S3 Bucket
-##############################################################################################################
-
-
-# The access ID assigned to the account connecting to the AWS service
-s3_access_id = "<AWS_S3_Access_ID>"
-
-# The access key assigned to the account connecting to the AWS service
-s3_secret_access_key = "<AWS_S3_Access_Key>"
-
-# The AWS service that you would like to connect to
-aws_service = "s3"
-
-# The AWS region that the AWS service is set to
-aws_region_name = "<AWS_Region>"
-
-# The AWS S3 Bucket that you would like to connect to
-s3_bucket = "<AWS_S3_Bucket>"
-
-# The report associated with the file within the AWS S3 Bucket
-    # Available datasets assigned to the account connecting to the AWS service
-file_name = "<File_Name>"
-
-# The extension of the file within the AWS S3 Bucket
-file_extension = "<File_Extension>"
-
-# The list collect the name for all of the files within the S3 bucket
-    # This will allow us to verify if the file that we would like to extract exists
-        # If the file does not exist, the data pipeline will not try to extract the file
-            # This will prevent the data pipeline from failing
-s3_file_list = []
-
-# The date used to calulate the date variables below
-today = datetime.now()
-
-# The date that the GET request is being executed
-    # The date the data pipeline is executed
-file_date = today.strftime("%Y%m%d")
-
-# The year part of the file name within the AWS S3 Bucket
-s3_file_year = (today - timedelta(days = 3)).strftime("%Y")
-
-# The month part of the file name within the AWS S3 Bucket
-s3_file_month = (today - timedelta(days = 3)).strftime("%m")
-
-# The day part of the file name within the AWS S3 Bucket
-s3_file_day = (today - timedelta(days = 3)).strftime("%d")
-
-# The file within the AWS S3 Bucket that you would like to extract
-    # Adjust the variables within the s3_file_name variable to include all required variable values
-s3_file_name = f"{file_name}.{file_extension}"
-
-
-##############################################################################################################
-# Step 4: Connect to the AWS S3 Bucket
-##############################################################################################################
-
-
-# Connect to the AWS S3 Bucket
-    # The connection to the AWS S3 Bucket does not allow using the with function
-        # The connection to the AWS S3 Bucket closes automatically and does not use the close() command
-s3 = boto3.resource(
-    service_name = aws_service
-    ,region_name = aws_region_name
-    ,aws_access_key_id = s3_access_id
-    ,aws_secret_access_key = s3_secret_access_key
-)
-
-
-##############################################################################################################
-# Step 5: Collect a list of file names for all files within the AWS S3 Bucket
-##############################################################################################################
-
-
-# Loop through each file within the AWS S3 Bucket
-for s3_bucket_file in s3.Bucket(s3_bucket).objects.all():
-
-    # Display all of the file names within the AWS S3 Bucket
-        # Comment Out once the files have been verified
-    # print()
-    # print(s3_bucket_file.key)
-
-    # Collect the name of each file within the AWS S3 Bucket
-    s3_file_list.append(s3_bucket_file.key)
-
-"""
-# Display all of the files within the AWS S3 Bucket
-    # Comment Out once the files have been verified
-print()
-print("AWS S3 Bucket Files:")
-print()
-print(s3_file_list)
-"""
-
-
-##############################################################################################################
-# Step 6: Extract the data from the file(s) within the AWS S3 Bucket and load into a Pandas DataFrame
-##############################################################################################################
-
-
-# Verify if the desired file name exists within the AWS S3 Bucket
-    # If the file exists within the AWS S3 Bucket, extaract the file
-if s3_file_name in s3_file_list:
-
-    # Extract the data from the file within the AWS S3 Bucket
-    s3_file = s3.Bucket(s3_bucket).Object(s3_file_name).get()
-    
-    # ***** Choose one of the 2 df = pd.read_csv functions below *****
-    
-    # Load the data from s3_file into the df Pandas DataFrame
-    df = pd.read_csv(
-        s3_file['Body']
-        ,sep = "<field_delimiter>"
-        ,index_col = 0
-    )
-    
-    # Load the SFTP file into the a Pandas DataFrame, specifying the column names
-    df = pd.read_csv(
-        s3_file['Body']
-        ,index_col = 0
-        ,sep = "<field_delimiter>"
-        # the names variable is used to specify columns names, if they do NOT exist or if you want to rename them from what they currently are
-        ,names = [
-            'column_1'
-            ,'column_2'
-            ,'column_N'
-        ]
-    )
-
-    """
-    # Verify if there is any data within the df Pandas DataFrame
-        # Comment out once the data has been verified
-    if not df.empty:
-
-        print("The df Pandas DataFrame contains data:")
-        print()
-        print(df)
-
-    else:
-
-        print("The df Pandas DataFrame is empty")
-    """
-
-
-##############################################################################################################
-# Step 7: Select the columns to keep from the Pandas DataFrame
-##############################################################################################################
-
-
-"""
-# Display the columns within the df Pandas DataFrame
-    # This will allow you to identify the columns within the dataset
-        # This allows you to be able to remove any unecessary columns, using df_subset below, from the dataset before loading into Snowflake
-print()
-print("Here are all of the columns within the df Pandas DataFrame")
-print()
-print(df.columns)
-"""
-
-# Select the desired columns to keep from the df Pandas DataFrame
-    # This method is used to remove any unwanted data that was extracted from the file within the AWS S3 Bucket
-        # This is similar to the SELECT clause in SQL
-df_subset = df[
-    [
-        '<Column_1>'
-        ',<Column_2>'
-        ,'<Column_...N>'
-    ]
-]
-
-"""
-# Verify if there is any data within the df_subset Pandas DataFrame
-    # Comment out once the data has been verified
-if not df_subset.empty:
-
-    print('The df_subset Pandas DataFrame contains data:')
-    print()
-    print(df_subset)
-
-else:
-
-    print('The df_subset Pandas DataFrame is empty')
-"""
-
-
-"""
-# Display a message that informs the developer that the Python data pipeline has completed
-    # Comment out once the entire data pipeline has completed successfully
-print()
-print("The <DATA_SOURCE_NAME> <DATASET_NAME> Data Load Notebook has completed successfully")
-print()
-"""
+"""
+    The "Connect to AWS S3 - Template" file showcases how to pull data from an AWS S3 Bucket, looping through the files within the AWS S3 Bucket that begin with a prefix and have not already been loaded, then loading the data into a Pandas DataFrame
+
+    A manifest of every file that has been loaded is kept within a SQLite database, along with a watermark of the last file name that has been loaded
+        Each time the data pipeline is executed, only the files after the watermark are listed, and files that have not changed since they were loaded are skipped
+            This ensures the time it takes to execute the data pipeline depends on the amount of new data, rather than the number of files within the AWS S3 Bucket
+
+    Data Pipeline Process:
+
+        Step 1: Install Required Python Packages
+
+        Step 2: Install Required Python Libraries
+
+        Step 3: Setup the credentials to connect to the AWS S3 Bucket
+
+        Step 4: Connect to the AWS S3 Bucket
+
+        Step 5: Open the manifest of the file(s) that have already been loaded
+
+        Step 6: Collect a list of the new file(s) within the AWS S3 Bucket that begin with the prefix
+
+        Step 7: Extract the data from the new file(s) within the AWS S3 Bucket and load into a Pandas DataFrame
+
+        Step 8: Consolidate all lists within the all_data list into 1 Pandas Dataframe
+
+        Step 9: Select the columns to keep from the Pandas DataFrame
+
+        Step 10: Record the loaded file(s) within the manifest
+"""
+
+
+##############################################################################################################
+# Step 1: Install Required Python Packages
+    # Install all of the require Python packages in order to perform the necessary actions within the Python notebook
+        # This section is only used for tools that require you to install all of the necessary packages before each time the code is executed, such as Databricks
+##############################################################################################################
+
+
+# Install the boto3 Python package
+    # Used to connect to AWS services, like S3 Bucket	
+%pip install boto3
+
+# Install the pandas Python package
+    # Used to store data in Series and DataFrames	
+%pip install pandas
+
+# Install the zstandard Python package
+    # Used to decompress and compress files using zstd, such as .csv.zst files
+%pip install zstandard
+
+# Install the pyarrow Python package
+    # Used by the "pyarrow" engine of pd.read_csv, which loads each file using multiple threads
+%pip install pyarrow
+
+# Restart the kernel to use updated packages
+    # Databricks specific command that is required to use any newly install Python packages listed above
+%restart_python
+
+
+##############################################################################################################
+# Step 2: Install Required Python Libraries
+    # Install all of the require Python libraries in order to perform the necessary actions within the Python notebook
+##############################################################################################################
+
+
+# Used when working with and manipulating dates and times
+from datetime import datetime
+
+# Enables the ability to connect to multiple AWS services, such as S3 Bucket
+import boto3
+
+# Enables the ability to search for file names based on specified string pattern(s)
+    # Resource: https://docs.python.org/3/library/fnmatch.html
+import fnmatch
+
+# Enables the ability to utilize DataFrames, which are 2 dimension data structures, such as a 2-dimension arrays or a tables with rows and columns
+import pandas as pd
+
+# Enables the ability to create and query a SQLite database, which is stored within a single file
+    # Resource: https://docs.python.org/3/library/sqlite3.html
+import sqlite3
+
+
+##############################################################################################################
+# Step 3: Setup the credentials to connect to the AWS S3 Bucket
+##############################################################################################################
+
+
+# The access ID assigned to the account connecting to the AWS service
+s3_access_id = "<AWS_S3_Access_ID>"
+
+# The access key assigned to the account connecting to the AWS service
+s3_secret_access_key = "<AWS_S3_Access_Key>"
+
+# The AWS service that you would like to connect to
+aws_service = "s3"
+
+# The AWS region that the AWS service is set to
+aws_region_name = "<AWS_Region>"
+
+# The AWS S3 Bucket that you would like to connect to
+s3_bucket = "<AWS_S3_Bucket>"
+
+# The report associated with the file within the AWS S3 Bucket
+    # Available datasets assigned to the account connecting to the AWS service
+file_name = "<File_Name>"
+
+# The extension of the file within the AWS S3 Bucket
+file_extension = "<File_Extension>"
+
+# The pattern of the file name(s) within the AWS S3 Bucket, which is a consolidation of the following 2 parts:
+    # file_name - The name of the file within the AWS S3 Bucket
+    # file_extension - The extension of the file within the AWS S3 Bucket
+s3_file_name_pattern = f"*{file_name}*.{file_extension}"
+
+# The columns to keep from the file(s) within the AWS S3 Bucket, and the data type of each column
+    # Only these columns are parsed from the file(s) within the AWS S3 Bucket, rather than parsing every column and removing the unwanted columns afterwards
+        # This is similar to the SELECT clause in SQL
+    # pd.read_csv raises a ValueError if any of these columns do not exist within the file(s)
+        # This ensures that the data pipeline fails immediately, rather than loading incomplete data into the destination location
+file_columns = {
+    '<Column_1>': 'string'
+    ,'<Column_2>': 'float64'
+    ,'<Column_...N>': 'string'
+}
+
+# The engine used to load the data within each file into a Pandas DataFrame
+    # "pyarrow" - Parses blocks of the file using multiple threads, which is usually several times faster than "c" for large files
+        # The delimiter must be a single character, and options such as chunksize, nrows, skipfooter, comment and thousands are not supported
+    # "c" - The default engine of pd.read_csv, which parses the file using 1 thread and supports every pd.read_csv option
+        # Use "c" for files that require options the "pyarrow" engine does not support
+    # To compare both engines using files with a similar size, number of columns and delimiter, use the benchmark_read_file function within the data_connectors files connector
+parse_engine = "pyarrow"
+
+# The compression of the file(s), identified from the file_extension variable, such as "csv.gz" or "csv.zst"
+    # pd.read_csv decompresses the data as it is read, straight from the AWS S3 Bucket, rather than downloading and decompressing the entire file first
+        # Nothing is written to disk, and only the compressed data is transferred over the network
+    # None for files that are not compressed, such as "csv"
+        # "zstd" requires the zstandard Python package
+file_compression = {"gz": "gzip", "gzip": "gzip", "bz2": "bz2", "zst": "zstd", "zstd": "zstd"}.get(file_extension.rsplit(".", 1)[-1].lower())
+
+# The prefix that all of the file(s) within the AWS S3 Bucket that you would like to extract begin with
+    # Only the files that begin with the prefix are listed, rather than all files within the AWS S3 Bucket
+        # Adjust the s3_file_prefix variable to match the folder and naming structure of the file(s), such as:
+            # f"{file_name}/"
+            # f"{file_name}_"
+s3_file_prefix = f"{file_name}"
+
+# The number of file names returned per request when listing the files within the AWS S3 Bucket
+    # 1000 is the maximum number of file names allowed by AWS S3
+s3_page_size = 1000
+
+# The number of rows that are loaded into a Pandas DataFrame at a time, when streaming the file within the AWS S3 Bucket in chunks
+    # Only 1 chunk is held in memory at a time, therefore the memory used depends on chunk_size rather than the size of the file
+chunk_size = 100000
+
+# The location of the SQLite database file that contains the manifest of loaded files and the watermark
+    # The file must be stored in a location that is kept between each execution of the data pipeline, such as a mounted storage volume
+        # The SQLite database file is created automatically the first time the data pipeline is executed
+manifest_path = "<Path_To_Manifest_Folder>/s3_manifest.db"
+
+# Identifies if the watermark is ignored, rather than only listing the files after the last file name that has been loaded
+    # Set to True to list all files that begin with the s3_file_prefix variable, such as when older files have been replaced within the AWS S3 Bucket
+        # The files that have not changed since they were loaded are still skipped, using the manifest
+s3_ignore_watermark = False
+
+# The list collects the name, ETag, size and last modified date of each new file within the S3 bucket
+    # A file is new if it has not been loaded before, or if it has changed since it was loaded
+new_s3_file_list = []
+
+# The list will consolidate all S3 csv files
+    # Consolidating all S3 csv files into a list, then converting the entire list into a DataFrame
+    # prevents multiple DataFrames from being created in the for loop
+        # This method is more effiecient and less computational than converting each dictionary into a DataFrame
+        # and appending to one another, then consolidating all DataFrames into one
+all_data = []
+
+
+##############################################################################################################
+# Step 4: Connect to the AWS S3 Bucket
+##############################################################################################################
+
+
+# Connect to the AWS S3 Bucket
+    # The connection to the AWS S3 Bucket does not allow using the with function
+        # The connection to the AWS S3 Bucket closes automatically and does not use the close() command
+s3 = boto3.resource(
+    service_name = aws_service
+    ,region_name = aws_region_name
+    ,aws_access_key_id = s3_access_id
+    ,aws_secret_access_key = s3_secret_access_key
+)
+
+
+##############################################################################################################
+# Step 5: Open the manifest of the file(s) that have already been loaded
+##############################################################################################################
+
+
+# Connect to the SQLite database that contains the manifest and the watermark
+    # The connection is closed at the end of the data pipeline, using the manifest_conn.close() command
+manifest_conn = sqlite3.connect(manifest_path)
+
+# Create the table that contains 1 row per file that has been loaded, if the table does not already exist
+    # The ETag changes whenever the data within the file changes, which allows us to identify files that have changed since they were loaded
+manifest_conn.execute("""
+    CREATE TABLE IF NOT EXISTS s3_manifest (
+        bucket TEXT NOT NULL
+        ,key TEXT NOT NULL
+        ,etag TEXT NOT NULL
+        ,size INTEGER NOT NULL
+        ,last_modified TEXT NOT NULL
+        ,loaded_at TEXT NOT NULL
+        ,PRIMARY KEY (bucket, key)
+    )
+""")
+
+# Create the table that contains the watermark, which is the last file name that has been loaded per AWS S3 Bucket and prefix, if the table does not already exist
+manifest_conn.execute("""
+    CREATE TABLE IF NOT EXISTS s3_watermark (
+        bucket TEXT NOT NULL
+        ,prefix TEXT NOT NULL
+        ,last_key TEXT NOT NULL
+        ,PRIMARY KEY (bucket, prefix)
+    )
+""")
+
+# Retrieve the watermark for the AWS S3 Bucket and prefix
+    # If no files have been loaded yet, the watermark is an empty string, which lists all files that begin with the s3_file_prefix variable
+watermark_row = manifest_conn.execute(
+    "SELECT last_key FROM s3_watermark WHERE bucket = ? AND prefix = ?"
+    ,(s3_bucket, s3_file_prefix)
+).fetchone()
+
+s3_start_after = "" if watermark_row is None or s3_ignore_watermark else watermark_row[0]
+
+"""
+# Display the watermark
+    # Comment out once the watermark has been verified
+print()
+print(f"Listing the files within the AWS S3 Bucket after: {s3_start_after}")
+print()
+"""
+
+
+##############################################################################################################
+# Step 6: Collect a list of the new file(s) within the AWS S3 Bucket that begin with the prefix
+##############################################################################################################
+
+
+# Establish a paginator, which lists the files within the AWS S3 Bucket 1 page at a time
+    # The paginator reuses the client from the s3 connection above, rather than establishing a new connection
+        # Listing with a prefix prevents looping through every file within the AWS S3 Bucket, which can take minutes for large AWS S3 Buckets
+s3_paginator = s3.meta.client.get_paginator("list_objects_v2")
+
+# List the files within the AWS S3 Bucket that begin with the s3_file_prefix variable and come after the watermark
+    # AWS S3 lists files in alphabetical order, therefore all file names that come before the watermark are skipped by AWS S3
+        # The pages are requested lazily, meaning each page is only requested once the previous page has been looped through
+s3_pages = s3_paginator.paginate(
+    Bucket = s3_bucket
+    ,Prefix = s3_file_prefix
+    ,StartAfter = s3_start_after
+    ,PaginationConfig = {"PageSize": s3_page_size}
+)
+
+# Loop through each page of files within the AWS S3 Bucket
+for s3_page in s3_pages:
+
+    # Loop through each file within the page
+        # Pages that do not contain any files do not include the "Contents" key
+    for s3_bucket_file in s3_page.get("Contents", []):
+
+        # Only collect the files that match the specified pattern
+        if not fnmatch.fnmatch(s3_bucket_file["Key"], s3_file_name_pattern):
+
+            continue
+
+        # Retrieve the ETag of the file from the manifest, if the file has been loaded before
+        manifest_row = manifest_conn.execute(
+            "SELECT etag FROM s3_manifest WHERE bucket = ? AND key = ?"
+            ,(s3_bucket, s3_bucket_file["Key"])
+        ).fetchone()
+
+        # Skip the file if it has been loaded before and has not changed since it was loaded
+        if manifest_row is not None and manifest_row[0] == s3_bucket_file["ETag"]:
+
+            continue
+
+        # Display all of the new file names within the AWS S3 Bucket
+            # Comment Out once the files have been verified
+        # print()
+        # print(s3_bucket_file["Key"])
+
+        # Collect the name, ETag, size and last modified date of each new file within the AWS S3 Bucket
+        new_s3_file_list.append(s3_bucket_file)
+
+"""
+# Display all of the new files within the AWS S3 Bucket
+    # Comment Out once the files have been verified
+print()
+print("New AWS S3 Bucket Files that begin with the prefix:")
+print()
+print([s3_bucket_file["Key"] for s3_bucket_file in new_s3_file_list])
+"""
+
+
+##############################################################################################################
+# Step 7: Extract the data from the new file(s) within the AWS S3 Bucket and load into a Pandas DataFrame
+##############################################################################################################
+
+
+# Loop through each new file within the AWS S3 Bucket, one at a time
+for s3_bucket_file in new_s3_file_list:
+
+    # Extract the data from the file within the AWS S3 Bucket
+    s3_file = s3.Bucket(s3_bucket).Object(s3_bucket_file["Key"]).get()
+
+    # ***** Choose one of the 2 methods below *****
+
+
+    # Method 1: Load the entire file into the df Pandas DataFrame
+
+    # ***** Choose one of the 2 df = pd.read_csv functions below *****
+
+    # Load the data from s3_file into the df Pandas DataFrame
+    df = pd.read_csv(
+        s3_file['Body']
+        ,sep = "<field_delimiter>"
+        # Only parse the columns within the file_columns dictionary, using the data type specified for each column
+        ,usecols = list(file_columns)
+        ,dtype = file_columns
+        # Decompress the file as it is read, using the compression identified within Step 3
+        ,compression = file_compression
+        # Load the file using the engine chosen within Step 3
+        ,engine = parse_engine
+    )
+
+    # Load the SFTP file into the a Pandas DataFrame, specifying the column names
+    df = pd.read_csv(
+        s3_file['Body']
+        # Only parse the columns within the file_columns dictionary, using the data type specified for each column
+        ,usecols = list(file_columns)
+        ,dtype = file_columns
+        # Decompress the file as it is read, using the compression identified within Step 3
+        ,compression = file_compression
+        # The "pyarrow" engine does not support the names variable together with usecols, therefore this file is always loaded using the default "c" engine
+        ,sep = "<field_delimiter>"
+        # the names variable is used to specify columns names, if they do NOT exist or if you want to rename them from what they currently are
+            # usecols and dtype use the names within the names variable, therefore the keys of the file_columns dictionary within Step 3 must match these names
+        ,names = [
+            '<Column_1>'
+            ,'<Column_2>'
+            ,'<Column_...N>'
+        ]
+    )
+
+    """
+    # Verify if there is any data within the df Pandas DataFrame
+        # Comment out once the data has been verified
+    if not df.empty:
+
+        print("The df Pandas DataFrame contains data:")
+        print()
+        print(df)
+
+    else:
+
+        print("The df Pandas DataFrame is empty")
+    """
+
+    # Append each S3 csv file into the all_data list to consolidate all of the S3 csv files that are being extracted from S3
+    all_data.append(df)
+
+
+    # Method 2: Stream the file into Pandas DataFrames, chunk_size rows at a time
+        # Use this method for files that are too large to fit into memory
+            # Steps 8 and 9 below are not required, as the columns are selected from each chunk and each chunk is loaded into the destination location here
+
+    # Create an iterator that reads chunk_size rows from s3_file each time it is looped through
+        # The data is read directly from the AWS S3 Bucket as each chunk is needed, rather than all at once
+    df_chunks = pd.read_csv(
+        s3_file['Body']
+        ,sep = "<field_delimiter>"
+        # Only parse the columns within the file_columns dictionary, using the data type specified for each column
+        ,usecols = list(file_columns)
+        ,dtype = file_columns
+        # Decompress the file as it is read, using the compression identified within Step 3
+        ,compression = file_compression
+        # The "pyarrow" engine does not support chunksize, therefore the chunks are always loaded using the default "c" engine
+        ,chunksize = chunk_size
+    )
+
+    # Loop through each chunk of the file, one at a time
+    for df_chunk in df_chunks:
+
+        # Arrange the columns within the df_chunk Pandas DataFrame in the same order as the file_columns dictionary
+            # The unwanted columns were never parsed, as only the columns within the file_columns dictionary are parsed from the file
+        df_subset = df_chunk[list(file_columns)]
+
+        # ENTER THE DATA LOAD LOGIC HERE FOR LOADING EACH CHUNK INTO THE DESTINATION LOCATION
+            # To load the data into Snowflake, use the write_pandas function within Step 8 of the "Connect to Snowflake - Template" file
+
+        """
+        # Display the data within the df_subset Pandas DataFrame for each chunk
+            # Comment out once the data has been verified
+        print(df_subset)
+        """
+
+
+##############################################################################################################
+# Step 8: Consolidate all lists within the all_data list into 1 Pandas Dataframe
+##############################################################################################################
+
+
+# Verify if there is any data within the all_data list
+    # If there are no new files within the AWS S3 Bucket, there is no data to load
+if len(all_data) != 0:
+
+    # Concat all of the separate S3 csv files into a formal Pandas DataFrame
+    df_concat = pd.concat(all_data)
+
+    """
+    # Verify if there is any data within the all_data Pandas DataFrame
+        # Comment out once the data has been verified
+    print()
+    print("The df_concat Pandas DataFrame contains data:")
+    print()
+    print(df_concat)
+    """
+
+
+    ##############################################################################################################
+    # Step 9: Select the columns to keep from the Pandas DataFrame
+    ##############################################################################################################
+
+
+    """
+    # Display the columns within the df_concat Pandas DataFrame
+        # This will allow you to identify the columns within the dataset
+            # This allows you to be able to remove any unecessary columns, using df_subset below, from the dataset before loading into Snowflake
+    print()
+    print("Here are all of the columns within the df_concat Pandas DataFrame")
+    print()
+    print(df_concat.columns)
+    """
+
+    # Arrange the columns within the df_concat Pandas DataFrame in the same order as the file_columns dictionary
+        # The unwanted columns were never parsed, as only the columns within the file_columns dictionary are parsed from the file(s) within the AWS S3 Bucket
+    df_subset = df_concat[list(file_columns)]
+
+    """
+    # Verify if there is any data within the df_subset Pandas DataFrame
+        # Comment out once the data has been verified
+    if not df_subset.empty:
+
+        print('The df_subset Pandas DataFrame contains data:')
+        print()
+        print(df_subset)
+
+    else:
+
+        print('The df_subset Pandas DataFrame is empty')
+    """
+
+    # ENTER THE DATA LOAD LOGIC HERE FOR LOADING THE DATA INTO THE DESTINATION LOCATION
+        # To load the data into Snowflake, use the write_pandas function within Step 8 of the "Connect to Snowflake - Template" file
+
+
+##############################################################################################################
+# Step 10: Record the loaded file(s) within the manifest
+    # Only record the files once the data has been loaded into the destination location
+        # If the data pipeline fails before this step, the same files will be extracted the next time the data pipeline is executed
+##############################################################################################################
+
+
+# Add each loaded file to the manifest, or update the file within the manifest if it has changed since it was last loaded
+manifest_conn.executemany(
+    """
+        INSERT OR REPLACE INTO s3_manifest (bucket, key, etag, size, last_modified, loaded_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+    ,[
+        (
+            s3_bucket
+            ,s3_bucket_file["Key"]
+            ,s3_bucket_file["ETag"]
+            ,s3_bucket_file["Size"]
+            ,s3_bucket_file["LastModified"].isoformat()
+            ,datetime.now().isoformat()
+        )
+        for s3_bucket_file in new_s3_file_list
+    ]
+)
+
+# Move the watermark to the last file name that has been loaded
+    # The files are listed in alphabetical order, therefore the last file within the new_s3_file_list list is the last file name
+        # The watermark is never moved backwards, such as when s3_ignore_watermark is set to True
+if len(new_s3_file_list) != 0:
+
+    manifest_conn.execute(
+        """
+            INSERT INTO s3_watermark (bucket, prefix, last_key)
+            VALUES (?, ?, ?)
+            ON CONFLICT (bucket, prefix) DO UPDATE SET last_key = MAX(last_key, excluded.last_key)
+        """
+        ,(s3_bucket, s3_file_prefix, new_s3_file_list[-1]["Key"])
+    )
+
+# Save the changes to the manifest, then close the connection to the SQLite database
+manifest_conn.commit()
+manifest_conn.close()
+
+
+"""
+# Display a message that informs the developer that the Python data pipeline has completed
+    # Comment out once the entire data pipeline has completed successfully
+print()
+print("The <DATA_SOURCE_NAME> <DATASET_NAME> Data Load Notebook has completed successfully")
+print()
+"""
@@ -1,318 +1,649 @@
-"""
-    The "Connect to AWS S3 - Template" file showcases how to pull data from an AWS S3 Bucket, looping through all files within the AWS S3 Bucket, then loading the data into a Pandas DataFrame
-
-    Data Pipeline Process:
-
-        Step 1: Install Required Python Packages
-
-        Step 2: Install Required Python Libraries
-
-        Step 3: Setup the credentials to connect to the AWS S3 Bucket
-
-        Step 4: Connect to the AWS S3 Bucket
-
-        Step 5: Collect a list of file names for all files within the AWS S3 Bucket
-
-        Step 6: Extract the data from the file(s) within the AWS S3 Bucket and load into a Pandas DataFrame
-
-        Step 7: Consolidate all lists within the all_data list into 1 Pandas Dataframe
-
-        Step 8: Select the columns to keep from the Pandas DataFrame
-"""
-
-
-##############################################################################################################
-# Step 1: Install Required Python Packages
-    # Install all of the require Python packages in order to perform the necessary actions within the Python notebook
-        # This section is only used for tools that require you to install all of the necessary packages before each time the code is executed, such as Databricks
-##############################################################################################################
-
-
-# Install the boto3 Python package
-    # Used to connect to AWS services, like S3 Bucket	
-%pip install boto3
-
-# Install the datetime Python package
-    # Used when working with and manipulating dates and times	
-%pip install datetime
-
-# Install the pandas Python package
-    # Used to store data in Series and DataFrames	
-%pip install pandas
-
-# Restart the kernel to use updated packages
-    # Databricks specific command that is required to use any newly install Python packages listed above
-%restart_python
-
-
-##############################################################################################################
-# Step 2: Install Required Python Libraries
-    # Install all of the require Python libraries in order to perform the necessary actions within the Python notebook
-##############################################################################################################
-
-
-# Used when working with and manipulating dates and times
-from datetime import datetime, timedelta
-
-# Enables the ability to connect to multiple AWS services, such as S3 Bucket
-import boto3
-
-# Enables the ability to search for file names based on specified string pattern(s)
-    # Resource: https://docs.python.org/3/library/fnmatch.html
-import fnmatch
-
-# Enables the ability to utilize DataFrames, which are 2 dimension data structures, such as a 2-dimension arrays or a tables with rows and columns
-import pandas as pd
-
-
-##############################################################################################################
-# Step 3: Setup the credentials to connect to the AWS S3 Bucket
-##############################################################################################################
-
-
-# The access ID assigned to the account connecting to the AWS service
-s3_access_id = "<AWS_S3_Access_ID>"
-
-# The access key assigned to the account connecting to the AWS service
-s3_secret_access_key = "<AWS_S3_Access_Key>"
-
-# The AWS service that you would like to connect to
-aws_service = "s3"
-
-# The AWS region that the AWS service is set to
-aws_region_name = "<AWS_Region>"
-
-# The AWS S3 Bucket that you would like to connect to
-s3_bucket = "<AWS_S3_Bucket>"
-
-# The report associated with the file within the AWS S3 Bucket
-    # Available datasets assigned to the account connecting to the AWS service
-file_name = "<File_Name>"
-
-# The extension of the file within the AWS S3 Bucket
-file_extension = "<File_Extension>"
-
-# The SFTP file name, which is a consolidation of the following 3 parts:
-    # report_name - The name of the Sysco report file
-    # sftp_file_extension - The extension of the Olo report file
-s3_file_name_pattern = f"*{file_name}*.{file_extension}"
-
-# The list collect the name for all of the files within the S3 bucket
-    # This will allow us to verify if the file that we would like to extract exists
-        # If the file does not exist, the data pipeline will not try to extract the file
-            # This will prevent the data pipeline from failing
-s3_file_list = []
-
-# The list will consolidate all S3 csv files
-    # Consolidating all S3 csv files into a list, then converting the entire list into a DataFrame
-    # prevents multiple DataFrames from being created in the for loop
-        # This method is more effiecient and less computational than converting each dictionary into a DataFrame
-        # and appending to one another, then consolidating all DataFrames into one
-all_data = []
-
-# The oldest date that you would like to pull data for
-start_date = datetime(<4-Digit Year>, <1 or 2-digit Month>, <1 or 2-digit Day>)
-
-# The date used to calulate the date variables below
-today = datetime.now()
-
-# Identifies how many times the for loop below will have to iterate for
-    # 1 time per day that you would like to pull data for
-days_passed = (today - start_date).days - <Number of day offset>
-
-
-##############################################################################################################
-# Step 4: Connect to the AWS S3 Bucket
-##############################################################################################################
-
-
-# Connect to the AWS S3 Bucket
-    # The connection to the AWS S3 Bucket does not allow using the with function
-        # The connection to the AWS S3 Bucket closes automatically and does not use the close() command
-s3 = boto3.resource(
-    service_name = aws_service
-    ,region_name = aws_region_name
-    ,aws_access_key_id = s3_access_id
-    ,aws_secret_access_key = s3_secret_access_key
-)
-
-
-##############################################################################################################
-# Step 5: Collect a list of file names for all files within the AWS S3 Bucket
-##############################################################################################################
-
-
-# Loop through each file within the AWS S3 Bucket
-for s3_bucket_file in s3.Bucket(s3_bucket).objects.all():
-
-    # Display all of the file names within the AWS S3 Bucket
-        # Comment Out once the files have been verified
-    # print()
-    # print(s3_bucket_file.key)
-
-    # Collect the name of each file within the AWS S3 Bucket
-    s3_file_list.append(s3_bucket_file.key)
-
-"""
-# Display all of the files within the AWS S3 Bucket
-    # Comment Out once the files have been verified
-print()
-print("AWS S3 Bucket Files:")
-print()
-print(s3_file_list)
-"""
-
-
-##############################################################################################################
-# Step 6: Extract the data from the file(s) within the AWS S3 Bucket and load into a Pandas DataFrame
-##############################################################################################################
-
-
-# Loop through the S3 bucket, once per day that we would like to pull data for
-for i in range(days_passed) and today >= datetime.strptime("<Oldest Date you want data for>", "%Y-%m-%d"):
-
-    # The date that the GET request is being executed
-        # The date the data pipeline is executed
-    file_date = today.strftime("%Y%m%d")
-
-    # The year part of the file name within the AWS S3 Bucket
-    s3_file_year = (today - timedelta(days = 3)).strftime("%Y")
-
-    # The month part of the file name within the AWS S3 Bucket
-    s3_file_month = (today - timedelta(days = 3)).strftime("%m")
-
-    # The day part of the file name within the AWS S3 Bucket
-    s3_file_day = (today - timedelta(days = 3)).strftime("%d")
-
-    # The file within the AWS S3 Bucket that you would like to extract
-    s3_file_name = f"{file_name}.{file_extension}"
-
-    # Verify if the desired file name exists within the AWS S3 Bucket
-        # If the file exists within the AWS S3 Bucket, extaract the file
-    if s3_file_name in s3_file_list:
-        
-        # Loop through each of the files that match the specified pattern, one at a time, within the SFTP file path, specified above
-            # This ensures that the same operations are performed on each file, one at a time
-        if fnmatch.fnmatch(s3_file_name, s3_file_name_pattern):
-
-            # Extract the data from the file within the AWS S3 Bucket
-            s3_file = s3.Bucket(s3_bucket).Object(s3_file_name).get()
-            
-            # ***** Choose one of the 2 df = pd.read_csv functions below *****
-            
-            # Load the data from s3_file into the df Pandas DataFrame as is
-            df = pd.read_csv(
-                s3_file['Body']
-                ,sep = "<field_delimiter>"
-                ,index_col = 0
-            )
-            
-            # Load the SFTP file into the a Pandas DataFrame, specifying the column names
-            df = pd.read_csv(
-                s3_file['Body']
-                ,index_col = 0
-                ,sep = "<field_delimiter>"
-                # the names variable is used to specify columns names, if they do NOT exist or if you want to rename them from what they currently are
-                ,names = [
-                    'column_1'
-                    ,'column_2'
-                    ,'column_N'
-                ]
-            )
-
-            """
-            # Verify if there is any data within the df Pandas DataFrame
-                # Comment out once the data has been verified
-            if not df.empty:
-
-                print("The df Pandas DataFrame contains data:")
-                print()
-                print(df)
-
-            else:
-
-                print("The df Pandas DataFrame is empty")
-            """
-        
-            # Append each S3 csv file into the all_data list to consolidate all of the S3 csv files that are being extracted from S3
-            all_data.append(df)
-
-    # Adjust the date value in the today variable to subtract 1 day from the variable
-        # This allowas us to look at and extract the S3 csv file for the next previous day
-            # 1 day will be subtracted from the today variable after each S3 csv file is extracted until the end of the for loop
-                # This allows us to extract the S3 csv file for each day from the date set in the start_date variable until the current date - 3 days
-    today = today - timedelta(days = 1)
-
-
-##############################################################################################################
-# Step 7: Consolidate all lists within the all_data list into 1 Pandas Dataframe
-##############################################################################################################
-
-
-# Concat all of the separate S3 csv files into a formal Pandas DataFrame
-df_concat = pd.concat(all_data)
-
-"""
-# Verify if there is any data within the all_data Pandas DataFrame
-    # Comment out once the data has been verified
-print()
-print("The df_concat Pandas DataFrame contains data:")
-print()
-print(df_concat)
-"""
-
-
-##############################################################################################################
-# Step 8: Select the columns to keep from the Pandas DataFrame
-##############################################################################################################
-
-
-"""
-# Display the columns within the df_concat Pandas DataFrame
-    # This will allow you to identify the columns within the dataset
-        # This allows you to be able to remove any unecessary columns, using df_subset below, from the dataset before loading into Snowflake
-print()
-print("Here are all of the columns within the df_concat Pandas DataFrame")
-print()
-print(df_concat.columns)
-"""
-
-# Verify if the df_subset Pandas DataFrame contains data
-# Verify if the df_concat Pandas DataFrame contains data
-    # If the df_subset Pandas DataFrame contains data, load the data into Snowflake
-#if not df_subset.empty:
-if not df_concat.empty:
-    
-    # Select the desired columns to keep from the df Pandas DataFrame
-        # This method is used to remove any unwanted data that was extracted from the file within the AWS S3 Bucket
-            # This is similar to the SELECT clause in SQL
-    df_subset = df_concat[
-        [
-            '<Column_1>'
-            ',<Column_2>'
-            ,'<Column_...N>'
-        ]
-    ]
-
-    """
-    # Verify if there is any data within the df_subset Pandas DataFrame
-        # Comment out once the data has been verified
-    if not df_subset.empty:
-
-        print('The df_subset Pandas DataFrame contains data:')
-        print()
-        print(df_subset)
-
-    else:
-
-        print('The df_subset Pandas DataFrame is empty')
-    """
-
-
-"""
-# Display a message that informs the developer that the Python data pipeline has completed
-    # Comment out once the entire data pipeline has completed successfully
-print()
-print("The <DATA_SOURCE_NAME> <DATASET_NAME> Data Load Notebook has completed successfully")
-print()
-"""
+"""
+    The "Connect to AWS S3 - Template" file showcases how to pull data from an AWS S3 Bucket, looping through the files within the AWS S3 Bucket that begin with a prefix, then loading the data into a Pandas DataFrame
+
+    Data Pipeline Process:
+
+        Step 1: Install Required Python Packages
+
+        Step 2: Install Required Python Libraries
+
+        Step 3: Setup the credentials to connect to the AWS S3 Bucket
+
+        Step 4: Connect to the AWS S3 Bucket
+
+        Step 5: Collect a list of file names for the file(s) within the AWS S3 Bucket that begin with the prefix
+
+        Step 6: Extract the data from the file(s) within the AWS S3 Bucket and load into a Pandas DataFrame
+
+        Step 7: Consolidate all lists within the all_data list into 1 Pandas Dataframe
+
+        Step 8: Select the columns to keep from the Pandas DataFrame
+"""
+
+
+##############################################################################################################
+# Step 1: Install Required Python Packages
+    # Install all of the require Python packages in order to perform the necessary actions within the Python notebook
+        # This section is only used for tools that require you to install all of the necessary packages before each time the code is executed, such as Databricks
+##############################################################################################################
+
+
+# Install the boto3 Python package
+    # Used to connect to AWS services, like S3 Bucket	
+%pip install boto3
+
+# Install the pandas Python package
+    # Used to store data in Series and DataFrames	
+%pip install pandas
+
+# Install the zstandard Python package
+    # Used to decompress and compress files using zstd, such as .csv.zst files
+%pip install zstandard
+
+# Install the pyarrow Python package
+    # Used to pass the Pandas DataFrame from each process in the Arrow IPC format
+%pip install pyarrow
+
+# Restart the kernel to use updated packages
+    # Databricks specific command that is required to use any newly install Python packages listed above
+%restart_python
+
+
+##############################################################################################################
+# Step 2: Install Required Python Libraries
+    # Install all of the require Python libraries in order to perform the necessary actions within the Python notebook
+##############################################################################################################
+
+
+# Used when working with and manipulating dates and times
+from datetime import datetime, timedelta
+
+# Enables the ability to connect to multiple AWS services, such as S3 Bucket
+import boto3
+
+# Enables the ability to configure the connection to the AWS services, such as the number of connections that can be open at the same time
+from botocore.config import Config
+
+# Enables the ability to run the same function multiple times at the same time, using a pool of threads
+    # Resource: https://docs.python.org/3/library/concurrent.futures.html
+from concurrent.futures import ThreadPoolExecutor
+
+# Enables the ability to run the same function multiple times at the same time, using a pool of processes
+    # Each process uses a separate CPU, whereas a pool of threads can only use 1 CPU at a time
+from concurrent.futures import ProcessPoolExecutor
+
+# Enables the ability to search for file names based on specified string pattern(s)
+    # Resource: https://docs.python.org/3/library/fnmatch.html
+import fnmatch
+
+# Enables the ability to treat data held in memory as a file
+import io
+
+# Enables the ability to identify the number of CPUs
+import os
+
+# Enables the ability to measure how long it takes to load the files using each number of processes
+import time
+
+# Enables the ability to utilize DataFrames, which are 2 dimension data structures, such as a 2-dimension arrays or a tables with rows and columns
+import pandas as pd
+
+# Enables the ability to pass the Pandas DataFrame from each process in the Arrow IPC format, rather than pickling every value within the Pandas DataFrame
+import pyarrow as pa
+
+
+##############################################################################################################
+# Step 3: Setup the credentials to connect to the AWS S3 Bucket
+##############################################################################################################
+
+
+# The access ID assigned to the account connecting to the AWS service
+s3_access_id = "<AWS_S3_Access_ID>"
+
+# The access key assigned to the account connecting to the AWS service
+s3_secret_access_key = "<AWS_S3_Access_Key>"
+
+# The AWS service that you would like to connect to
+aws_service = "s3"
+
+# The AWS region that the AWS service is set to
+aws_region_name = "<AWS_Region>"
+
+# The AWS S3 Bucket that you would like to connect to
+s3_bucket = "<AWS_S3_Bucket>"
+
+# The report associated with the file within the AWS S3 Bucket
+    # Available datasets assigned to the account connecting to the AWS service
+file_name = "<File_Name>"
+
+# The extension of the file within the AWS S3 Bucket
+file_extension = "<File_Extension>"
+
+# The SFTP file name, which is a consolidation of the following 3 parts:
+    # report_name - The name of the Sysco report file
+    # sftp_file_extension - The extension of the Olo report file
+s3_file_name_pattern = f"*{file_name}*.{file_extension}"
+
+# The columns to keep from the file(s) within the AWS S3 Bucket, and the data type of each column
+    # Only these columns are parsed from the file(s) within the AWS S3 Bucket, rather than parsing every column and removing the unwanted columns afterwards
+        # This is similar to the SELECT clause in SQL
+    # pd.read_csv raises a ValueError if any of these columns do not exist within the file(s)
+        # This ensures that the data pipeline fails immediately, rather than loading incomplete data into the destination location
+file_columns = {
+    '<Column_1>': 'string'
+    ,'<Column_2>': 'float64'
+    ,'<Column_...N>': 'string'
+}
+
+# The engine used to load the data within each file into a Pandas DataFrame
+    # "pyarrow" - Parses blocks of the file using multiple threads, which is usually several times faster than "c" for large files
+        # The delimiter must be a single character, and options such as chunksize, nrows, skipfooter, comment and thousands are not supported
+    # "c" - The default engine of pd.read_csv, which parses the file using 1 thread and supports every pd.read_csv option
+        # Use "c" for files that require options the "pyarrow" engine does not support
+    # To compare both engines using files with a similar size, number of columns and delimiter, use the benchmark_read_file function within the data_connectors files connector
+parse_engine = "pyarrow"
+
+# The compression of the file(s), identified from the file_extension variable, such as "csv.gz" or "csv.zst"
+    # pd.read_csv decompresses the data as it is read, straight from the AWS S3 Bucket, rather than downloading and decompressing the entire file first
+        # Nothing is written to disk, and only the compressed data is transferred over the network
+    # None for files that are not compressed, such as "csv"
+        # "zstd" requires the zstandard Python package
+file_compression = {"gz": "gzip", "gzip": "gzip", "bz2": "bz2", "zst": "zstd", "zstd": "zstd"}.get(file_extension.rsplit(".", 1)[-1].lower())
+
+# The set collects the name of the files within the S3 bucket that begin with the prefix
+    # This will allow us to verify if the file that we would like to extract exists
+        # If the file does not exist, the data pipeline will not try to extract the file
+            # This will prevent the data pipeline from failing
+    # A set is used rather than a list, as verifying if a file name exists within a set takes the same amount of time no matter how many file names it contains
+        # Verifying if a file name exists within a list requires looping through every file name within the list
+s3_file_set = set()
+
+# The list will consolidate all S3 csv files
+    # Consolidating all S3 csv files into a list, then converting the entire list into a DataFrame
+    # prevents multiple DataFrames from being created in the for loop
+        # This method is more effiecient and less computational than converting each dictionary into a DataFrame
+        # and appending to one another, then consolidating all DataFrames into one
+all_data = []
+
+# The oldest date that you would like to pull data for
+start_date = datetime(<4-Digit Year>, <1 or 2-digit Month>, <1 or 2-digit Day>)
+
+# The date used to calulate the date variables below
+today = datetime.now()
+
+# Identifies how many times the for loop below will have to iterate for
+    # 1 time per day that you would like to pull data for
+days_passed = (today - start_date).days - <Number of day offset>
+
+# The prefix that all of the file(s) within the AWS S3 Bucket that you would like to extract begin with
+    # Only the files that begin with the prefix are listed, rather than all files within the AWS S3 Bucket
+        # Adjust the variables within the s3_file_prefix variable to match the folder and naming structure of the file(s), such as:
+            # f"{file_name}/"
+            # f"{file_name}_{start_date.strftime('%Y')}"
+s3_file_prefix = f"{file_name}"
+
+# (Optional) The file name within the AWS S3 Bucket that the listing will start after
+    # AWS S3 lists files in alphabetical order, therefore all file names that come before this file name are skipped
+        # Adjust the variables to match the file name of the day before the start_date variable, such as:
+            # f"{file_name}_{(start_date - timedelta(days = 1)).strftime('%Y%m%d')}"
+        # Leave as an empty string to list all files that begin with the s3_file_prefix variable
+s3_start_after = ""
+
+# (Optional) The file name within the AWS S3 Bucket that the listing will stop at
+    # The listing stops once a file name comes after this file name, since all of the desired files have already been listed
+        # Adjust the variables to match the file name of the most recent file you would like to extract, such as:
+            # f"{file_name}_{today.strftime('%Y%m%d')}.{file_extension}"
+        # Leave as an empty string to list all files that begin with the s3_file_prefix variable
+s3_end_at = ""
+
+# The number of file names returned per request when listing the files within the AWS S3 Bucket
+    # 1000 is the maximum number of file names allowed by AWS S3
+s3_page_size = 1000
+
+# The maximum number of files within the AWS S3 Bucket that will be extracted at the same time
+    # Each file is extracted by a separate thread, therefore the files are downloaded and loaded into Pandas DataFrames at the same time
+        # Set to 1 to extract the files one at a time
+max_workers = 8
+
+# The maximum number of files that are loaded into Pandas DataFrames at the same time, when loading the files using a pool of processes
+    # Each file is loaded by a separate process, which uses a separate CPU
+        # Use the commented out benchmark within Step 6 to find the number of processes where adding processes stops reducing the time taken
+parse_max_workers = os.cpu_count()
+
+# The number of rows that are loaded into a Pandas DataFrame at a time, when streaming the files within the AWS S3 Bucket in chunks
+    # Only 1 chunk is held in memory at a time, therefore the memory used depends on chunk_size rather than the size of the files
+chunk_size = 100000
+
+
+##############################################################################################################
+# Step 4: Connect to the AWS S3 Bucket
+##############################################################################################################
+
+
+# Connect to the AWS S3 Bucket
+    # The connection to the AWS S3 Bucket does not allow using the with function
+        # The connection to the AWS S3 Bucket closes automatically and does not use the close() command
+s3 = boto3.resource(
+    service_name = aws_service
+    ,region_name = aws_region_name
+    ,aws_access_key_id = s3_access_id
+    ,aws_secret_access_key = s3_secret_access_key
+    # Allow 1 connection to the AWS S3 Bucket per thread, so that threads do not wait on each other for a connection
+    ,config = Config(max_pool_connections = max_workers)
+)
+
+# The client from the s3 connection above
+    # The client is used to extract the files, rather than the s3 connection, as the client can be shared by multiple threads
+s3_client = s3.meta.client
+
+
+##############################################################################################################
+# Step 5: Collect a list of file names for the file(s) within the AWS S3 Bucket that begin with the prefix
+##############################################################################################################
+
+
+# Establish a paginator, which lists the files within the AWS S3 Bucket 1 page at a time
+    # The paginator reuses the client from the s3 connection above, rather than establishing a new connection
+        # Listing with a prefix prevents looping through every file within the AWS S3 Bucket, which can take minutes for large AWS S3 Buckets
+s3_paginator = s3_client.get_paginator("list_objects_v2")
+
+# List the files within the AWS S3 Bucket that begin with the s3_file_prefix variable
+    # The pages are requested lazily, meaning each page is only requested once the previous page has been looped through
+s3_pages = s3_paginator.paginate(
+    Bucket = s3_bucket
+    ,Prefix = s3_file_prefix
+    ,StartAfter = s3_start_after
+    ,PaginationConfig = {"PageSize": s3_page_size}
+)
+
+# Identifies if the listing has found all of the desired file names, so that no further pages are requested
+s3_listing_complete = False
+
+# Loop through each page of files within the AWS S3 Bucket
+for s3_page in s3_pages:
+
+    # Loop through each file within the page
+        # Pages that do not contain any files do not include the "Contents" key
+    for s3_bucket_file in s3_page.get("Contents", []):
+
+        # Stop listing once the file names are past the s3_end_at file name, if specified
+            # AWS S3 lists files in alphabetical order, therefore all of the desired file names have already been found
+        if s3_end_at and s3_bucket_file["Key"] > s3_end_at:
+
+            s3_listing_complete = True
+
+            break
+
+        # Display all of the file names within the AWS S3 Bucket
+            # Comment Out once the files have been verified
+        # print()
+        # print(s3_bucket_file["Key"])
+
+        # Collect the name of each file within the AWS S3 Bucket
+        s3_file_set.add(s3_bucket_file["Key"])
+
+    # Stop requesting pages once all of the desired file names have been found
+    if s3_listing_complete:
+
+        break
+
+"""
+# Display all of the files within the AWS S3 Bucket
+    # Comment Out once the files have been verified
+print()
+print("AWS S3 Bucket Files that begin with the prefix:")
+print()
+print(s3_file_set)
+"""
+
+# Collect the name of the files within the AWS S3 Bucket that match the specified pattern
+    # The pattern is only compared against each file name once, rather than once per day within the for loop below
+        # Each day within the for loop below then only has to verify if the file name exists within the s3_matched_file_set set
+s3_matched_file_set = set(fnmatch.filter(s3_file_set, s3_file_name_pattern))
+
+
+##############################################################################################################
+# Step 6: Extract the data from the file(s) within the AWS S3 Bucket and load into a Pandas DataFrame
+##############################################################################################################
+
+
+# Create a list of the dates that we would like to pull data for, 1 date per day, starting with the current date
+    # The files are consolidated into the all_data list in the same order as the dates within the file_dates list
+file_dates = [today - timedelta(days = i) for i in range(days_passed)]
+
+
+# Define the function that returns the name of the file within the AWS S3 Bucket for 1 date
+def get_s3_file_name(file_day):
+
+    # The date that the GET request is being executed
+        # The date the data pipeline is executed
+    file_date = file_day.strftime("%Y%m%d")
+
+    # The year part of the file name within the AWS S3 Bucket
+    s3_file_year = (file_day - timedelta(days = 3)).strftime("%Y")
+
+    # The month part of the file name within the AWS S3 Bucket
+    s3_file_month = (file_day - timedelta(days = 3)).strftime("%m")
+
+    # The day part of the file name within the AWS S3 Bucket
+    s3_file_day = (file_day - timedelta(days = 3)).strftime("%d")
+
+    # The file within the AWS S3 Bucket that you would like to extract
+        # Adjust the variables within the s3_file_name variable to include all required variable values
+    s3_file_name = f"{file_name}.{file_extension}"
+
+    return s3_file_name
+
+
+# Define the function that extracts the data from the file within the AWS S3 Bucket for 1 date, then loads the data into a Pandas DataFrame
+    # Using a function allows the same operations to be performed on each date, either one at a time or at the same time
+        # The function returns None if the file does not exist within the AWS S3 Bucket
+def extract_s3_file(file_day):
+
+    # The file within the AWS S3 Bucket that you would like to extract
+    s3_file_name = get_s3_file_name(file_day)
+
+    # Verify if the desired file name exists within the AWS S3 Bucket and matches the specified pattern
+        # If the file does not exist within the AWS S3 Bucket, do not extract the file
+    if s3_file_name not in s3_matched_file_set:
+
+        return None
+
+    # Extract the data from the file within the AWS S3 Bucket
+    s3_file = s3_client.get_object(Bucket = s3_bucket, Key = s3_file_name)
+    
+    # ***** Choose one of the 2 df = pd.read_csv functions below *****
+    
+    # Load the data from s3_file into the df Pandas DataFrame as is
+    df = pd.read_csv(
+        s3_file['Body']
+        ,sep = "<field_delimiter>"
+        # Only parse the columns within the file_columns dictionary, using the data type specified for each column
+        ,usecols = list(file_columns)
+        ,dtype = file_columns
+        # Decompress the file as it is read, using the compression identified within Step 3
+        ,compression = file_compression
+        # Load the file using the engine chosen within Step 3
+        ,engine = parse_engine
+    )
+    
+    # Load the SFTP file into the a Pandas DataFrame, specifying the column names
+    df = pd.read_csv(
+        s3_file['Body']
+        # Only parse the columns within the file_columns dictionary, using the data type specified for each column
+        ,usecols = list(file_columns)
+        ,dtype = file_columns
+        # Decompress the file as it is read, using the compression identified within Step 3
+        ,compression = file_compression
+        # The "pyarrow" engine does not support the names variable together with usecols, therefore this file is always loaded using the default "c" engine
+        ,sep = "<field_delimiter>"
+        # the names variable is used to specify columns names, if they do NOT exist or if you want to rename them from what they currently are
+            # usecols and dtype use the names within the names variable, therefore the keys of the file_columns dictionary within Step 3 must match these names
+        ,names = [
+            '<Column_1>'
+            ,'<Column_2>'
+            ,'<Column_...N>'
+        ]
+    )
+
+    """
+    # Verify if there is any data within the df Pandas DataFrame
+        # Comment out once the data has been verified
+    if not df.empty:
+
+        print("The df Pandas DataFrame contains data:")
+        print()
+        print(df)
+
+    else:
+
+        print("The df Pandas DataFrame is empty")
+    """
+
+    return df
+
+
+# Define the function that downloads the data within the file in the AWS S3 Bucket for 1 date into memory
+    # The function returns None if the file does not exist within the AWS S3 Bucket
+def download_s3_file(file_day):
+
+    # The file within the AWS S3 Bucket that you would like to extract
+    s3_file_name = get_s3_file_name(file_day)
+
+    # Verify if the desired file name exists within the AWS S3 Bucket and matches the specified pattern
+        # If the file does not exist within the AWS S3 Bucket, do not download the file
+    if s3_file_name not in s3_matched_file_set:
+
+        return None
+
+    # Download the data from the file within the AWS S3 Bucket
+    return s3_client.get_object(Bucket = s3_bucket, Key = s3_file_name)['Body'].read()
+
+
+# Define the function that loads the data within 1 downloaded file into a Pandas DataFrame, returning the Pandas DataFrame in the Arrow IPC format
+    # Used within a separate process, as the Arrow IPC format is returned to the main process as 1 block of bytes per column, rather than pickling every value within the Pandas DataFrame
+        # The data types of the Pandas DataFrame, such as string[pyarrow] and category, are kept within the Arrow IPC format
+def parse_s3_file_to_arrow(file_data):
+
+    # Load the data from file_data into the df Pandas DataFrame
+        # Use the same pd.read_csv function chosen within the extract_s3_file function above
+    df = pd.read_csv(
+        io.BytesIO(file_data)
+        ,sep = "<field_delimiter>"
+        # Only parse the columns within the file_columns dictionary, using the data type specified for each column
+        ,usecols = list(file_columns)
+        ,dtype = file_columns
+        # Decompress the file as it is read, using the compression identified within Step 3
+        ,compression = file_compression
+        # Load the file using the engine chosen within Step 3
+        ,engine = parse_engine
+    )
+
+    arrow_table = pa.Table.from_pandas(df, preserve_index = False)
+
+    ipc_stream = pa.BufferOutputStream()
+
+    with pa.ipc.new_stream(ipc_stream, arrow_table.schema) as ipc_writer:
+
+        ipc_writer.write_table(arrow_table)
+
+    return ipc_stream.getvalue()
+
+
+# ***** Choose one of the 4 methods below *****
+
+
+# Method 1: Extract the files one at a time
+
+# Loop through the S3 bucket, once per day that we would like to pull data for
+for file_day in file_dates:
+
+    # Extract the data from the file within the AWS S3 Bucket for the date
+    df = extract_s3_file(file_day)
+
+    # Append each S3 csv file into the all_data list to consolidate all of the S3 csv files that are being extracted from S3
+    if df is not None:
+
+        all_data.append(df)
+
+
+# Method 2: Extract multiple files at the same time
+
+# Establish a pool of threads, which extracts up to max_workers files at the same time
+    # The pool of threads closes automatically after the with block is exited, once all of the files have been extracted
+with ThreadPoolExecutor(max_workers = max_workers) as executor:
+
+    # Loop through the extracted files, once per day that we would like to pull data for
+        # executor.map returns the Pandas DataFrames in the same order as the file_dates list, no matter which file finishes extracting first
+            # This ensures the all_data list is always consolidated in the same order
+    for df in executor.map(extract_s3_file, file_dates):
+
+        # Append each S3 csv file into the all_data list to consolidate all of the S3 csv files that are being extracted from S3
+        if df is not None:
+
+            all_data.append(df)
+
+
+# Method 3: Download multiple files at the same time, then load the files into Pandas DataFrames using a pool of processes
+    # Use this method when loading the files uses 100% of 1 CPU while the remaining CPUs are idle, as each thread within Method 2 can only use 1 CPU at a time
+    # Each downloaded file is passed into a process as soon as it has been downloaded, therefore the files are downloading while the first files are loaded
+    # The functions are passed into each process by name, which requires the processes to be started using fork, which is the default on Linux, such as Databricks
+
+# Establish a pool of threads, which downloads up to max_workers files at the same time, and a pool of processes, which loads up to parse_max_workers files at the same time
+    # Both pools close automatically after the with block is exited, once all of the files have been loaded
+with ThreadPoolExecutor(max_workers = max_workers) as executor, ProcessPoolExecutor(max_workers = parse_max_workers) as parse_executor:
+
+    # Pass each file into the pool of processes once it has been downloaded
+        # executor.map returns the files in the same order as the file_dates list, no matter which file finishes downloading first
+    parse_futures = [
+        parse_executor.submit(parse_s3_file_to_arrow, file_data)
+        for file_data in executor.map(download_s3_file, file_dates)
+        if file_data is not None
+    ]
+
+    # Loop through each Pandas DataFrame, in the same order as the file_dates list
+        # This ensures the all_data list is always consolidated in the same order
+    for parse_future in parse_futures:
+
+        # Load the Pandas DataFrame returned by the process in the Arrow IPC format, then append it into the all_data list
+        all_data.append(pa.ipc.open_stream(parse_future.result()).read_all().to_pandas())
+
+
+"""
+# Measure how long loading the files takes using 1, 2, 4, 8 and 16 processes
+    # Each file is downloaded once before the benchmark, so that only the time taken to load the files is measured
+    # Set parse_max_workers to the number of processes where adding processes stops reducing the time taken, as additional processes only use additional memory
+    # Comment out once the number of processes has been chosen
+benchmark_file_data = [file_data for file_data in map(download_s3_file, file_dates) if file_data is not None]
+
+for benchmark_workers in [1, 2, 4, 8, 16]:
+
+    benchmark_start_time = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers = benchmark_workers) as benchmark_executor:
+
+        benchmark_data = [
+            pa.ipc.open_stream(ipc_data).read_all().to_pandas()
+            for ipc_data in benchmark_executor.map(parse_s3_file_to_arrow, benchmark_file_data)
+        ]
+
+    benchmark_seconds = time.perf_counter() - benchmark_start_time
+
+    print(f"{benchmark_workers} processes: {sum(len(df) for df in benchmark_data):,} rows in {benchmark_seconds:.2f} seconds ({sum(len(df) for df in benchmark_data) / benchmark_seconds:,.0f} rows/sec)")
+"""
+
+
+# Method 4: Stream the files one at a time into Pandas DataFrames, chunk_size rows at a time
+    # Use this method for files that are too large to fit into memory
+        # Steps 7 and 8 below are not required, as the columns are selected from each chunk and each chunk is loaded into the destination location here
+            # The chunks are never consolidated into the all_data list, which would require the data from every file to fit into memory
+
+# Loop through the S3 bucket, once per day that we would like to pull data for
+for file_day in file_dates:
+
+    # The file within the AWS S3 Bucket that you would like to extract
+    s3_file_name = get_s3_file_name(file_day)
+
+    # Verify if the desired file name exists within the AWS S3 Bucket and matches the specified pattern
+        # If the file exists within the AWS S3 Bucket, extaract the file
+    if s3_file_name in s3_matched_file_set:
+
+        # Extract the data from the file within the AWS S3 Bucket
+        s3_file = s3_client.get_object(Bucket = s3_bucket, Key = s3_file_name)
+
+        # Create an iterator that reads chunk_size rows from s3_file each time it is looped through
+            # The data is read directly from the AWS S3 Bucket as each chunk is needed, rather than all at once
+        df_chunks = pd.read_csv(
+            s3_file['Body']
+            ,sep = "<field_delimiter>"
+            # Only parse the columns within the file_columns dictionary, using the data type specified for each column
+            ,usecols = list(file_columns)
+            ,dtype = file_columns
+            # Decompress the file as it is read, using the compression identified within Step 3
+            ,compression = file_compression
+            # The "pyarrow" engine does not support chunksize, therefore the chunks are always loaded using the default "c" engine
+            ,chunksize = chunk_size
+        )
+
+        # Loop through each chunk of the file, one at a time
+        for df_chunk in df_chunks:
+
+            # Arrange the columns within the df_chunk Pandas DataFrame in the same order as the file_columns dictionary
+                # The unwanted columns were never parsed, as only the columns within the file_columns dictionary are parsed from the file
+            df_subset = df_chunk[list(file_columns)]
+
+            # ENTER THE DATA LOAD LOGIC HERE FOR LOADING EACH CHUNK INTO THE DESTINATION LOCATION
+                # To load the data into Snowflake, use the write_pandas function within Step 8 of the "Connect to Snowflake - Template" file
+
+            """
+            # Display the data within the df_subset Pandas DataFrame for each chunk
+                # Comment out once the data has been verified
+            print(df_subset)
+            """
+
+
+##############################################################################################################
+# Step 7: Consolidate all lists within the all_data list into 1 Pandas Dataframe
+##############################################################################################################
+
+
+# Concat all of the separate S3 csv files into a formal Pandas DataFrame
+df_concat = pd.concat(all_data)
+
+"""
+# Verify if there is any data within the all_data Pandas DataFrame
+    # Comment out once the data has been verified
+print()
+print("The df_concat Pandas DataFrame contains data:")
+print()
+print(df_concat)
+"""
+
+
+##############################################################################################################
+# Step 8: Select the columns to keep from the Pandas DataFrame
+##############################################################################################################
+
+
+"""
+# Display the columns within the df_concat Pandas DataFrame
+    # This will allow you to identify the columns within the dataset
+        # This allows you to be able to remove any unecessary columns, using df_subset below, from the dataset before loading into Snowflake
+print()
+print("Here are all of the columns within the df_concat Pandas DataFrame")
+print()
+print(df_concat.columns)
+"""
+
+# Verify if the df_subset Pandas DataFrame contains data
+# Verify if the df_concat Pandas DataFrame contains data
+    # If the df_subset Pandas DataFrame contains data, load the data into Snowflake
+#if not df_subset.empty:
+if not df_concat.empty:
+    
+    # Arrange the columns within the df_concat Pandas DataFrame in the same order as the file_columns dictionary
+        # The unwanted columns were never parsed, as only the columns within the file_columns dictionary are parsed from the file within the AWS S3 Bucket
+    df_subset = df_concat[list(file_columns)]
+
+    """
+    # Verify if there is any data within the df_subset Pandas DataFrame
+        # Comment out once the data has been verified
+    if not df_subset.empty:
+
+        print('The df_subset Pandas DataFrame contains data:')
+        print()
+        print(df_subset)
+
+    else:
+
+        print('The df_subset Pandas DataFrame is empty')
+    """
+
+
+"""
+# Display a message that informs the developer that the Python data pipeline has completed
+    # Comment out once the entire data pipeline has completed successfully
+print()
+print("The <DATA_SOURCE_NAME> <DATASET_NAME> Data Load Notebook has completed successfully")
+print()
+"""
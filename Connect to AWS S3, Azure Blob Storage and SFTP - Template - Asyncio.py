@@ -0,0 +1,497 @@
+"""
+    The "Connect to AWS S3, Azure Blob Storage and SFTP - Template - Asyncio" file showcases how to pull data from an AWS S3 Bucket, Azure Blob Storage or a SFTP, transferring many files at the same time within 1 Python process, then loading the data into a Pandas DataFrame
+
+    The other templates wait for each network request, such as listing, downloading or deleting a file, to complete before starting the next network request
+        This template uses asyncio, which allows hundreds of network requests to be in progress at the same time, without needing a separate thread for each network request
+
+    Data Pipeline Process:
+
+        Step 1: Install Required Python Packages
+
+        Step 2: Install Required Python Libraries
+
+        Step 3: Setup the credentials and settings
+
+        Step 4: Define the AWS S3 Bucket functions
+
+        Step 5: Define the Azure Blob Storage functions
+
+        Step 6: Define the SFTP functions
+
+        Step 7: Define the data pipeline
+
+        Step 8: Connect to the source and run the data pipeline
+
+        Step 9: Consolidate all Pandas DataFrames within the all_data list into 1 Pandas Dataframe
+"""
+
+
+##############################################################################################################
+# Step 1: Install Required Python Packages
+    # Install all of the require Python packages in order to perform the necessary actions within the Python notebook
+        # This section is only used for tools that require you to install all of the necessary packages before each time the code is executed, such as Databricks
+##############################################################################################################
+
+
+# Install the aiobotocore Python package
+    # Used to connect to AWS services, like S3 Bucket, using asyncio
+        # aiobotocore is the asyncio version of boto3
+%pip install aiobotocore
+
+# Install the azure-storage-blob and aiohttp Python packages
+    # Allows you to manipulate Azure Storage resources and blob containers
+        # aiohttp is required to use the asyncio version of azure-storage-blob
+%pip install azure-storage-blob aiohttp
+
+# Install the asyncssh Python package
+    # Used to connect to SFTP environments using asyncio
+        # asyncssh is the asyncio version of paramiko
+%pip install asyncssh
+
+# Install the pandas Python package
+    # Used to store data in Series and DataFrames
+%pip install pandas
+
+# Install the zstandard Python package
+    # Used to decompress and compress files using zstd, such as .csv.zst files
+%pip install zstandard
+
+# Install the pyarrow Python package
+    # Used by the "pyarrow" engine of pd.read_csv, which loads each file using multiple threads
+%pip install pyarrow
+
+# Restart the kernel to use updated packages
+    # Databricks specific command that is required to use any newly install Python packages listed above
+%restart_python
+
+
+##############################################################################################################
+# Step 2: Install Required Python Libraries
+    # Install all of the require Python libraries in order to perform the necessary actions within the Python notebook
+##############################################################################################################
+
+
+# Enables the ability to run many network requests at the same time within 1 Python process
+    # Resource: https://docs.python.org/3/library/asyncio.html
+import asyncio
+
+# Enables the ability to connect to multiple AWS services, such as S3 Bucket, using asyncio
+from aiobotocore.session import get_session
+
+# Enables the ability to configure the connection to the AWS services, such as the number of connections that can be open at the same time
+from aiobotocore.config import AioConfig
+
+# Enables the ability to access and manipulate Azure Blob Storeage containers and blobs, using asyncio
+from azure.storage.blob.aio import BlobServiceClient
+
+# Enables the ability to connect to the SFTP, using asyncio
+import asyncssh
+
+# Enables the ability to search for file names based on specified string pattern(s)
+    # Resource: https://docs.python.org/3/library/fnmatch.html
+import fnmatch
+
+# Enables the ability to treat data held in memory as a file
+import io
+
+# Enables the ability to utilize DataFrames, which are 2 dimension data structures, such as a 2-dimension arrays or a tables with rows and columns
+import pandas as pd
+
+
+##############################################################################################################
+# Step 3: Setup the credentials and settings
+    # Only the credentials for the source that you would like to connect to are required
+##############################################################################################################
+
+
+# The access ID assigned to the account connecting to the AWS service
+s3_access_id = "<AWS_S3_Access_ID>"
+
+# The access key assigned to the account connecting to the AWS service
+s3_secret_access_key = "<AWS_S3_Access_Key>"
+
+# The AWS region that the AWS service is set to
+aws_region_name = "<AWS_Region>"
+
+# The AWS S3 Bucket that you would like to connect to
+s3_bucket = "<AWS_S3_Bucket>"
+
+# The prefix that all of the file(s) within the AWS S3 Bucket that you would like to extract begin with
+    # Only the files that begin with the prefix are listed, rather than all files within the AWS S3 Bucket
+s3_file_prefix = "<File_Prefix>"
+
+# Account Name of the Azure Blob Storage environment
+account_name = "<account_name>"
+
+# Account Key for the Azure Blob Storage environment
+account_key = "<account_key>"
+
+# Connection String for the Azure Blob Storage environment, which is created from the Account Name and Account Key listed above
+connection_string = f"DefaultEndpointsProtocol=https;AccountName={account_name};AccountKey={account_key};EndpointSuffix=core.windows.net"
+
+# Name of the Azure Blob Storage container that the file(s) will be extracted from
+container_name = "<Container_Name>"
+
+# Set the SFTP file path that contains the source file(s)
+    # "." is the default file path used if no file path is specified
+sftp_file_path = "<Path_To_SFTP_File(s)>"
+
+# The name of the file(s)
+file_name = "<File_Name>"
+
+# The extension of the file(s)
+file_extension = "<File_Extension>"
+
+# The pattern of the file name(s), which is a consolidation of the following 2 parts:
+    # file_name - The name of the file
+    # file_extension - The extension of the file
+file_name_pattern = f"*{file_name}*.{file_extension}"
+
+# The columns to keep from the file(s), and the data type of each column
+    # Only these columns are parsed from the file(s), rather than parsing every column and removing the unwanted columns afterwards
+        # This is similar to the SELECT clause in SQL
+    # pd.read_csv raises a ValueError if any of these columns do not exist within the file(s)
+file_columns = {
+    '<Column_1>': 'string'
+    ,'<Column_2>': 'float64'
+    ,'<Column_...N>': 'string'
+}
+
+# The engine used to load the data within each file into a Pandas DataFrame
+    # "pyarrow" - Parses blocks of the file using multiple threads, which is usually several times faster than "c" for large files
+        # The delimiter must be a single character, and options such as chunksize, nrows, skipfooter, comment and thousands are not supported
+    # "c" - The default engine of pd.read_csv, which parses the file using 1 thread and supports every pd.read_csv option
+        # Use "c" for files that require options the "pyarrow" engine does not support
+    # To compare both engines using files with a similar size, number of columns and delimiter, use the benchmark_read_file function within the data_connectors files connector
+parse_engine = "pyarrow"
+
+# The compression of the file(s), identified from the file_extension variable, such as "csv.gz" or "csv.zst"
+    # pd.read_csv decompresses the data as it is read, straight from the source file, rather than downloading and decompressing the entire file first
+        # Nothing is written to disk, and only the compressed data is transferred over the network
+    # None for files that are not compressed, such as "csv"
+        # "zstd" requires the zstandard Python package
+file_compression = {"gz": "gzip", "gzip": "gzip", "bz2": "bz2", "zst": "zstd", "zstd": "zstd"}.get(file_extension.rsplit(".", 1)[-1].lower())
+
+# The maximum number of files that are transferred at the same time
+    # Each file transfer waits on the network most of the time, therefore this can be much higher than the number of threads used within the other templates
+    # To compare the number of transfers in progress with transferring 1 file at a time, as within the other templates, use the benchmark_transfers function within the data_connectors pipeline connector
+transfers_in_progress = 100
+
+# The maximum number of file names that are waiting to be transferred
+    # Once this many file names are waiting, listing the files pauses until a file transfer has started
+        # This prevents the list of files from building up in memory when the listing is faster than the file transfers
+file_queue_size = 200
+
+# Delete each source file once it has been loaded into the destination location
+    # Set to False to leave the source files in place, such as when testing the data pipeline
+delete_source_files = False
+
+
+##############################################################################################################
+# Step 4: Define the AWS S3 Bucket functions
+    # If aiobotocore cannot be installed, the boto3 client from the "Connect to AWS S3 - Template" files can be used instead
+        # Wrap each boto3 call with asyncio.to_thread, such as: await asyncio.to_thread(s3_client.get_object, Bucket = s3_bucket, Key = s3_file_name)
+##############################################################################################################
+
+
+# Define the function that lists the file(s) within the AWS S3 Bucket that begin with the prefix and match the specified pattern
+    # The file names are returned one at a time, as each page of file names is listed
+async def list_s3_files(s3_client):
+
+    # Establish a paginator, which lists the files within the AWS S3 Bucket 1 page at a time
+    s3_paginator = s3_client.get_paginator("list_objects_v2")
+
+    # Loop through each page of files within the AWS S3 Bucket that begin with the s3_file_prefix variable
+    async for s3_page in s3_paginator.paginate(Bucket = s3_bucket, Prefix = s3_file_prefix):
+
+        # Loop through each file within the page
+            # Pages that do not contain any files do not include the "Contents" key
+        for s3_bucket_file in s3_page.get("Contents", []):
+
+            if fnmatch.fnmatch(s3_bucket_file["Key"], file_name_pattern):
+
+                yield s3_bucket_file["Key"]
+
+
+# Define the function that downloads the data from 1 file within the AWS S3 Bucket
+async def download_s3_file(s3_client, s3_file_name):
+
+    # Extract the data from the file within the AWS S3 Bucket
+    s3_file = await s3_client.get_object(Bucket = s3_bucket, Key = s3_file_name)
+
+    # Read all of the data from the file
+        # The connection is released automatically after the with block is exited
+    async with s3_file["Body"] as s3_file_body:
+
+        return await s3_file_body.read()
+
+
+# Define the function that deletes 1 file within the AWS S3 Bucket
+async def delete_s3_file(s3_client, s3_file_name):
+
+    await s3_client.delete_object(Bucket = s3_bucket, Key = s3_file_name)
+
+
+##############################################################################################################
+# Step 5: Define the Azure Blob Storage functions
+##############################################################################################################
+
+
+# Define the function that lists the file(s) within the Azure Blob Storage source container that match the specified pattern
+    # The file names are returned one at a time, as each page of file names is listed
+async def list_azure_files(container_client):
+
+    async for blob in container_client.list_blob_names():
+
+        if fnmatch.fnmatch(blob, file_name_pattern):
+
+            yield blob
+
+
+# Define the function that downloads the data from 1 Azure Blob Storage source container file
+async def download_azure_file(container_client, blob):
+
+    blob_downloader = await container_client.download_blob(blob)
+
+    return await blob_downloader.readall()
+
+
+# Define the function that deletes 1 Azure Blob Storage source container file
+async def delete_azure_file(container_client, blob):
+
+    await container_client.delete_blob(blob)
+
+
+##############################################################################################################
+# Step 6: Define the SFTP functions
+##############################################################################################################
+
+
+# Define the function that lists the file(s) within the SFTP file path that match the specified pattern
+async def list_sftp_files(sftp):
+
+    for sftp_file in await sftp.listdir(sftp_file_path):
+
+        if fnmatch.fnmatch(sftp_file, file_name_pattern):
+
+            yield f"{sftp_file_path}/{sftp_file}"
+
+
+# Define the function that downloads the data from 1 SFTP file
+    # asyncssh requests multiple blocks of the file at the same time, which is similar to prefetch() within paramiko
+async def download_sftp_file(sftp, sftp_file_name):
+
+    # Open the SFTP file in order to read the data within the file
+        # The file is automatically closed after the with block is exited
+    async with sftp.open(sftp_file_name, "rb") as sftp_file:
+
+        return await sftp_file.read()
+
+
+# Define the function that deletes 1 SFTP file
+async def delete_sftp_file(sftp, sftp_file_name):
+
+    await sftp.remove(sftp_file_name)
+
+
+##############################################################################################################
+# Step 7: Define the data pipeline
+    # The data pipeline is the same for every source, only the list, download and delete functions change
+##############################################################################################################
+
+
+# Define the function that lists, downloads, loads and deletes all of the source files
+    # list_files - Function that returns the file names, one at a time
+    # download_file - Function that returns the data within 1 file
+    # delete_file - Function that deletes 1 file
+# The function returns a list of Pandas DataFrames, 1 per file, in the same order that the files were listed
+async def run_data_pipeline(list_files, download_file, delete_file):
+
+    # The queue holds the file names that are waiting to be transferred
+        # Adding a file name to a full queue waits until a file name has been taken from the queue, which pauses the listing
+    file_queue = asyncio.Queue(maxsize = file_queue_size)
+
+    # The dictionary will collect the Pandas DataFrame for each file, using the order the file was listed in as the key
+        # The file transfers complete in any order, therefore the order is restored once all of the files have been transferred
+    file_data = {}
+
+    # Define the function that lists the source files and adds each file name to the queue
+    async def list_stage():
+
+        async for file_number, source_file_name in aenumerate(list_files()):
+
+            await file_queue.put((file_number, source_file_name))
+
+        # Add 1 stop signal to the queue per transfer, which lets each transfer know that there are no more file names
+        for _ in range(transfers_in_progress):
+
+            await file_queue.put(None)
+
+    # Define the function that takes file names from the queue and transfers each file, one at a time
+        # transfers_in_progress copies of this function run at the same time
+    async def transfer_stage():
+
+        while (queued_file := await file_queue.get()) is not None:
+
+            file_number, source_file_name = queued_file
+
+            # Download the data from the source file
+            file_bytes = await download_file(source_file_name)
+
+            # Load the data from the source file into a Pandas DataFrame
+                # pd.read_csv is run within a separate thread, so that the other file transfers are not paused while the data is loaded
+            df = await asyncio.to_thread(
+                pd.read_csv
+                ,io.BytesIO(file_bytes)
+                # Only parse the columns within the file_columns dictionary, using the data type specified for each column
+                ,usecols = list(file_columns)
+                ,dtype = file_columns
+                # Decompress the file as it is read, using the compression identified within Step 3
+                ,compression = file_compression
+                # Load the file using the engine chosen within Step 3
+                    # The "pyarrow" engine parses the file using its own threads, which do not hold the Python GIL, therefore the other file transfers keep running while the file is loaded
+                ,engine = parse_engine
+            )
+
+            # ENTER THE DATA LOAD LOGIC HERE FOR LOADING THE DATA INTO THE DESTINATION LOCATION
+                # To load the data into Snowflake, use the write_pandas function within Step 8 of the "Connect to Snowflake - Template" file
+
+            file_data[file_number] = df[list(file_columns)]
+
+            # Delete the source file after it has been loaded into the destination, so that the file does not get loaded again
+            if delete_source_files:
+
+                await delete_file(source_file_name)
+
+    # Run the list stage and all of the transfers at the same time, until every file has been transferred
+    pipeline_tasks = [asyncio.ensure_future(list_stage())] + [asyncio.ensure_future(transfer_stage()) for _ in range(transfers_in_progress)]
+
+    try:
+
+        await asyncio.gather(*pipeline_tasks)
+
+    except BaseException:
+
+        # Cancel the listing and every other transfer if the listing or any transfer fails, such as a file that can not be downloaded
+            # asyncio.gather raises the first error straight away, but does not stop the other tasks, which would keep downloading and deleting files in the background
+        for pipeline_task in pipeline_tasks:
+
+            pipeline_task.cancel()
+
+        # Wait for every task to be cancelled before the error is raised
+        await asyncio.gather(*pipeline_tasks, return_exceptions = True)
+
+        raise
+
+    return [file_data[file_number] for file_number in sorted(file_data)]
+
+
+# Define the function that numbers each file name returned by an async for loop, starting from 0
+    # This is the asyncio version of the enumerate function
+async def aenumerate(async_iterable):
+
+    item_number = 0
+
+    async for item in async_iterable:
+
+        yield item_number, item
+
+        item_number += 1
+
+
+##############################################################################################################
+# Step 8: Connect to the source and run the data pipeline
+    # Notebooks, such as Databricks, already run asyncio, therefore await is used directly rather than asyncio.run()
+        # Use asyncio.run() instead of await when running this file as a Python script
+##############################################################################################################
+
+
+# ***** Choose one of the 3 sources below *****
+
+
+# Source 1: AWS S3 Bucket
+
+# Connect to the AWS S3 Bucket
+    # The connection to the AWS S3 Bucket closes automatically after the with block is exited
+async def extract_s3_files():
+
+    async with get_session().create_client(
+        "s3"
+        ,region_name = aws_region_name
+        ,aws_access_key_id = s3_access_id
+        ,aws_secret_access_key = s3_secret_access_key
+        # Allow 1 connection to the AWS S3 Bucket per transfer, so that transfers do not wait on each other for a connection
+        ,config = AioConfig(max_pool_connections = transfers_in_progress)
+    ) as s3_client:
+
+        return await run_data_pipeline(
+            lambda: list_s3_files(s3_client)
+            ,lambda s3_file_name: download_s3_file(s3_client, s3_file_name)
+            ,lambda s3_file_name: delete_s3_file(s3_client, s3_file_name)
+        )
+
+all_data = await extract_s3_files()
+
+
+# Source 2: Azure Blob Storage
+
+# Establish the BlobServiceClient and ContainerClient in order to interact with the Azure Blob Storage source container, specified above
+    # The connections close automatically after the with block is exited
+async def extract_azure_files():
+
+    async with BlobServiceClient.from_connection_string(connection_string) as blob_service_client:
+
+        container_client = blob_service_client.get_container_client(container_name)
+
+        return await run_data_pipeline(
+            lambda: list_azure_files(container_client)
+            ,lambda blob: download_azure_file(container_client, blob)
+            ,lambda blob: delete_azure_file(container_client, blob)
+        )
+
+all_data = await extract_azure_files()
+
+
+# Source 3: SFTP
+
+# Connect to the SFTP SSH server and establish a SFTP client object
+    # known_hosts = None automatically accepts the host key, which is the same as paramiko.AutoAddPolicy() within the "Connect to SFTP - Template" file
+        # The connections close automatically after the with block is exited
+async def extract_sftp_files():
+
+    async with asyncssh.connect(
+        "<Host_Name>"
+        ,port = "<Port_Number>"
+        ,username = "<Username>"
+        ,password = "<Password>"
+        ,known_hosts = None
+    ) as ssh_connection, ssh_connection.start_sftp_client() as sftp:
+
+        return await run_data_pipeline(
+            lambda: list_sftp_files(sftp)
+            ,lambda sftp_file_name: download_sftp_file(sftp, sftp_file_name)
+            ,lambda sftp_file_name: delete_sftp_file(sftp, sftp_file_name)
+        )
+
+all_data = await extract_sftp_files()
+
+
+##############################################################################################################
+# Step 9: Consolidate all Pandas DataFrames within the all_data list into 1 Pandas Dataframe
+##############################################################################################################
+
+
+# Verify if there is any data within the all_data list
+if len(all_data) != 0:
+
+    # Concat all of the separate Pandas DataFrames into a formal Pandas DataFrame
+    df_concat = pd.concat(all_data)
+
+    """
+    # Verify if there is any data within the df_concat Pandas DataFrame
+        # Comment out once the data has been verified
+    print()
+    print("The df_concat Pandas DataFrame contains data:")
+    print()
+    print(df_concat)
+    """
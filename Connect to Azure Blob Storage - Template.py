@@ -1,272 +1,670 @@
-"""
-    The "Connect to Azure Blob Storage - Template" file showcases how to pull data from Azure Blob Storage, looping through all files within Azure Blob Storage, then loading the data into a Pandas DataFrame
-
-    Data Pipeline Process:
-
-        Step 1: Install Required Python Packages
-
-        Step 2: Install Required Python Libraries
-
-        Step 3: Setup the credentials to connect to Azure Blob Storage
-
-        Step 4: Establish a BlobServiceClient
-
-            Step 5: Establish a ContainerClient to identify source files
-
-                Step 6: Identify the Azure Blob Storage source container file(s)
-
-            Step 7: Loop through the Azure Blob Storage source container file(s)
-            
-                Step 8: Establish a second ContainerClient
-                
-                    Step 9: Establish a BlobClient
-                       
-                       Step 10: Load the data from the Azure Blob Storage source container file into a Pandas DataFrame
-                
-                Step 11: Convert the Pandas DataFrame to the proper format
-                
-                Step 12: ENTER THE DATA LOAD LOGIC HERE
-                
-                Step 13: Establish a third ContainerClient
-                
-                    Step 14: Establish a second BlobClient
-                    
-                    Step 15: Load the data within the formatted Pandas DataFrame into the Azure Blob Storage archive container file
-                
-                Step 16: Delete the Azure Blob Storage source container
-"""
-
-
-##############################################################################################################
-# Step 1: Install Required Python Packages
-    # Install all of the require Python packages in order to perform the necessary actions within the Python notebook
-        # This section is only used for tools that require you to install all of the necessary packages before each time the code is executed, such as Databricks
-##############################################################################################################
-
-
-# Install the datetime Python package
-    # Used when working with and manipulating dates and times	
-%pip install datetime
-
-# Install the azure-identity Python package
-    # Used to connect to Azure Blob Storage	
-%pip install azure-identity
-
-# Install the azure-storage-blob Python package
-    # Allows you to manipulate Azure Storage resources and blob containers	
-%pip install azure-storage-blob
-
-# Install the pandas Python package
-    # Used to store data in Series and DataFrames	
-%pip install pandas
-
-# Restart the kernel to use updated packages
-    # Databricks specific command that is required to use any newly install Python packages listed above
-%restart_python
-
-
-####################################################################################################
-# Step 2: Install Required Python Libraries
-    # Install all of the require Python libraries in order to perform the necessary actions within the Python notebook
-####################################################################################################
-
-
-# Used when working with and manipulating dates and times
-from datetime import datetime, timedelta
-
-# Enables the ability to access and manipulate Azure Blob Storeage containers and blobs
-from azure.storage.blob import BlobServiceClient
-
-# Enables the ability to search for file names based on specified string pattern(s)
-    # Resource: https://docs.python.org/3/library/fnmatch.html
-import fnmatch
-
-# Enables the ability to utilize DataFrames, which are 2-dimension data structures, such as a 2-dimension arrays or a tables with rows and columns
-import pandas as pd
-
-
-####################################################################################################
-# Step 3: Setup the credentials to connect to Azure Blob Storage
-####################################################################################################
-
-
-# Account Name of the Azure Blob Storage environment
-account_name = "<account_name>"
-
-# Account Key for the Azure Blob Storage environment
-account_key = "<account_key>"
-
-# Connection String for the Azure Blob Storage environment, which is created from the Account Name and Account Key listed above
-connection_string = f"DefaultEndpointsProtocol=https;AccountName={account_name};AccountKey={account_key};EndpointSuffix=core.windows.net"
-
-# Name of the Azure Blob Storage container that the file(s) are either:
-# - Loaded into from the source, such as a SFTP or other application
-# - Extracted from, to load into the:
-#    - Data warehouse
-#    - Azure Blob Storage archive container, for future use if needed
-container_name = "<Container_Name>"
-
-# Name of the Azure Blob Storage archive container that the file(s) will be archived into, for future use if needed
-archive_container_name = "<Archive_Container_Name>"
-
-
-####################################################################################################
-# Step 4: Establish a BlobServiceClient
-    # Connect to Azure Blob Storage
-####################################################################################################
-
-
-# Establish the BlobServiceClient in order to interact with Azure Blob Storage at the account level
-    # The connection to the BlobServiceClient closes automatically after the with block is exited
-            # Therefore, no need for the blob_service_client.close() command
-with BlobServiceClient.from_connection_string(connection_string) as blob_service_client:
-
-
-    ####################################################################################################
-    # Step 5: Establish a ContainerClient to identify source files
-        # Connect to the Azure Blob Storage source container, specified above
-    ####################################################################################################
-
-
-    # Establish the ContainerClient in order to interact with the Azure Blob Storage source container, specified above
-        # This enables the ability to list the file(s) located within the Azure Blob Storage source container, specified above
-    with blob_service_client.get_container_client(container_name) as container_client_list:
-
-
-        ####################################################################################################
-        # Step 6: Identify the Azure Blob Storage source container file(s)
-        ####################################################################################################
-
-
-        # Create a list of files that are contained within the Azure Blob Storage source container, specified above
-            # This list will enable the ability to loop through each file, one at a time, and perform the same operations on each file
-        blob_list = container_client_list.list_blob_names()
-
-
-    ####################################################################################################
-    # Step 7: Loop through the Azure Blob Storage source container file(s)
-    ####################################################################################################
-
-
-    # Loop through each of the files, one at a time, within the Azure Blob Storage source container, specified above
-        # This ensures that the same operations are performed on each file, one at a time
-    for blob in blob_list:
-
-
-        ####################################################################################################
-        # Step 8: Establish a second ContainerClient
-            # Connect to the Azure Blob Storage source container, specified above
-        ####################################################################################################
-
-
-        # Establish the ContainerClient in order to interact with the Azure Blob Storage source container, specified above
-        with blob_service_client.get_container_client(container_name) as container_client:
-
-
-            ####################################################################################################
-            # Step 9: Establish a BlobClient
-                # Connect to the Azure Blob Storage source container file
-            ####################################################################################################
-
-
-            # Establish the BlobClient in order to interact with the file within the Azure Blob Storage source container, specified above
-            with container_client.get_blob_client(blob) as blob_client:
-                
-
-                ####################################################################################################
-                # Step 10: Load the data from the Azure Blob Storage source container file into a Pandas DataFrame
-                ####################################################################################################
-
-
-                # Load the Azure Blob Storage source container file into a Pandas DataFrame
-                df = pd.read_csv(blob_client.download_blob())
-                   
-                   """
-                # Verify if there is any data within the new Pandas DataFrame
-                    # Remove once the data has been verified
-                if not df.empty:
-
-                    print('The Pandas DataFrame contains data')
-
-                else:
-
-                    print('The Pandas DataFrame is empty')
-                """
-                
-                """
-                # Display the data within the Pandas DataFrame
-                    # Remove once the data has been verified
-                print(df)
-                """
-
-
-        ####################################################################################################
-        # Step 11: Convert the Pandas DataFrame to the proper format
-        ####################################################################################################
-    
-
-        # Convert the Pandas DataFrame to a CSV string in a new Pandas DataFrame
-            # This enables the ability to write the data within the Pandas DataFrame into a Azure Blob Storage file
-        df_csv = df_subset.to_csv(index = False)
-
-        """
-        # Verify if there is any data within the df_csv Pandas DataFrame
-            # Comment out once the data has been verified
-        if not df_csv.empty:
-
-            print('The df_csv Pandas DataFrame contains data:')
-            print()
-            print(df_csv)
-
-        else:
-
-            print('The df_csv Pandas DataFrame is empty')
-        """
-
-
-        ####################################################################################################
-        # Step 12: ENTER THE DATA LOAD LOGIC HERE
-        ####################################################################################################
-
-
-        # ENTER THE DATA LOAD LOGIC HERE FOR LOADING THE DATA INTO THE DESTINATION LOCATION
-
-
-        ####################################################################################################
-        # Step 13: Establish a third ContainerClient
-            # Connect to the Azure Blob Storage archive container, specified above
-        ####################################################################################################
-
-
-        # Establish a second ContainerClient in order to interact with the Azure Blob Storage archive container, specified above
-        with blob_service_client.get_container_client(archive_container_name) as archive_container_client:
-
-
-            ####################################################################################################
-            # Step 14: Establish a second BlobClient
-                # Connect to the Azure Blob Storage archive container file
-            ####################################################################################################
-
-
-            # Establish a second BlobClient in order to interact with the archive file within the Azure Blob Storage archive container, specified above
-            with archive_container_client.get_blob_client(blob) as archive_blob_client:
-                
-
-                ####################################################################################################
-                # Step 15: Load the data within the formatted Pandas DataFrame into the Azure Blob Storage archive container file
-                ####################################################################################################
-
-
-                # Create a new file, or overwrite an existing file, within the Azure Blob Storage archive container
-                    # Set overwrite = False, if you do not want to overwrite existing files that contain the same name as the file you are currently trying to create
-                archive_blob_client.upload_blob(df_csv, overwrite = True)
-
-
-        ####################################################################################################
-        # Step 16: Delete the Azure Blob Storage source container
-        ####################################################################################################
-
-
-        # Delete the file from the Azure Blob Storage source container
-            # This prevents the same file from being loaded into the destination multiple times, which will create duplicate data
-        blob_client.delete_blob()
\ No newline at end of file
+"""
+    The "Connect to Azure Blob Storage - Template" file showcases how to pull data from Azure Blob Storage, looping through all files within Azure Blob Storage, then loading the data into a Pandas DataFrame
+
+    Data Pipeline Process:
+
+        Step 1: Install Required Python Packages
+
+        Step 2: Install Required Python Libraries
+
+        Step 3: Setup the credentials to connect to Azure Blob Storage
+
+        Step 4: Establish a BlobServiceClient
+
+            Step 5: Establish a ContainerClient for the source container and the archive container
+
+                Step 6: Identify the Azure Blob Storage source container file(s)
+
+                Step 7: Define the download stage
+                
+                    Download the data from the Azure Blob Storage source container file
+                
+                Step 8: Define the transform stage
+                
+                    Load the data from the Azure Blob Storage source container file into a Pandas DataFrame
+                    
+                    Convert the Pandas DataFrame to the output format, such as Parquet
+                    
+                    ENTER THE DATA LOAD LOGIC HERE
+                
+                Step 9: Define the archive stage
+                
+                    Load the data within the formatted Pandas DataFrame into the Azure Blob Storage archive container file, or copy the original Azure Blob Storage source container file into the archive container
+                    
+                    Delete the Azure Blob Storage source container file
+                
+                Step 10: Run the download, transform and archive stages for all of the Azure Blob Storage source container file(s) at the same time
+"""
+
+
+##############################################################################################################
+# Step 1: Install Required Python Packages
+    # Install all of the require Python packages in order to perform the necessary actions within the Python notebook
+        # This section is only used for tools that require you to install all of the necessary packages before each time the code is executed, such as Databricks
+##############################################################################################################
+
+
+# Install the azure-identity Python package
+    # Used to connect to Azure Blob Storage	
+%pip install azure-identity
+
+# Install the azure-storage-blob Python package
+    # Allows you to manipulate Azure Storage resources and blob containers	
+%pip install azure-storage-blob
+
+# Install the pandas Python package
+    # Used to store data in Series and DataFrames	
+%pip install pandas
+
+# Install the zstandard Python package
+    # Used to decompress and compress files using zstd, such as .csv.zst files
+        # Only required when the source files or the archive files use zstd
+%pip install zstandard
+
+# Install the pyarrow Python package
+    # Used to write the data into Parquet, Feather and CSV files without converting the data into a string first	
+%pip install pyarrow
+
+# Restart the kernel to use updated packages
+    # Databricks specific command that is required to use any newly install Python packages listed above
+%restart_python
+
+
+####################################################################################################
+# Step 2: Install Required Python Libraries
+    # Install all of the require Python libraries in order to perform the necessary actions within the Python notebook
+####################################################################################################
+
+
+# Used when working with and manipulating dates and times
+from datetime import datetime, timedelta
+
+# Enables the ability to access and manipulate Azure Blob Storeage containers and blobs
+from azure.storage.blob import BlobServiceClient
+
+# Enables the ability to identify each block of data that is written into an Azure Blob Storage file, one block at a time
+from azure.storage.blob import BlobBlock
+
+# Enables the ability to run the same function multiple times at the same time, using a pool of threads
+    # Resource: https://docs.python.org/3/library/concurrent.futures.html
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Enables the ability to compress CSV files using bz2 as they are written
+import bz2
+
+# Enables the ability to search for file names based on specified string pattern(s)
+    # Resource: https://docs.python.org/3/library/fnmatch.html
+import fnmatch
+
+# Enables the ability to compress CSV files using gzip as they are written
+import gzip
+
+# Enables the ability to treat data held in memory as a file
+import io
+
+# Enables the ability to change the extension of the Azure Blob Storage archive container file names
+import os
+
+# Enables the ability to pause the data pipeline for a specified number of seconds
+import time
+
+# Enables the ability to utilize DataFrames, which are 2-dimension data structures, such as a 2-dimension arrays or a tables with rows and columns
+import pandas as pd
+
+# Enables the ability to convert Pandas DataFrames into Arrow tables, then write the Arrow tables into Parquet, Feather or CSV files
+    # Resource: https://arrow.apache.org/docs/python/index.html
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+# zstandard is imported within the open_output_stream function, and only when the CSV files are compressed using zstd
+    # This allows .csv and .csv.gz files to be written without installing the zstandard Python package
+
+
+####################################################################################################
+# Step 3: Setup the credentials to connect to Azure Blob Storage
+####################################################################################################
+
+
+# Account Name of the Azure Blob Storage environment
+account_name = "<account_name>"
+
+# Account Key for the Azure Blob Storage environment
+account_key = "<account_key>"
+
+# Connection String for the Azure Blob Storage environment, which is created from the Account Name and Account Key listed above
+connection_string = f"DefaultEndpointsProtocol=https;AccountName={account_name};AccountKey={account_key};EndpointSuffix=core.windows.net"
+
+# Name of the Azure Blob Storage container that the file(s) are either:
+# - Loaded into from the source, such as a SFTP or other application
+# - Extracted from, to load into the:
+#    - Data warehouse
+#    - Azure Blob Storage archive container, for future use if needed
+container_name = "<Container_Name>"
+
+# Name of the Azure Blob Storage archive container that the file(s) will be archived into, for future use if needed
+archive_container_name = "<Archive_Container_Name>"
+
+# The columns to keep from the Azure Blob Storage source container file(s), and the data type of each column
+    # Only these columns are parsed from the Azure Blob Storage source container file(s), rather than parsing every column and removing the unwanted columns afterwards
+        # This is similar to the SELECT clause in SQL
+    # pd.read_csv raises a ValueError if any of these columns do not exist within the Azure Blob Storage source container file(s)
+        # This ensures that the data pipeline fails immediately, rather than loading incomplete data into the destination location
+    # Choose the smallest data type that fits the data within each column, rather than loading every column as text
+        # "string[pyarrow]" - Text, stored in the Arrow format, which uses far less memory than Python strings and is written into the output format without being converted
+        # "Int64", "Float64" and "boolean" - Numbers and True/False values, which allow missing values
+file_columns = {
+    '<Column_1>': 'string[pyarrow]'
+    ,'<Column_2>': 'Float64'
+    ,'<Column_...N>': 'string[pyarrow]'
+}
+
+# The engine used to load the data within each file into a Pandas DataFrame
+    # "pyarrow" - Parses blocks of the file using multiple threads, which is usually several times faster than "c" for large files
+        # The delimiter must be a single character, and options such as chunksize, nrows, skipfooter, comment and thousands are not supported
+    # "c" - The default engine of pd.read_csv, which parses the file using 1 thread and supports every pd.read_csv option
+        # Use "c" for files that require options the "pyarrow" engine does not support
+    # To compare both engines using files with a similar size, number of columns and delimiter, use the benchmark_read_file function within the data_connectors files connector
+parse_engine = "pyarrow"
+
+# The compression of each Azure Blob Storage source container file, using the extension of the file name, such as .csv.gz or .csv.zst
+    # pd.read_csv decompresses the data as it is read, straight from the Azure Blob Storage source container file, rather than downloading and decompressing the entire file first
+        # Nothing is written to disk, and only the compressed data is transferred over the network
+    # Files with any other extension, such as .csv, are not decompressed
+        # "zstd" requires the zstandard Python package
+file_compressions = {"gz": "gzip", "gzip": "gzip", "bz2": "bz2", "zst": "zstd", "zstd": "zstd"}
+
+# The number of rows that are loaded into a Pandas DataFrame at a time, when streaming the Azure Blob Storage source container file in chunks
+    # Only 1 chunk is held in memory at a time, therefore the memory used depends on chunk_size rather than the size of the file
+chunk_size = 100000
+
+# The format of the Azure Blob Storage archive container file(s)
+    # "parquet" - Compressed and stored by column, which is the smallest format and the fastest format to load into a data warehouse
+    # "feather" - Compressed and stored in the Arrow format, which is the fastest format to write and to read back into a Pandas DataFrame
+    # "csv" - Text, which is the largest and slowest format, only use when the destination location requires CSV files
+output_format = "parquet"
+
+# The compression used within Parquet and Feather files, or the compression of the entire CSV file
+    # "zstd" provides a good balance between the size of the file and the speed of compressing the file
+        # Parquet files also support "snappy", "gzip", "brotli" and "lz4", while Feather files also support "lz4"
+        # CSV files support "gzip", "bz2" and "zstd", and are not compressed for any other value, such as None
+output_compression = "zstd"
+
+# The maximum number of rows written into each row group of a Parquet file, or each record batch of a Feather file
+    # The data is written 1 row group at a time, rather than converting all of the data at once
+output_row_group_size = 100000
+
+# The maximum number of Azure Blob Storage source container files that are downloaded at the same time
+download_max_workers = 4
+
+# The maximum number of Azure Blob Storage source container files that are loaded into a Pandas DataFrame, converted and loaded into the destination location at the same time
+    # This stage uses the most CPU and memory, therefore it is usually kept lower than the download and archive stages
+transform_max_workers = 2
+
+# The maximum number of Azure Blob Storage source container files that are archived and deleted at the same time
+archive_max_workers = 4
+
+# The maximum number of Azure Blob Storage source container files that can be in progress at the same time, across all 3 stages
+    # A new file is not downloaded until a file in progress has been archived and deleted
+        # This prevents downloaded files from building up in memory when the download stage is faster than the transform stage
+max_files_in_progress = 8
+
+# Identifies if the archive stage copies the original Azure Blob Storage source container file, using Method 3 of Step 9
+    # True - The archive file contains the original data, therefore the transform stage skips converting the data into the output format and staging the blocks of data
+    # False - The archive file contains the data converted into the output format, using Method 1 or Method 2 of Step 9
+archive_original_file = False
+
+# The number of seconds to wait between each check of whether an Azure Blob Storage archive container file has finished copying
+    # Only used when the archive stage copies the original Azure Blob Storage source container file, using Method 3 of Step 9
+archive_copy_poll_seconds = 1
+
+
+####################################################################################################
+# Step 4: Establish a BlobServiceClient
+    # Connect to Azure Blob Storage
+####################################################################################################
+
+
+# Establish the BlobServiceClient in order to interact with Azure Blob Storage at the account level
+    # The connection to the BlobServiceClient closes automatically after the with block is exited
+            # Therefore, no need for the blob_service_client.close() command
+with BlobServiceClient.from_connection_string(connection_string) as blob_service_client:
+
+
+    ####################################################################################################
+    # Step 5: Establish a ContainerClient for the source container and the archive container
+        # Connect to the Azure Blob Storage source container and archive container, specified above
+    ####################################################################################################
+
+
+    # Establish the ContainerClients in order to interact with the Azure Blob Storage source container and archive container, specified above
+        # The same ContainerClients are used for every file, rather than establishing new ContainerClients and BlobClients for each file
+            # ContainerClients can be shared by multiple threads, therefore all of the stages below can use them at the same time
+    with blob_service_client.get_container_client(container_name) as container_client, \
+        blob_service_client.get_container_client(archive_container_name) as archive_container_client:
+
+
+        ####################################################################################################
+        # Step 6: Identify the Azure Blob Storage source container file(s)
+        ####################################################################################################
+
+
+        # Create a list of files that are contained within the Azure Blob Storage source container, specified above
+            # This list will enable the ability to loop through each file and perform the same operations on each file
+                # The list of files is retrieved from Azure Blob Storage as it is looped through, 1 page of files at a time
+        blob_list = container_client.list_blob_names()
+
+
+        ####################################################################################################
+        # Step 7: Define the download stage
+            # Download the data from the Azure Blob Storage source container file
+        ####################################################################################################
+
+
+        # Define the function that downloads the data from 1 Azure Blob Storage source container file
+            # The function returns the data as a file-like object, which can be read by pd.read_csv
+        def download_source_blob(blob):
+
+            # ***** Choose one of the 2 methods below *****
+                # The method must match the method chosen within the transform and archive stages below
+
+
+            # Method 1: Download the entire Azure Blob Storage source container file into memory
+            return io.BytesIO(container_client.download_blob(blob).readall())
+
+
+            # Method 2: Return a stream of the Azure Blob Storage source container file, without downloading the entire file
+                # Use this method for files that are too large to fit into memory
+                    # The data is downloaded as it is read by the transform stage below
+            return container_client.download_blob(blob)
+
+
+        ####################################################################################################
+        # Step 8: Define the transform stage
+            # Load the data from the Azure Blob Storage source container file into a Pandas DataFrame
+            # Convert the Pandas DataFrame to the output format, such as Parquet
+            # ENTER THE DATA LOAD LOGIC HERE
+        ####################################################################################################
+
+
+        # Define the function that creates the writer for the output format, which writes Arrow tables straight into a file-like object
+            # The data is written into the file-like object 1 row group at a time, rather than building 1 large string of the entire file
+        def open_output_writer(output_stream, arrow_schema):
+
+            if output_format == "parquet":
+
+                return pq.ParquetWriter(output_stream, arrow_schema, compression = output_compression)
+
+            if output_format == "feather":
+
+                return pa.ipc.new_file(output_stream, arrow_schema, options = pa.ipc.IpcWriteOptions(compression = output_compression))
+
+            return pa_csv.CSVWriter(output_stream, arrow_schema)
+
+        # Define the function that returns the output stream that the writer writes into
+            # CSV files are compressed as they are written when output_compression is "gzip", "bz2" or "zstd"
+                # The compressed data is written into output_stream as it is compressed, therefore each block of data can still be staged as it is written
+                # Closing the returned output stream writes the end of the compressed data into output_stream, without closing output_stream
+            # Parquet and Feather files compress the data within the file, therefore output_stream is returned as is
+        def open_output_stream(output_stream):
+
+            if output_format == "csv" and output_compression == "gzip":
+
+                return gzip.GzipFile(fileobj = output_stream, mode = "wb")
+
+            if output_format == "csv" and output_compression == "bz2":
+
+                return bz2.BZ2File(output_stream, mode = "wb")
+
+            if output_format == "csv" and output_compression == "zstd":
+
+                # Enables the ability to compress CSV files using zstd as they are written
+                import zstandard
+
+                return zstandard.ZstdCompressor().stream_writer(output_stream, closefd = False)
+
+            return output_stream
+
+        # Define the function that returns the name of the Azure Blob Storage archive container file, using the extension of the output format
+            # The extension of the compression of the source file, such as .gz within .csv.gz, is also removed from the name
+            # Compressed CSV files include the extension of the compression, such as .csv.gz
+        def get_archive_blob_name(blob):
+
+            archive_blob_name, blob_extension = os.path.splitext(blob)
+
+            if blob_extension[1:].lower() in file_compressions:
+
+                archive_blob_name = os.path.splitext(archive_blob_name)[0]
+
+            if output_format == "csv" and output_compression in ("gzip", "bz2", "zstd"):
+
+                compression_extension = {"gzip": "gz", "bz2": "bz2", "zstd": "zst"}[output_compression]
+
+                return f"{archive_blob_name}.csv.{compression_extension}"
+
+            return f"{archive_blob_name}.{output_format}"
+
+        # Define the output stream that holds only the data written since the last block, rather than all of the data written into the file
+            # Parquet and Feather files end with a footer that records the position of each row group, therefore tell returns the position within the entire file
+                # The data within the block buffer is removed once it has been written into the Azure Blob Storage archive container as a block of data
+                    # Only 1 row group is held in memory at a time, rather than the entire archive file
+        class OutputBlockStream(io.RawIOBase):
+
+            def __init__(self):
+
+                self.block_buffer = io.BytesIO()
+
+                # The position within the entire file, including the data already written as blocks
+                self.position = 0
+
+            def writable(self):
+
+                return True
+
+            def write(self, data):
+
+                written_size = self.block_buffer.write(data)
+
+                self.position += written_size
+
+                return written_size
+
+            def tell(self):
+
+                return self.position
+
+            # Return the data written since the last block, then empty the block buffer
+            def read_block(self):
+
+                block_data = self.block_buffer.getvalue()
+
+                self.block_buffer.seek(0)
+                self.block_buffer.truncate(0)
+
+                return block_data
+
+        # Define the function that writes the data added to the output stream since the last block into the Azure Blob Storage archive container file as a new block of data
+        def stage_output_block(archive_blob_client, output_stream, archive_block_list):
+
+            block_data = output_stream.read_block()
+
+            if block_data:
+
+                block_id = f"{len(archive_block_list):08d}"
+                archive_blob_client.stage_block(block_id, block_data)
+                archive_block_list.append(BlobBlock(block_id = block_id))
+
+
+        # Define the function that loads the downloaded data into a Pandas DataFrame, converts the Pandas DataFrame to the proper format and loads the data into the destination location
+            # The function returns the data that will be written into the Azure Blob Storage archive container file
+        def transform_source_blob(blob, blob_data):
+
+            # ***** Choose one of the 2 methods below *****
+                # The method must match the method chosen within the download and archive stages
+
+
+            # Method 1: Load the entire Azure Blob Storage source container file into the df Pandas DataFrame
+
+            # Load the Azure Blob Storage source container file into a Pandas DataFrame
+            df = pd.read_csv(
+                blob_data
+                # Only parse the columns within the file_columns dictionary, using the data type specified for each column
+                ,usecols = list(file_columns)
+                ,dtype = file_columns
+                # Decompress the file as it is read, using the compression identified within Step 3
+                ,compression = file_compressions.get(blob.rsplit(".", 1)[-1].lower())
+                # Load the file using the engine chosen within Step 3
+                ,engine = parse_engine
+            )
+
+            # Arrange the columns within the df Pandas DataFrame in the same order as the file_columns dictionary
+                # The unwanted columns were never parsed, as only the columns within the file_columns dictionary are parsed from the file
+            df_subset = df[list(file_columns)]
+
+            """
+            # Verify if there is any data within the new Pandas DataFrame
+                # Remove once the data has been verified
+            if not df_subset.empty:
+
+                print('The Pandas DataFrame contains data')
+
+            else:
+
+                print('The Pandas DataFrame is empty')
+            """
+
+            # ENTER THE DATA LOAD LOGIC HERE FOR LOADING THE DATA INTO THE DESTINATION LOCATION
+                # To load the data into Snowflake, use the write_pandas function within Step 8 of the "Connect to Snowflake - Template" file
+
+            # Skip converting the data into the output format when the archive stage copies the original Azure Blob Storage source container file
+            if archive_original_file:
+
+                return None
+
+            # Convert the Pandas DataFrame to the output format, writing the data into memory as a file
+                # This enables the ability to write the data within the Pandas DataFrame into a Azure Blob Storage file
+                    # The Pandas DataFrame is converted into an Arrow table, which is written 1 row group at a time without creating a string of the data
+            archive_data = io.BytesIO()
+
+            arrow_table = pa.Table.from_pandas(df_subset, preserve_index = False)
+
+            # Compress the CSV file as it is written, if the output format is a compressed CSV file
+            archive_stream = open_output_stream(archive_data)
+
+            with open_output_writer(archive_stream, arrow_table.schema) as output_writer:
+
+                for arrow_batch in arrow_table.to_batches(max_chunksize = output_row_group_size):
+
+                    output_writer.write_batch(arrow_batch)
+
+            # Write the end of the compressed CSV file into archive_data
+            if archive_stream is not archive_data:
+
+                archive_stream.close()
+
+            # Move back to the beginning of the data, so that the archive stage uploads all of the data
+            archive_data.seek(0)
+
+            return archive_data
+
+
+            # Method 2: Stream the Azure Blob Storage source container file into Pandas DataFrames, chunk_size rows at a time
+                # Use this method for files that are too large to fit into memory
+                    # Each chunk is written into the Azure Blob Storage archive container file as a separate block of data
+                        # The blocks of data are not visible within the archive file until the list of blocks is committed within the archive stage
+
+            # Create an iterator that reads chunk_size rows from the Azure Blob Storage source container file each time it is looped through
+            df_chunks = pd.read_csv(
+                blob_data
+                # Only parse the columns within the file_columns dictionary, using the data type specified for each column
+                ,usecols = list(file_columns)
+                ,dtype = file_columns
+                # Decompress the file as it is read, using the compression identified within Step 3
+                ,compression = file_compressions.get(blob.rsplit(".", 1)[-1].lower())
+                # The "pyarrow" engine does not support chunksize, therefore the chunks are always loaded using the default "c" engine
+                ,chunksize = chunk_size
+            )
+
+            # Establish the BlobClient in order to write each block of data into the Azure Blob Storage archive container file
+            archive_blob_client = archive_container_client.get_blob_client(get_archive_blob_name(blob))
+
+            # The list will collect the ID of each block of data that is written into the Azure Blob Storage archive container file
+            archive_block_list = []
+
+            # The output stream that each chunk is written into, using the output format
+                # The output stream only holds the data written since the last block, therefore only 1 chunk of the archive file is held in memory at a time
+            output_stream = OutputBlockStream()
+
+            # Compress the CSV file as it is written into the output stream, if the output format is a compressed CSV file
+            compressed_stream = open_output_stream(output_stream)
+
+            # The writer is created once the first chunk has been loaded, as the writer requires the columns and data types of the data
+            output_writer = None
+
+            # Loop through each chunk of the Azure Blob Storage source container file, one at a time
+            for df_chunk in df_chunks:
+
+                # Arrange the columns within the df_chunk Pandas DataFrame in the same order as the file_columns dictionary
+                df_subset = df_chunk[list(file_columns)]
+
+                # ENTER THE DATA LOAD LOGIC HERE FOR LOADING EACH CHUNK INTO THE DESTINATION LOCATION
+                    # To load the data into Snowflake, use the write_pandas function within Step 8 of the "Connect to Snowflake - Template" file
+
+                # Skip converting the chunk into the output format when the archive stage copies the original Azure Blob Storage source container file
+                    # No blocks of data are staged, as the blocks would be left uncommitted within the Azure Blob Storage archive container
+                if archive_original_file:
+
+                    continue
+
+                # Convert the chunk into an Arrow table
+                arrow_table = pa.Table.from_pandas(df_subset, preserve_index = False)
+
+                if output_writer is None:
+
+                    output_writer = open_output_writer(compressed_stream, arrow_table.schema)
+
+                # Write the chunk into the output stream as 1 row group
+                    # The column names of CSV files are only included in the first chunk, so that they only appear once within the archive file
+                output_writer.write_table(arrow_table)
+
+                # Write the chunk into the Azure Blob Storage archive container as a separate block of data
+                stage_output_block(archive_blob_client, output_stream, archive_block_list)
+
+            # Close the writer, which completes the file by writing the footer, then write the footer into the Azure Blob Storage archive container as the last block of data
+            if output_writer is not None:
+
+                output_writer.close()
+
+                # Write the end of the compressed CSV file into the output stream
+                if compressed_stream is not output_stream:
+
+                    compressed_stream.close()
+
+                stage_output_block(archive_blob_client, output_stream, archive_block_list)
+
+            return archive_block_list
+
+
+        ####################################################################################################
+        # Step 9: Define the archive stage
+            # Load the data within the formatted Pandas DataFrame into the Azure Blob Storage archive container file, or copy the original Azure Blob Storage source container file into the archive container
+            # Delete the Azure Blob Storage source container file
+        ####################################################################################################
+
+
+        # Define the function that writes the data into the Azure Blob Storage archive container file, then deletes the Azure Blob Storage source container file
+        def archive_source_blob(blob, archive_data):
+
+            # ***** Choose one of the 3 methods below *****
+                # Method 1 and Method 2 must match the method chosen within the download and transform stages, with archive_original_file set to False within Step 3
+                # Method 3 requires archive_original_file set to True within Step 3, which skips the output format conversion and the staging of blocks of data within the transform stage
+                    # Either method within the download and transform stages can then be used
+
+
+            # Method 1: Create a new file, or overwrite an existing file, within the Azure Blob Storage archive container
+                # Set overwrite = False, if you do not want to overwrite existing files that contain the same name as the file you are currently trying to create
+                    # The archive file uses the extension of the output format, such as .parquet
+            archive_container_client.upload_blob(get_archive_blob_name(blob), archive_data, overwrite = True)
+
+
+            # Method 2: Create a new file, or overwrite an existing file, within the Azure Blob Storage archive container from all of the blocks of data, in order
+            archive_container_client.get_blob_client(get_archive_blob_name(blob)).commit_block_list(archive_data)
+
+
+            # Method 3: Copy the original Azure Blob Storage source container file into the archive container, within Azure Blob Storage
+                # Use this method when the archive file should contain the original data, rather than the formatted Pandas DataFrame
+                    # The data is copied by Azure Blob Storage itself, therefore the data is not uploaded from the data pipeline and is not converted into the output format
+                        # The output format conversion within the transform stage is skipped when archive_original_file is True, therefore archive_data is not used by this method
+
+            # Establish the BlobClient in order to interact with the archive file within the Azure Blob Storage archive container, specified above
+            archive_blob_client = archive_container_client.get_blob_client(blob)
+
+            # Start copying the Azure Blob Storage source container file into the Azure Blob Storage archive container
+                # Copies within the same Azure Blob Storage account are usually completed immediately, but larger files may still be copying when this returns
+            copy_status = archive_blob_client.start_copy_from_url(container_client.get_blob_client(blob).url)["copy_status"]
+
+            # Wait until the copy has completed, checking the status of the copy every archive_copy_poll_seconds seconds
+                # The Azure Blob Storage source container file cannot be deleted until the copy has completed
+            while copy_status == "pending":
+
+                time.sleep(archive_copy_poll_seconds)
+
+                copy_status = archive_blob_client.get_blob_properties().copy.status
+
+            # Stop the data pipeline if the copy did not complete successfully, so that the Azure Blob Storage source container file is not deleted
+            if copy_status != "success":
+
+                raise RuntimeError(f"The archive copy of {blob} did not complete successfully. Copy status: {copy_status}")
+
+
+            # Delete the file from the Azure Blob Storage source container
+                # This prevents the same file from being loaded into the destination multiple times, which will create duplicate data
+                    # The file is only deleted once it has been loaded and archived
+            container_client.delete_blob(blob)
+
+
+        ####################################################################################################
+        # Step 10: Run the download, transform and archive stages for all of the Azure Blob Storage source container file(s) at the same time
+            # Each stage has its own pool of threads, therefore the next file can be downloading while the current file is being transformed and the previous file is being archived
+        ####################################################################################################
+
+
+        # Establish a pool of threads for each stage
+            # The pools of threads close automatically after the with block is exited, once all of the files have been archived and deleted
+        with ThreadPoolExecutor(max_workers = download_max_workers) as download_executor, \
+            ThreadPoolExecutor(max_workers = transform_max_workers) as transform_executor, \
+            ThreadPoolExecutor(max_workers = archive_max_workers) as archive_executor:
+
+            # The dictionary will collect each file that is in progress, along with the stage that the file is in
+                # The key is the running stage for the file and the value is the stage name and the file name
+            files_in_progress = {}
+
+            # Create an iterator that returns the next Azure Blob Storage source container file each time it is called
+            blob_iterator = iter(blob_list)
+
+            # Identifies if all of the Azure Blob Storage source container files have been sent to the download stage
+            all_files_downloading = False
+
+            # Loop until all of the Azure Blob Storage source container files have been sent to the download stage, and every file has completed all 3 stages
+            while not all_files_downloading or files_in_progress:
+
+                # Send the next Azure Blob Storage source container file(s) to the download stage, until max_files_in_progress files are in progress
+                while not all_files_downloading and len(files_in_progress) < max_files_in_progress:
+
+                    blob = next(blob_iterator, None)
+
+                    if blob is None:
+
+                        all_files_downloading = True
+
+                    else:
+
+                        files_in_progress[download_executor.submit(download_source_blob, blob)] = ("download", blob)
+
+                # Wait until at least 1 file has completed its current stage
+                completed_stages, _ = wait(files_in_progress, return_when = FIRST_COMPLETED)
+
+                # Loop through each file that has completed its current stage, and send the file to its next stage
+                for completed_stage in completed_stages:
+
+                    stage_name, blob = files_in_progress.pop(completed_stage)
+
+                    # The result of the stage that was completed
+                        # If the stage failed, the error is raised here, which stops the data pipeline before the file is deleted
+                    stage_result = completed_stage.result()
+
+                    if stage_name == "download":
+
+                        files_in_progress[transform_executor.submit(transform_source_blob, blob, stage_result)] = ("transform", blob)
+
+                    elif stage_name == "transform":
+
+                        files_in_progress[archive_executor.submit(archive_source_blob, blob, stage_result)] = ("archive", blob)
+
+                    """
+                    # Display the name of each file once it has been archived and deleted
+                        # Comment out once the files have been verified
+                    if stage_name == "archive":
+
+                        print(f"{blob} has been loaded, archived and deleted")
+                    """
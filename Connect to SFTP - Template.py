@@ -1,303 +1,749 @@
-"""
-    The "Connect to SFTP - Template" file showcases how to pull data from a SFTP, looping through all files within the SFTP, then loading the data into a Pandas DataFrame
-
-    Data Pipeline Process:
-
-        Step 1: Install Required Python Packages
-
-        Step 2: Install Required Python Libraries
-
-        Step 3: Setup the credentials to connect to the SFTP
-
-        Step 4: Connect to the SFTP
-
-        Step 5: Establish a SFTP client object
-
-            Step 6: Extract the data from the file within the SFTP File Path
-
-                Step 7: Identify the necessary SFTP file path file(s)
-                
-                    Step 8: Connect to the SFTP file path file
-                
-                        Step 9: Load the data from the SFTP file path file into a Pandas DataFrame
-                
-                        Step 10: Convert the Pandas DataFrame to the proper format
-                
-        Step 11: Consolidate all csv files in the all_date List into 1 Pandas Dataframe
-        
-        Step 12: Load Pandas DataFrame into Target Location
-        
-        Step 13: Delete the SFTP file path file
-"""
-
-
-##############################################################################################################
-# Step 1: Install Required Python Packages
-    # Install all of the require Python packages in order to perform the necessary actions within the Python notebook
-        # This section is only used for tools that require you to install all of the necessary packages before each time the code is executed, such as Databricks
-##############################################################################################################
-
-
-# Install the datetime Python package
-    # Used when working with and manipulating dates and times	
-%pip install datetime
-
-# Install the paramiko Python package
-    # Used to connect to SFTP environments	
-%pip install paramiko
-
-# Install the pandas Python package
-    # Used to store data in Series and DataFrames	
-%pip install pandas
-
-# Restart the kernel to use updated packages
-    # Databricks specific command that is required to use any newly install Python packages listed above
-%restart_python
-
-
-####################################################################################################
-# Step 2: Install Required Python Libraries
-    # Install all of the require Python libraries in order to perform the necessary actions within the Python notebook
-####################################################################################################
-
-
-# Used when working with and manipulating dates and times
-from datetime import datetime, timedelta
-
-# Enables the ability to connect to the SFTP
-    # pysftp not longer being maintained, therefore should use paramiko instead
-import paramiko
-
-# Enables the ability to search for file names based on specified string pattern(s)
-    # Resource: https://docs.python.org/3/library/fnmatch.html
-import fnmatch
-
-# Enables the ability to utilize DataFrames, which are 2 dimension data structures, such as a 2-dimension arrays or a tables with rows and columns
-import pandas as pd
-
-
-####################################################################################################
-# Step 3: Setup the credentials to connect to the SFTP
-    # Open a SSH connection and connect to the SFTP
-        # SSH uses encryption to establish a secure connection between a client and a server, such as a SFTP server
-####################################################################################################
-
-
-# Establish the SSHClient in order to interact with the SFTP SSH server
-ssh_client = paramiko.SSHClient()
-
-# Set the policy for handling unknown host keys to autmoatically add the host keys to the known hosts file
-ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
-# Set the SFTP file path that contains the source file(s)
-    # "." is the default file path used if no file path is specified
-        # The "." default file path should be used if the file(s) do NOT have a file path / directory
-            # i.e. the file(s) are not stored in a folder
-sftp_file_path = "<Path_To_SFTP_File(s)>"
-
-# The name of the SFTP file
-file_name = "<File_Name>"
-
-# The extension of the SFTP file
-file_extension = "<File_Extension>"
-
-# The pattern of the SFTP file name, which is a consolidation of the following 2 parts:
-    # file_name - The name of the SFTP file
-    # file_extension - The extension of the SFTP file
-sftp_file_name_pattern = f"*{file_name}*.{file_extension}"
-
-# The list will consolidate all SFTP file names
-    # Consolidating all SFTP files into a list, then converting the entire list into a Pandas DataFrame
-    # prevents multiple Pandas DataFrames from being created in the for loop
-        # This method is more effiecient and less computational than converting each dictionary into a Pandas DataFrame
-        # and appending to one another, then consolidating all Pandas DataFrames into one
-all_data = []
-
-# The list will consolidate the name of each SFTP file that has been loaded into the target location
-loaded_file_list = []
-
-
-####################################################################################################
-# Step 4: Connect to the SFTP
-####################################################################################################
-
-
-# Connect to the SFTP SSH server
-ssh_client.connect(
-    hostname = "<Host_Name>"
-    ,port = "<Port_Number>"
-    ,username = "<Username>"
-    ,password = "<Password>"
-    ,look_for_keys = False
-)
-
-
-####################################################################################################
-# Step 5: Establish a SFTP client object
-####################################################################################################
-
-
-# Establish a SFTP client object, which enables the ability to interact with the SFTP
-    # The connection to the SFTP closes automatically after the with block is exited
-        # Therefore, no need for the sftp.close() command
-with ssh_client.open_sftp() as sftp:
-
-
-    ####################################################################################################
-    # Step 6: Extract the data from the file within the SFTP File Path
-    ####################################################################################################
-
-
-    # Create a list of files that are contained within the SFTP file path, specified above
-        # Loop through each of the files, one at a time, within the SFTP file path, specified above
-            # This ensures that the same operations are performed on each file, one at a time
-    for sftp_file in sftp.listdir(sftp_file_path):
-        
-        
-        ####################################################################################################
-        # Step 7: Identify the necessary SFTP file path file(s)
-            # Loop through the necessary SFTP file path file(s)
-        ####################################################################################################
-        
-        
-        # Loop through each of the files that match the specified pattern, one at a time, within the SFTP file path, specified above
-            # This ensures that the same operations are performed on each file, one at a time
-        if fnmatch.fnmatch(sftp_file, sftp_file_name_pattern):
-            
-            # Append the SFTP file name to the loaded_file_list list
-            loaded_file_list.append(sftp_file)
-
-
-            ###################################################################################################
-            # Step 8: Connect to the SFTP file path file
-                # Open the SFTP file path file
-            ####################################################################################################
-
-
-            # Open the SFTP file in order to interact with the file within the SFTP file path, specified above
-                # The file is automatically closed after the with block is exited
-                    # Therefore no need for the remote_file.close() command
-            with sftp.open(file) as sftp_file:
-        
-
-                ####################################################################################################
-                # Step 9: Load the data from the SFTP file path file into a Pandas DataFrame
-                ####################################################################################################
-
-
-                # Prefetches the data within the SFTP file in the background as soon as the file is open
-                # Prefetch helps speed up the process of pulling the data from the SFTP file and loading it to the df Pandas DataFrame
-                sftp_file.prefetch()
-
-                # Load the SFTP file into the a Pandas DataFrame
-                df = pd.read_csv(
-                    sftp_file
-                    ,sep = "|"
-                    # the names variable is used to specify columns names, if they do NOT exist or if you want to rename them from what they currently are
-                    ,names = [
-                        '<Column_1>'
-                        ,'<Column_2>'
-                        ,'<Column_N>'
-                    ]
-                )
-
-                """
-                # Verify if there is any data within the df Pandas DataFrame
-                    # Comment out once the data has been verified
-                if not df.empty:
-
-                    print()
-                    print("The df Pandas DataFrame contains data:")
-                    print()
-                    print(df)
-
-                else:
-
-                    print("The df Pandas DataFrame is empty")
-                """
-
-                # Append each SFTP file path file into the all_data list to consolidate all of the SFTP file path files that are being extracted from the SFTP file path
-                all_data.append(df)
-        
-
-            ####################################################################################################
-            # Step 10: Convert the Pandas DataFrame to the proper format
-            ####################################################################################################
-        
-
-            # Convert the Pandas DataFrame to a CSV string in a new Pandas DataFrame
-                # This enables the ability to write the data within the Pandas DataFrame into a Azure Blob Storage file
-            df_string = df.to_csv(index = False)
-
-            # Display the data within the new Pandas DataFrame
-                # Remove once the data has been verified
-            print(df_string)
-
-
-####################################################################################################
-# Step 11: Consolidate all csv files in the all_date List into 1 Pandas Dataframe
-####################################################################################################
-
-
-# Verify if there is any data within the all_data list
-    # Comment out once the data has been verified
-if len(all_data) != 0:
-
-    # Concat all of the separate S3 csv files into a formal Pandas DataFrame
-    df_concat = pd.concat(all_data)
-
-    # Change the data type of all columns within the df_concat Pandas DataFrame to string
-    df_concat = df_concat.astype(str)
-
-    """
-    # Verify if there is any data within the all_data Pandas DataFrame
-        # Comment out once the data has been verified
-    print()
-    print("The df_concat Pandas DataFrame contains data:")
-    print()
-    print(df_concat)
-    """
-
-
-####################################################################################################
-# Step 12: Load Pandas DataFrame into Target Location
-####################################################################################################
-
-
-# Insert code to load Pandas DataFrame into target location
-
-
-####################################################################################################
-# Step 13: Delete the SFTP file path file
-####################################################################################################
-
-
-# Establish a SFTP client object, which enables the ability to interact with the SFTP
-    # The connection to the SFTP closes automatically after the with block is exited
-        # Therefore, no need for the sftp.close() command
-with ssh_client.open_sftp() as sftp:
-
-    """
-    # Display all of the files within the kkfolosftp SFTP
-        # Comment out once the files have been verified
-    print()
-    print("sftp_file_path files:")
-    print()
-    print(sftp.listdir(sftp_file_path))
-    print()
-    """
-
-    ##############################################################################################################
-    # Delete the file within the SFTP File Path
-    ##############################################################################################################
-
-
-    # Loop through the SFTP file path, once per file within the SFTP file path 
-    for loaded_sftp_file_name in sftp.listdir(sftp_file_path):
-
-        # Verify if the file being deleted matches the list of files that have been loaded into the data warehouse
-            # Only delete loaded files that have been loaded into the data warehouse
-        if loaded_sftp_file_name in loaded_file_list:
-
-            # Delete the SFTP file after it has been loaded into the destination, so that the file does not get loaded again
+"""
+    The "Connect to SFTP - Template" file showcases how to pull data from a SFTP, looping through all files within the SFTP, then loading the data into a Pandas DataFrame
+
+    Data Pipeline Process:
+
+        Step 1: Install Required Python Packages
+
+        Step 2: Install Required Python Libraries
+
+        Step 3: Setup the credentials to connect to the SFTP
+
+        Step 4: Connect to the SFTP
+
+        Step 5: Establish a SFTP client object
+
+            Step 6: Extract the data from the file within the SFTP File Path, one file at a time or multiple files at the same time
+
+                Step 7: Identify the necessary SFTP file path file(s)
+                
+                    Step 8: Connect to the SFTP file path file
+                
+                        Step 9: Load the data from the SFTP file path file into a Pandas DataFrame
+                
+                        Step 10: Convert the Pandas DataFrame to the output format, such as Parquet
+                
+        Step 11: Consolidate all csv files in the all_date List into 1 Pandas Dataframe
+        
+        Step 12: Load Pandas DataFrame into Target Location
+        
+        Step 13: Delete the SFTP file path file
+"""
+
+
+##############################################################################################################
+# Step 1: Install Required Python Packages
+    # Install all of the require Python packages in order to perform the necessary actions within the Python notebook
+        # This section is only used for tools that require you to install all of the necessary packages before each time the code is executed, such as Databricks
+##############################################################################################################
+
+
+# Install the paramiko Python package
+    # Used to connect to SFTP environments	
+%pip install paramiko
+
+# Install the pandas Python package
+    # Used to store data in Series and DataFrames	
+%pip install pandas
+
+# Install the zstandard Python package
+    # Used to decompress and compress files using zstd, such as .csv.zst files
+%pip install zstandard
+
+# Install the pyarrow Python package
+    # Used to write the data into Parquet and Feather files	
+%pip install pyarrow
+
+# Restart the kernel to use updated packages
+    # Databricks specific command that is required to use any newly install Python packages listed above
+%restart_python
+
+
+####################################################################################################
+# Step 2: Install Required Python Libraries
+    # Install all of the require Python libraries in order to perform the necessary actions within the Python notebook
+####################################################################################################
+
+
+# Used when working with and manipulating dates and times
+from datetime import datetime, timedelta
+
+# Enables the ability to connect to the SFTP
+    # pysftp not longer being maintained, therefore should use paramiko instead
+import paramiko
+
+# Enables the ability to run the same function multiple times at the same time, using a pool of threads
+    # Resource: https://docs.python.org/3/library/concurrent.futures.html
+from concurrent.futures import ThreadPoolExecutor
+
+# Enables the ability to run the same function multiple times at the same time, using a pool of processes
+    # Each process uses a separate CPU, whereas a pool of threads can only use 1 CPU at a time
+from concurrent.futures import ProcessPoolExecutor
+
+# Enables the ability to keep the SFTP files in progress in the order they were submitted
+    # Resource: https://docs.python.org/3/library/collections.html#collections.deque
+from collections import deque
+
+# Enables the ability to search for file names based on specified string pattern(s)
+    # Resource: https://docs.python.org/3/library/fnmatch.html
+import fnmatch
+
+# Enables the ability to treat data held in memory as a file
+import io
+
+# Enables the ability to identify the number of CPUs
+import os
+
+# Enables the ability to store a separate value for each thread
+import threading
+
+# Enables the ability to measure how long it takes to convert the Pandas DataFrame to each output format
+import time
+
+# Enables the ability to utilize DataFrames, which are 2 dimension data structures, such as a 2-dimension arrays or a tables with rows and columns
+import pandas as pd
+
+# Enables the ability to combine the distinct values of category columns from multiple Pandas DataFrames
+    # Resource: https://pandas.pydata.org/docs/reference/api/pandas.api.types.union_categoricals.html
+from pandas.api.types import union_categoricals
+
+# Enables the ability to pass the Pandas DataFrame from each process in the Arrow IPC format, rather than pickling every value within the Pandas DataFrame
+import pyarrow as pa
+
+
+####################################################################################################
+# Step 3: Setup the credentials to connect to the SFTP
+    # Open a SSH connection and connect to the SFTP
+        # SSH uses encryption to establish a secure connection between a client and a server, such as a SFTP server
+####################################################################################################
+
+
+# Establish the SSHClient in order to interact with the SFTP SSH server
+ssh_client = paramiko.SSHClient()
+
+# Set the policy for handling unknown host keys to autmoatically add the host keys to the known hosts file
+ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+# Set the SFTP file path that contains the source file(s)
+    # "." is the default file path used if no file path is specified
+        # The "." default file path should be used if the file(s) do NOT have a file path / directory
+            # i.e. the file(s) are not stored in a folder
+sftp_file_path = "<Path_To_SFTP_File(s)>"
+
+# The name of the SFTP file
+file_name = "<File_Name>"
+
+# The extension of the SFTP file
+file_extension = "<File_Extension>"
+
+# The pattern of the SFTP file name, which is a consolidation of the following 2 parts:
+    # file_name - The name of the SFTP file
+    # file_extension - The extension of the SFTP file
+sftp_file_name_pattern = f"*{file_name}*.{file_extension}"
+
+# The columns to keep from the SFTP file(s), and the data type of each column
+    # Only these columns are parsed from the SFTP file(s), rather than parsing every column and removing the unwanted columns afterwards
+        # This is similar to the SELECT clause in SQL
+    # pd.read_csv raises a ValueError if any of these columns do not exist within the SFTP file(s)
+        # This ensures that the data pipeline fails immediately, rather than loading incomplete data into the destination location
+    # Choose the smallest data type that fits the data within each column, rather than loading every column as text
+        # "string[pyarrow]" - Text, stored in the Arrow format, which uses far less memory than Python strings
+        # "category" - Text with few distinct values, such as a status or a state code, which stores each distinct value only once
+        # "Int64", "Float64" and "boolean" - Numbers and True/False values, which allow missing values
+file_columns = {
+    '<Column_1>': 'string[pyarrow]'
+    ,'<Column_2>': 'Float64'
+    ,'<Column_3>': 'category'
+    ,'<Column_N>': 'string[pyarrow]'
+}
+
+# The engine used to load the data within each file into a Pandas DataFrame
+    # "pyarrow" - Parses blocks of the file using multiple threads, which is usually several times faster than "c" for large files
+        # The delimiter must be a single character, and options such as chunksize, nrows, skipfooter, comment and thousands are not supported
+    # "c" - The default engine of pd.read_csv, which parses the file using 1 thread and supports every pd.read_csv option
+        # Use "c" for files that require options the "pyarrow" engine does not support
+    # To compare both engines using files with a similar size, number of columns and delimiter, use the benchmark_read_file function within the data_connectors files connector
+    # The SFTP files below are loaded using the names variable together with usecols, which the "pyarrow" engine does not support, therefore "c" is the default within this template
+        # Only use "pyarrow" once the names variable has been removed from each pd.read_csv below, such as for files that already contain the column names
+parse_engine = "c"
+
+# The compression of the file(s), identified from the file_extension variable, such as "csv.gz" or "csv.zst"
+    # pd.read_csv decompresses the data as it is read, straight from the SFTP file, rather than downloading and decompressing the entire file first
+        # Nothing is written to disk, and only the compressed data is transferred over the network
+    # None for files that are not compressed, such as "csv"
+        # "zstd" requires the zstandard Python package
+file_compression = {"gz": "gzip", "gzip": "gzip", "bz2": "bz2", "zst": "zstd", "zstd": "zstd"}.get(file_extension.rsplit(".", 1)[-1].lower())
+
+# The columns that the target location requires as text, such as numbers with leading zeros or codes that are stored as text within the target location
+    # Only these columns are converted to text within Step 9 and Step 11, rather than converting every column to text
+        # Leave the list empty if the target location accepts the data types within the file_columns dictionary
+    # Each column must be a key within the file_columns dictionary, such as a code column loaded as 'Int64' that the target location stores as text
+        # Columns that must keep their leading zeros, such as '<Zip_Code_Column>', should be loaded as 'string[pyarrow]' within the file_columns dictionary instead, as 'Int64' removes the leading zeros
+text_columns = []
+
+# The list will consolidate all SFTP file names
+    # Consolidating all SFTP files into a list, then converting the entire list into a Pandas DataFrame
+    # prevents multiple Pandas DataFrames from being created in the for loop
+        # This method is more effiecient and less computational than converting each dictionary into a Pandas DataFrame
+        # and appending to one another, then consolidating all Pandas DataFrames into one
+all_data = []
+
+# The set will consolidate the name of each SFTP file that has been loaded into the target location
+    # A set is used rather than a list, as verifying if a file name exists within a set takes the same amount of time no matter how many file names it contains
+        # Verifying if a file name exists within a list requires looping through every file name within the list
+loaded_file_set = set()
+
+# The number of rows that are loaded into a Pandas DataFrame at a time, when streaming the SFTP file in chunks
+    # Only 1 chunk is held in memory at a time, therefore the memory used depends on chunk_size rather than the size of the file
+chunk_size = 100000
+
+# The maximum number of SFTP files that are downloaded at the same time, when extracting multiple SFTP files at the same time
+    # Each SFTP file is downloaded over a separate SFTP channel, all sharing the same SSH connection
+sftp_max_channels = 4
+
+# The number of bytes requested from the SFTP at a time, when extracting multiple SFTP files at the same time
+    # paramiko splits any request larger than 32768 bytes into multiple requests
+    # To compare the download speed for each number of SFTP channels and each block size, use the benchmark_download_files function within the data_connectors sftp connector
+sftp_block_size = 32768
+
+# The maximum number of requests for each SFTP file that are sent to the SFTP before waiting for a response, when extracting multiple SFTP files at the same time
+    # Sending multiple requests before waiting for a response prevents waiting on the SFTP to respond to each request, one at a time
+        # Requires paramiko 3.3 or higher
+sftp_max_requests = 64
+
+# The number of bytes the SFTP can send over each SFTP channel before waiting for the data pipeline to confirm that it has received the data
+    # A larger window allows more data to be sent at the same time, which speeds up downloads when the SFTP is slow to respond, such as when the SFTP is far away
+sftp_window_size = 134217728
+
+# The maximum number of SFTP files that are loaded into Pandas DataFrames at the same time, when loading the SFTP files using a pool of processes
+    # Each SFTP file is loaded by a separate process, which uses a separate CPU
+        # Use the commented out benchmark within Step 6 to find the number of processes where adding processes stops reducing the time taken
+parse_max_workers = os.cpu_count()
+
+# The format that the Pandas DataFrame is converted to within Step 10
+    # "parquet" - Compressed and stored by column, which is the smallest format and the fastest format to load into a data warehouse
+    # "feather" - Compressed and stored in the Arrow format, which is the fastest format to write and to read back into a Pandas DataFrame
+    # "csv" - Text, which is the largest and slowest format, only use when the destination location requires CSV files
+output_format = "parquet"
+
+# The compression used within Parquet and Feather files, or the compression of the entire CSV file
+    # "zstd" provides a good balance between the size of the file and the speed of compressing the file
+        # Parquet files also support "snappy", "gzip", "brotli" and "lz4", while Feather files also support "lz4"
+        # CSV files support "gzip", "bz2" and "zstd", and are not compressed for any other value, such as None
+output_compression = "zstd"
+
+# The maximum number of rows written into each row group of a Parquet file, or each record batch of a Feather file
+output_row_group_size = 100000
+
+
+####################################################################################################
+# Step 4: Connect to the SFTP
+####################################################################################################
+
+
+# Connect to the SFTP SSH server
+ssh_client.connect(
+    hostname = "<Host_Name>"
+    ,port = "<Port_Number>"
+    ,username = "<Username>"
+    ,password = "<Password>"
+    ,look_for_keys = False
+)
+
+# Set the window size for every SFTP channel that is established from this point onwards
+ssh_client.get_transport().default_window_size = sftp_window_size
+
+
+####################################################################################################
+# Step 5: Establish a SFTP client object
+####################################################################################################
+
+
+# Establish a SFTP client object, which enables the ability to interact with the SFTP
+    # The connection to the SFTP closes automatically after the with block is exited
+        # Therefore, no need for the sftp.close() command
+with ssh_client.open_sftp() as sftp:
+
+
+    ####################################################################################################
+    # Step 6: Extract the data from the file within the SFTP File Path
+    ####################################################################################################
+
+
+    # ***** Choose one of the 2 methods below *****
+
+
+    # Method 1: Extract the SFTP files one at a time
+
+    # Create a list of files that are contained within the SFTP file path, specified above
+        # Loop through each of the files, one at a time, within the SFTP file path, specified above
+            # This ensures that the same operations are performed on each file, one at a time
+    for sftp_file in sftp.listdir(sftp_file_path):
+        
+        
+        ####################################################################################################
+        # Step 7: Identify the necessary SFTP file path file(s)
+            # Loop through the necessary SFTP file path file(s)
+        ####################################################################################################
+        
+        
+        # Loop through each of the files that match the specified pattern, one at a time, within the SFTP file path, specified above
+            # This ensures that the same operations are performed on each file, one at a time
+        if fnmatch.fnmatch(sftp_file, sftp_file_name_pattern):
+            
+            # Add the SFTP file name to the loaded_file_set set
+            loaded_file_set.add(sftp_file)
+
+
+            ###################################################################################################
+            # Step 8: Connect to the SFTP file path file
+                # Open the SFTP file path file
+            ####################################################################################################
+
+
+            # Open the SFTP file in order to interact with the file within the SFTP file path, specified above
+                # The file is automatically closed after the with block is exited
+                    # Therefore no need for the remote_file.close() command
+            with sftp.open(f"{sftp_file_path}/{sftp_file}") as remote_file:
+        
+
+                ####################################################################################################
+                # Step 9: Load the data from the SFTP file path file into a Pandas DataFrame
+                ####################################################################################################
+
+
+                # Prefetches the data within the SFTP file in the background as soon as the file is open
+                # Prefetch helps speed up the process of pulling the data from the SFTP file and loading it to the df Pandas DataFrame
+                remote_file.prefetch()
+
+                # ***** Choose one of the 2 methods below *****
+
+
+                # Method 1: Load the entire SFTP file into the df Pandas DataFrame
+
+                # Load the SFTP file into the a Pandas DataFrame
+                df = pd.read_csv(
+                    remote_file
+                    ,sep = "|"
+                    # the names variable is used to specify columns names, if they do NOT exist or if you want to rename them from what they currently are
+                    ,names = [
+                        '<Column_1>'
+                        ,'<Column_2>'
+                        ,'<Column_N>'
+                    ]
+                    # Only parse the columns within the file_columns dictionary, using the data type specified for each column
+                    ,usecols = list(file_columns)
+                    ,dtype = file_columns
+                    # Decompress the file as it is read, using the compression identified within Step 3
+                    ,compression = file_compression
+                    # Load the file using the engine chosen within Step 3
+                    ,engine = parse_engine
+                )
+
+                """
+                # Verify if there is any data within the df Pandas DataFrame
+                    # Comment out once the data has been verified
+                if not df.empty:
+
+                    print()
+                    print("The df Pandas DataFrame contains data:")
+                    print()
+                    print(df)
+
+                else:
+
+                    print("The df Pandas DataFrame is empty")
+                """
+
+                # Append each SFTP file path file into the all_data list to consolidate all of the SFTP file path files that are being extracted from the SFTP file path
+                all_data.append(df)
+
+
+                # Method 2: Stream the SFTP file into Pandas DataFrames, chunk_size rows at a time
+                    # Use this method for files that are too large to fit into memory
+                        # Steps 10 through 12 below are not required, as each chunk is converted and loaded into the target location here
+                            # The chunks are never consolidated into the all_data list, which would require the data from every file to fit into memory
+
+                # Create an iterator that reads chunk_size rows from the SFTP file each time it is looped through
+                    # The data is read from the SFTP file as each chunk is needed, rather than all at once
+                df_chunks = pd.read_csv(
+                    remote_file
+                    ,sep = "|"
+                    # the names variable is used to specify columns names, if they do NOT exist or if you want to rename them from what they currently are
+                    ,names = [
+                        '<Column_1>'
+                        ,'<Column_2>'
+                        ,'<Column_N>'
+                    ]
+                    # Only parse the columns within the file_columns dictionary, using the data type specified for each column
+                    ,usecols = list(file_columns)
+                    ,dtype = file_columns
+                    # Decompress the file as it is read, using the compression identified within Step 3
+                    ,compression = file_compression
+                    # The "pyarrow" engine does not support chunksize, therefore the chunks are always loaded using the default "c" engine
+                    ,chunksize = chunk_size
+                )
+
+                # Loop through each chunk of the SFTP file, one at a time
+                for df_chunk in df_chunks:
+
+                    # Change the data type of the columns within the text_columns list to string
+                        # The data types are changed for each chunk, rather than after all of the chunks have been consolidated
+                            # The remaining columns keep the data types within the file_columns dictionary
+                    df_chunk = df_chunk.astype({text_column: 'string[pyarrow]' for text_column in text_columns})
+
+                    # Insert code to load each chunk of the Pandas DataFrame into target location
+                        # To load the data into Snowflake, use the write_pandas function within Step 8 of the "Connect to Snowflake - Template" file
+
+                    """
+                    # Display the data within the df_chunk Pandas DataFrame for each chunk
+                        # Comment out once the data has been verified
+                    print(df_chunk)
+                    """
+        
+
+            ####################################################################################################
+            # Step 10: Convert the Pandas DataFrame to the output format, such as Parquet
+            ####################################################################################################
+        
+
+            # Convert the Pandas DataFrame to the output format, writing the data into memory as a file
+                # This enables the ability to write the data within the Pandas DataFrame into a file, such as an Azure Blob Storage file
+                    # The data is written straight into the output_data variable 1 row group at a time, rather than building 1 large string of the entire file
+            output_data = io.BytesIO()
+
+            if output_format == "parquet":
+
+                df.to_parquet(output_data, index = False, compression = output_compression, row_group_size = output_row_group_size)
+
+            elif output_format == "feather":
+
+                df.to_feather(output_data, compression = output_compression, chunksize = output_row_group_size)
+
+            else:
+
+                # Compress the CSV file as it is written, if output_compression is "gzip", "bz2" or "zstd"
+                df.to_csv(output_data, index = False, compression = output_compression if output_compression in ("gzip", "bz2", "zstd") else None)
+
+            # Move back to the beginning of the data, so that the entire file is written into the destination location
+            output_data.seek(0)
+
+            # Insert code to write the output_data variable into the destination location, such as an Azure Blob Storage file
+
+            """
+            # Display the size of the data within the output_data variable
+                # Remove once the data has been verified
+            print(f"{sftp_file}: {output_data.getbuffer().nbytes} bytes as {output_format}")
+            """
+
+            """
+            # Compare the size of the data and the time it takes to convert the Pandas DataFrame to each output format
+                # Use this comparison to choose the output_format and output_compression variables for the SFTP file(s)
+                    # Remove once the output format has been chosen
+            for benchmark_format in ("csv", "parquet", "feather"):
+
+                benchmark_data = io.BytesIO()
+
+                benchmark_start_time = time.perf_counter()
+
+                if benchmark_format == "parquet":
+
+                    df.to_parquet(benchmark_data, index = False, compression = output_compression, row_group_size = output_row_group_size)
+
+                elif benchmark_format == "feather":
+
+                    df.to_feather(benchmark_data, compression = output_compression, chunksize = output_row_group_size)
+
+                else:
+
+                    df.to_csv(benchmark_data, index = False, compression = output_compression if output_compression in ("gzip", "bz2", "zstd") else None)
+
+                benchmark_seconds = time.perf_counter() - benchmark_start_time
+
+                print(f"{benchmark_format}: {benchmark_data.getbuffer().nbytes:,} bytes in {benchmark_seconds:.2f} seconds ({len(df) / benchmark_seconds:,.0f} rows/sec)")
+            """
+
+
+    # Method 2: Extract multiple SFTP files at the same time
+        # Use this method when the SFTP is slow to respond, such as when the SFTP is far away, as the files are downloaded at the same time rather than waiting on each file
+            # Steps 7 through 10 above are not required, as each file is downloaded and loaded into a Pandas DataFrame here
+
+    # Create a list of the files that match the specified pattern, within the SFTP file path, specified above
+    sftp_file_list = fnmatch.filter(sftp.listdir(sftp_file_path), sftp_file_name_pattern)
+
+    # The object holds a separate SFTP channel for each thread
+        # SFTP channels cannot be shared by multiple threads at the same time
+    sftp_thread_data = threading.local()
+
+    # The list collects each SFTP channel that is established, so that each SFTP channel can be closed once all of the SFTP files have been downloaded
+    sftp_channel_list = []
+
+
+    # Define the function that downloads the data within 1 SFTP file into memory
+    def download_sftp_file(sftp_file):
+
+        # Establish a SFTP channel for the thread, if the thread does not already have a SFTP channel
+            # Each SFTP channel is opened over the same SSH connection, therefore no additional logins are required
+        if not hasattr(sftp_thread_data, "sftp"):
+
+            sftp_thread_data.sftp = ssh_client.open_sftp()
+
+            sftp_channel_list.append(sftp_thread_data.sftp)
+
+        # Open the SFTP file in order to interact with the file within the SFTP file path, specified above
+            # The file is automatically closed after the with block is exited
+        with sftp_thread_data.sftp.open(f"{sftp_file_path}/{sftp_file}", "rb") as remote_file:
+
+            # The size of the SFTP file in bytes
+            file_size = remote_file.stat().st_size
+
+            # Create a list of every block of the SFTP file, where each block is the position of the block within the SFTP file and the size of the block
+            file_blocks = [
+                (block_start, min(sftp_block_size, file_size - block_start))
+                for block_start in range(0, file_size, sftp_block_size)
+            ]
+
+            # Download every block of the SFTP file
+                # readv sends up to sftp_max_requests requests before waiting for a response, rather than waiting on each block before requesting the next block
+            return b"".join(remote_file.readv(file_blocks, max_concurrent_prefetch_requests = sftp_max_requests))
+
+
+    # Define the function that loads the data within 1 downloaded SFTP file into a Pandas DataFrame
+    def parse_sftp_file(file_data):
+
+        # Load the SFTP file into the a Pandas DataFrame
+        df = pd.read_csv(
+            io.BytesIO(file_data)
+            ,sep = "|"
+            # the names variable is used to specify columns names, if they do NOT exist or if you want to rename them from what they currently are
+            ,names = [
+                '<Column_1>'
+                ,'<Column_2>'
+                ,'<Column_N>'
+            ]
+            # Only parse the columns within the file_columns dictionary, using the data type specified for each column
+            ,usecols = list(file_columns)
+            ,dtype = file_columns
+            # Decompress the file as it is read, using the compression identified within Step 3
+            ,compression = file_compression
+            # Load the file using the engine chosen within Step 3
+            ,engine = parse_engine
+        )
+
+        return df
+
+
+    # Define the function that loads the data within 1 downloaded SFTP file into a Pandas DataFrame, returning the Pandas DataFrame in the Arrow IPC format
+        # Used within a separate process, as the Arrow IPC format is returned to the main process as 1 block of bytes per column, rather than pickling every value within the Pandas DataFrame
+            # The data types of the Pandas DataFrame, such as string[pyarrow] and category, are kept within the Arrow IPC format
+    def parse_sftp_file_to_arrow(file_data):
+
+        arrow_table = pa.Table.from_pandas(parse_sftp_file(file_data), preserve_index = False)
+
+        ipc_stream = pa.BufferOutputStream()
+
+        with pa.ipc.new_stream(ipc_stream, arrow_table.schema) as ipc_writer:
+
+            ipc_writer.write_table(arrow_table)
+
+        return ipc_stream.getvalue()
+
+
+    # Define the function that calls function for each item using executor, which is a pool of threads or processes, keeping up to max_in_progress items in progress at a time
+        # executor.map takes every item straight away, therefore every downloaded SFTP file can build up in memory when the SFTP files are downloaded faster than they are loaded
+            # The next item is only taken from items once the oldest item in progress has been returned
+        # Returns the result for each item 1 at a time, in the same order as items
+    def map_in_order(executor, function, items, max_in_progress):
+
+        item_futures = deque()
+
+        try:
+
+            for item in items:
+
+                if len(item_futures) >= max_in_progress:
+
+                    yield item_futures.popleft().result()
+
+                item_futures.append(executor.submit(function, item))
+
+            while item_futures:
+
+                yield item_futures.popleft().result()
+
+        finally:
+
+            # Cancel the items that have not started, if an item failed
+            for item_future in item_futures:
+
+                item_future.cancel()
+
+
+    # ***** Choose one of the 2 options below *****
+
+
+    # Option 1: Load the SFTP files into Pandas DataFrames using the pool of threads
+        # Use this option when the SFTP is slow to respond, as the threads are waiting on the SFTP rather than using the CPU
+
+    # Establish a pool of threads, which downloads up to sftp_max_channels SFTP files at the same time
+        # The pool of threads closes automatically after the with block is exited, once all of the SFTP files have been downloaded
+    with ThreadPoolExecutor(max_workers = sftp_max_channels) as executor:
+
+        # Loop through each SFTP file and its Pandas DataFrame
+            # executor.map returns the Pandas DataFrames in the same order as the sftp_file_list list, no matter which file finishes downloading first
+        for sftp_file, df in zip(sftp_file_list, executor.map(lambda sftp_file: parse_sftp_file(download_sftp_file(sftp_file)), sftp_file_list)):
+
+            # Append each SFTP file path file into the all_data list to consolidate all of the SFTP file path files that are being extracted from the SFTP file path
+            all_data.append(df)
+
+            # Add the SFTP file name to the loaded_file_set set
+            loaded_file_set.add(sftp_file)
+
+
+    # Option 2: Download the SFTP files using the pool of threads, then load the SFTP files into Pandas DataFrames using a pool of processes
+        # Use this option when the SFTP is fast to respond, such as a SFTP on the same network, as loading the SFTP files then uses 100% of 1 CPU while the remaining CPUs are idle
+        # Each downloaded SFTP file is passed into a process as soon as it has been downloaded, therefore the SFTP files are downloading while the first SFTP files are loaded
+        # The functions are passed into each process by name, which requires the processes to be started using fork, which is the default on Linux, such as Databricks
+
+    # Establish a pool of threads, which downloads up to sftp_max_channels SFTP files at the same time, and a pool of processes, which loads up to parse_max_workers SFTP files at the same time
+        # Both pools close automatically after the with block is exited, once all of the SFTP files have been loaded
+    with ThreadPoolExecutor(max_workers = sftp_max_channels) as executor, ProcessPoolExecutor(max_workers = parse_max_workers) as parse_executor:
+
+        # Download up to 2 SFTP files per channel ahead of the pool of processes, and pass each SFTP file into the pool of processes once it has been downloaded
+            # Up to 2 SFTP files per process are loading at a time, therefore only the SFTP files in progress are held in memory, rather than every SFTP file
+            # map_in_order returns the SFTP files in the same order as the sftp_file_list list, no matter which file finishes downloading first
+        downloaded_files = map_in_order(executor, download_sftp_file, sftp_file_list, 2 * sftp_max_channels)
+
+        # Loop through each SFTP file and its Pandas DataFrame, in the same order as the sftp_file_list list
+        for sftp_file, ipc_data in zip(sftp_file_list, map_in_order(parse_executor, parse_sftp_file_to_arrow, downloaded_files, 2 * parse_max_workers)):
+
+            # Load the Pandas DataFrame returned by the process in the Arrow IPC format
+            df = pa.ipc.open_stream(ipc_data).read_all().to_pandas()
+
+            # Append each SFTP file path file into the all_data list to consolidate all of the SFTP file path files that are being extracted from the SFTP file path
+            all_data.append(df)
+
+            # Add the SFTP file name to the loaded_file_set set
+            loaded_file_set.add(sftp_file)
+
+
+    """
+    # Measure how long loading the SFTP files takes using 1, 2, 4, 8 and 16 processes
+        # Each SFTP file is downloaded once before the benchmark, so that only the time taken to load the SFTP files is measured
+        # Set parse_max_workers to the number of processes where adding processes stops reducing the time taken, as additional processes only use additional memory
+        # Comment out once the number of processes has been chosen
+    benchmark_file_data = [download_sftp_file(sftp_file) for sftp_file in sftp_file_list]
+
+    for benchmark_workers in [1, 2, 4, 8, 16]:
+
+        benchmark_start_time = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers = benchmark_workers) as benchmark_executor:
+
+            benchmark_data = [
+                pa.ipc.open_stream(ipc_data).read_all().to_pandas()
+                for ipc_data in benchmark_executor.map(parse_sftp_file_to_arrow, benchmark_file_data)
+            ]
+
+        benchmark_seconds = time.perf_counter() - benchmark_start_time
+
+        print(f"{benchmark_workers} processes: {sum(len(df) for df in benchmark_data):,} rows in {benchmark_seconds:.2f} seconds ({sum(len(df) for df in benchmark_data) / benchmark_seconds:,.0f} rows/sec)")
+    """
+
+    # Close each SFTP channel that was established by the pool of threads
+    for sftp_channel in sftp_channel_list:
+
+        sftp_channel.close()
+
+
+####################################################################################################
+# Step 11: Consolidate all csv files in the all_date List into 1 Pandas Dataframe
+####################################################################################################
+
+
+# Verify if there is any data within the all_data list
+    # Comment out once the data has been verified
+if len(all_data) != 0:
+
+    # Combine the distinct values of each category column across all of the SFTP files
+        # pd.concat converts a category column into Python strings if the SFTP files contain different distinct values, which uses far more memory
+    for column_name, column_dtype in file_columns.items():
+
+        if column_dtype == 'category':
+
+            column_categories = union_categoricals([df[column_name] for df in all_data]).categories
+
+            for df in all_data:
+
+                df[column_name] = df[column_name].cat.set_categories(column_categories)
+
+    # Concat all of the separate S3 csv files into a formal Pandas DataFrame
+    df_concat = pd.concat(all_data, ignore_index = True)
+
+    # Change the data type of the columns within the text_columns list to string
+        # The remaining columns keep the data types within the file_columns dictionary, rather than converting every column into Python strings
+    df_concat = df_concat.astype({text_column: 'string[pyarrow]' for text_column in text_columns})
+
+    """
+    # Display the memory used by the df_concat Pandas DataFrame, compared to converting every column into Python strings
+        # Comment out once the data types within the file_columns dictionary have been verified
+    print()
+    print(f"Memory used with the file_columns data types: {df_concat.memory_usage(deep = True).sum():,} bytes")
+    print(f"Memory used with every column converted to Python strings: {df_concat.astype(str).memory_usage(deep = True).sum():,} bytes")
+    print()
+    print(df_concat.dtypes)
+    """
+
+    """
+    # Verify if there is any data within the all_data Pandas DataFrame
+        # Comment out once the data has been verified
+    print()
+    print("The df_concat Pandas DataFrame contains data:")
+    print()
+    print(df_concat)
+    """
+
+
+####################################################################################################
+# Step 12: Load Pandas DataFrame into Target Location
+####################################################################################################
+
+
+# Insert code to load Pandas DataFrame into target location
+    # To load the data into Snowflake, use the write_pandas function within Step 8 of the "Connect to Snowflake - Template" file
+
+
+####################################################################################################
+# Step 13: Delete the SFTP file path file
+####################################################################################################
+
+
+# Establish a SFTP client object, which enables the ability to interact with the SFTP
+    # The connection to the SFTP closes automatically after the with block is exited
+        # Therefore, no need for the sftp.close() command
+with ssh_client.open_sftp() as sftp:
+
+    """
+    # Display all of the files within the kkfolosftp SFTP
+        # Comment out once the files have been verified
+    print()
+    print("sftp_file_path files:")
+    print()
+    print(sftp.listdir(sftp_file_path))
+    print()
+    """
+
+    ##############################################################################################################
+    # Delete the file within the SFTP File Path
+    ##############################################################################################################
+
+
+    # Loop through the SFTP file path, once per file within the SFTP file path 
+    for loaded_sftp_file_name in sftp.listdir(sftp_file_path):
+
+        # Verify if the file being deleted matches the set of files that have been loaded into the data warehouse
+            # Only delete loaded files that have been loaded into the data warehouse
+        if loaded_sftp_file_name in loaded_file_set:
+
+            # Delete the SFTP file after it has been loaded into the destination, so that the file does not get loaded again
             sftp.remove(f"{sftp_file_path}/{loaded_sftp_file_name}")
\ No newline at end of file
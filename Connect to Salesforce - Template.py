@@ -1,189 +1,775 @@
-"""
-    Reference Material:
-        - Youtube Video: https://www.youtube.com/watch?v=nPQFUgsk6Oo&t=283s
-        - Website: https://satvasolutions.medium.com/salesforce-intwith-python-a-step-by-step-guide-40f9dca7e29b
-"""
-
-
-"""
-    The "Connect to Salesforce - Template" file showcases how to pull data from Salesforce, then loading the data into a Pandas DataFrame
-
-    Data Pipeline Process:
-
-        Step 1: Install Required Python Packages
-
-        Step 2: Install Required Python Libraries
-
-        Step 3: Setup the credentials to connect to Salesforce
-
-        Step 4: Connect to Salesforce
-
-        Step 5: Query and Extract the data from the Salesforce object
-
-        Step 6: Load the data from the SOQL query into a Pandas DataFrame
-"""
-
-
-##############################################################################################################
-# Step 1: Install Required Python Packages
-    # Install all of the require Python packages in order to perform the necessary actions within the Python notebook
-##############################################################################################################
-
-
-# Install the datetime Python package
-    # Used when working with and manipulating dates and times	
-%pip install datetime
-
-# Install the simple_salesforce Python package
-    # Used to connect to Salesforce environments	
-%pip install simple_salesforce
-
-# Install the pandas Python package
-    # Used to store data in Series and DataFrames	
-%pip install pandas
-
-# Restart the kernel to use updated packages
-    # Databricks specific command that is required to use any newly install Python packages listed above
-%restart_python
-
-
-####################################################################################################
-# Step 2: Install Required Python Libraries
-    # Install all of the require Python libraries in order to perform the necessary actions within the Python notebook
-####################################################################################################
-
-
-# Enables the ability to connect to Salesforce
-    # Documentation for simple_salesforce: https://pypi.org/project/simple-salesforce/
-from simple_salesforce import Salesforce
-
-# Enables the ability to utilize DataFrames, which are 2 dimension data structures, such as a 2-dimension arrays or a tables with rows and columns
-import pandas as pd
-
-
-##############################################################################################################
-# Step 3: Setup the credentials to connect to Salesforce
-##############################################################################################################
-
-
-# The URL that is used to identify the Salesforce environment that you wish to connect to
-sf_instance_url = "<Salesforce_URL>"
-
-# The username of the account that will be used to connect to Salesforce
-    # The username should be tied to a service account, rather than and specific individual
-sf_user = "<Salesforce_Username>"
-
-# The password of the account that will be used to connect to Salesforce
-    # The password should be tied to a service account, rather than and specific individual
-sf_password = "<Salesforce_Password>"
-
-# The security token of the account that will be used to connect to Salesforce
-sf_security_token = "<Salesforce_Security_Token>"
-
-# The consumer key tied to the Salesforce environment that you wish to connect to
-sf_consumer_key = "<Salesforce_Consumer_Key>"
-
-# The consumer secret tied to the Salesforce environment that you wish to connect to
-sf_consumer_secret = "<Salesforce_Consumer_Secret>"
-
-# (Optional) The session ID that is used to authentication the Salesforce connection
-sf_session_id = "<Session_ID>"
-
-
-##############################################################################################################
-# Step 4: Connect to Salesforce
-##############################################################################################################
-
-
-# Connect to Salesforce using the credentials specified above
-sf = Salesforce(
-    instance_url = sf_instance_url
-    ,username = sf_user
-    ,password = sf_password
-    ,security_token = sf_scecurity_token
-    ,consumer_key = sf_consumer_key
-    ,consumer_secret = sf_consumer_secret
-    # Optional
-    ,session_id = sf_session_id
-)
-
-
-##############################################################################################################
-# Collect a list of file names for all files within Salesforce
-    # This will help identify what data is available to extract within the Salesforce Object
-        # Comment out once the field names have been identified
-##############################################################################################################
-
-
-# Create a dictionary to collect Salesforce object metadata
-desc_sf_obj = sf.Account.describe()
-
-# Create a list to collect all of the field names from the desc_sf_obj dictionary
-field_names = [field['name'] for field in desc_sf_obj['fields']]
-
-"""
-# Display all of the field names within the field_names list
-    # Comment out once all of the field names have been identified
-print()
-print("field_names results:")
-print()
-print(field_names)
-"""
-
-
-####################################################################################################
-# Step 5: Query and Extract the data from the Salesforce object
-####################################################################################################
-
-
-# Write the SOQL query that will extract the necessary data from the Salesforce object
-soql_query = """
-    SELECT
-        <Column_1>
-        ,<Column_2>
-        ,<Column_N>
-    
-    FROM <Object_Name>
-"""
-
-# Load the data from the SOQL query into the soql_result variable
-soql_result = sf.query_all(soql_query)
-
-"""
-# Display the data within the soql_result variable
-    # Comment out once the data has been verified
-print()
-print("soql_result results:")
-print()
-print(soql_result)
-"""
-
-
-####################################################################################################
-# Step 6: Load the data from the SOQL query into a Pandas DataFrame
-####################################################################################################
-
-
-# Load the data from the soql_result variable above into a Pandas DataFrame
-df = pd.DataFrame(soql_result.get('records'))
-
-"""
-# Display the data within the df Pandas DataFrame
-    # Comment out once the data has been verified
-print()
-print("df results:")
-print()
-print(df)
-"""
-
-# Drop the attributes column, as we do not wish to load this column into Snowflake
-df = df.drop(columns = ["attributes"])
-
-"""
-# Display the updated data within the Pandas DataFrame with the attributes column removed
-    # Comment out once the data has been verified
-print()
-print("df results with the attributes column removed:")
-print()
-print(df)
-"""
\ No newline at end of file
+"""
+    Reference Material:
+        - Youtube Video: https://www.youtube.com/watch?v=nPQFUgsk6Oo&t=283s
+        - Website: https://satvasolutions.medium.com/salesforce-intwith-python-a-step-by-step-guide-40f9dca7e29b
+"""
+
+
+"""
+    The "Connect to Salesforce - Template" file showcases how to pull data from Salesforce, then loading the data into a Pandas DataFrame
+
+    Data Pipeline Process:
+
+        Step 1: Install Required Python Packages
+
+        Step 2: Install Required Python Libraries
+
+        Step 3: Setup the credentials to connect to Salesforce
+
+        Step 4: Connect to Salesforce
+
+        Step 5: Retrieve the Salesforce object metadata, using the metadata cache
+
+        Step 6: Retrieve the watermark of the last extraction from the Salesforce object
+
+        Step 7: Query and Extract the changed data from the Salesforce object, using either the REST API or the Bulk API 2.0
+
+        Step 8: Load the data from the SOQL query into a Pandas DataFrame
+
+        Step 9: Convert the columns within the Pandas DataFrame to the data types of the Salesforce object fields
+
+        Step 10: Separate the deleted records from the changed records
+
+        Step 11: Save the watermark of the extraction
+"""
+
+
+##############################################################################################################
+# Step 1: Install Required Python Packages
+    # Install all of the require Python packages in order to perform the necessary actions within the Python notebook
+##############################################################################################################
+
+
+# Install the simple_salesforce Python package
+    # Used to connect to Salesforce environments	
+%pip install simple_salesforce
+
+# Install the pandas Python package
+    # Used to store data in Series and DataFrames	
+%pip install pandas
+
+# Restart the kernel to use updated packages
+    # Databricks specific command that is required to use any newly install Python packages listed above
+%restart_python
+
+
+####################################################################################################
+# Step 2: Install Required Python Libraries
+    # Install all of the require Python libraries in order to perform the necessary actions within the Python notebook
+####################################################################################################
+
+
+# Enables the ability to connect to Salesforce
+    # Documentation for simple_salesforce: https://pypi.org/project/simple-salesforce/
+from simple_salesforce import Salesforce
+
+# Used when working with and manipulating dates and times
+from datetime import datetime, timedelta, timezone
+
+# Enables the ability to run the same function multiple times at the same time, using a pool of threads
+    # Resource: https://docs.python.org/3/library/concurrent.futures.html
+from concurrent.futures import ThreadPoolExecutor
+
+# Enables the ability to create the date format used within the If-Modified-Since request header
+    # Resource: https://docs.python.org/3/library/email.utils.html
+from email.utils import formatdate
+
+# Enables the ability to read and write JSON files
+import json
+
+# Enables the ability to interact with the file system, such as verifying if a file exists
+import os
+
+# Enables the ability to treat data held in memory as a file
+import io
+
+# Enables the ability to pause the data pipeline for a specified number of seconds
+import time
+
+# Enables the ability to utilize DataFrames, which are 2 dimension data structures, such as a 2-dimension arrays or a tables with rows and columns
+import pandas as pd
+
+# Enables the ability to create and query a SQLite database, which is stored within a single file
+    # Resource: https://docs.python.org/3/library/sqlite3.html
+import sqlite3
+
+
+##############################################################################################################
+# Step 3: Setup the credentials to connect to Salesforce
+##############################################################################################################
+
+
+# The URL that is used to identify the Salesforce environment that you wish to connect to
+sf_instance_url = "<Salesforce_URL>"
+
+# The username of the account that will be used to connect to Salesforce
+    # The username should be tied to a service account, rather than and specific individual
+sf_user = "<Salesforce_Username>"
+
+# The password of the account that will be used to connect to Salesforce
+    # The password should be tied to a service account, rather than and specific individual
+sf_password = "<Salesforce_Password>"
+
+# The security token of the account that will be used to connect to Salesforce
+sf_security_token = "<Salesforce_Security_Token>"
+
+# The consumer key tied to the Salesforce environment that you wish to connect to
+sf_consumer_key = "<Salesforce_Consumer_Key>"
+
+# The consumer secret tied to the Salesforce environment that you wish to connect to
+sf_consumer_secret = "<Salesforce_Consumer_Secret>"
+
+# (Optional) The session ID that is used to authentication the Salesforce connection
+sf_session_id = "<Session_ID>"
+
+# The maximum number of records returned within each page of results, when using the Bulk API 2.0
+    # Larger pages require fewer requests, but each page must fit into memory
+bulk_max_records = 100000
+
+# The number of seconds to wait between each check of whether the Bulk API 2.0 query job has completed
+bulk_poll_seconds = 5
+
+# The maximum number of pages of results that are loaded into Pandas DataFrames at the same time, when using the Bulk API 2.0
+    # The next page of results is downloaded while the previous pages are being loaded into Pandas DataFrames
+bulk_max_workers = 4
+
+# The Salesforce object that the data will be extracted from
+soql_object = "<Object_Name>"
+
+# The folder that the Salesforce object metadata is cached within, 1 JSON file per Salesforce environment and Salesforce object
+    # The folder must be stored in a location that is kept between each execution of the data pipeline, such as a mounted storage volume
+describe_cache_path = "<Path_To_Cache_Folder>"
+
+# The number of seconds the cached Salesforce object metadata is used for, before verifying with Salesforce whether the metadata has changed
+    # Salesforce only returns the metadata again if it has changed, otherwise the cached metadata continues to be used
+describe_cache_ttl_seconds = 86400
+
+# The data type of the Pandas DataFrame column for each Salesforce field type
+    # Salesforce field types that are not listed are kept as strings
+    # Dates are converted using pd.to_datetime within Step 9, rather than using this dictionary
+salesforce_field_dtypes = {
+    "boolean": "boolean"
+    ,"int": "Int64"
+    ,"double": "Float64"
+    ,"currency": "Float64"
+    ,"percent": "Float64"
+}
+
+# The location of the SQLite database file that contains the watermark of each Salesforce object
+    # The file must be stored in a location that is kept between each execution of the data pipeline, such as a mounted storage volume
+        # The SQLite database file is created automatically the first time the data pipeline is executed
+watermark_path = "<Path_To_Watermark_Folder>/sf_watermark.db"
+
+# The field that identifies when each record within the Salesforce object was last changed
+    # SystemModstamp is preferred over LastModifiedDate, as SystemModstamp is indexed by Salesforce and also changes when Salesforce changes the record
+soql_watermark_field = "SystemModstamp"
+
+# The date time that the extraction starts from, when the Salesforce object has not been extracted before
+soql_start_date = datetime(2000, 1, 1, tzinfo = timezone.utc)
+
+# Identifies if the watermark is ignored, rather than only extracting the records that have changed since the last extraction
+    # Set to True to extract all records changed since the soql_start_date variable, such as when backfilling the Salesforce object
+soql_ignore_watermark = False
+
+# The number of seconds before the current date time that the extraction ends at
+    # Records that are still being saved within Salesforce when the data pipeline starts are extracted the next time, rather than being missed
+soql_watermark_lag_seconds = 300
+
+# The number of days of changed records that are extracted by each query, when splitting the extraction into slices of time
+    # Used within Method 4 of Step 7 for large backfills, such as the first extraction of the Salesforce object
+soql_slice_days = 30
+
+# The maximum number of slices of time that are queried at the same time, when using Method 4 of Step 7
+    # Salesforce limits the number of queries that can run at the same time per user, therefore keep this number small
+soql_max_workers = 4
+
+# Identifies if the deleted records within the Salesforce object are also extracted
+    # Deleted records are kept within the Salesforce recycle bin for 15 days, therefore the data pipeline must be executed at least every 15 days to capture every deleted record
+soql_include_deleted = True
+
+
+##############################################################################################################
+# Step 4: Connect to Salesforce
+##############################################################################################################
+
+
+# Connect to Salesforce using the credentials specified above
+sf = Salesforce(
+    instance_url = sf_instance_url
+    ,username = sf_user
+    ,password = sf_password
+    ,security_token = sf_scecurity_token
+    ,consumer_key = sf_consumer_key
+    ,consumer_secret = sf_consumer_secret
+    # Optional
+    ,session_id = sf_session_id
+)
+
+
+##############################################################################################################
+# Step 5: Retrieve the Salesforce object metadata, using the metadata cache
+    # The metadata identifies what data is available to extract within the Salesforce object, along with the data type of each field
+        # Retrieving the metadata from Salesforce is slow and counts against the Salesforce API limits
+            # Therefore, the metadata is cached and only retrieved from Salesforce when it has changed
+##############################################################################################################
+
+
+# The JSON file that caches the Salesforce object metadata for the Salesforce environment that you are connected to
+describe_cache_file = os.path.join(describe_cache_path, f"{sf.sf_instance}_{soql_object}.json")
+
+# Load the cached Salesforce object metadata, if the Salesforce object metadata has been cached before
+describe_cache = None
+
+if os.path.exists(describe_cache_file):
+
+    with open(describe_cache_file) as describe_cache_json:
+
+        describe_cache = json.load(describe_cache_json)
+
+# Verify with Salesforce whether the Salesforce object metadata has changed, if there is no cached metadata or the cached metadata is older than describe_cache_ttl_seconds
+if describe_cache is None or time.time() - describe_cache["cached_at"] > describe_cache_ttl_seconds:
+
+    # Request the Salesforce object metadata
+        # The If-Modified-Since request header tells Salesforce to only return the metadata if it has changed since the metadata was cached
+    describe_response = sf.session.get(
+        f"{sf.base_url}sobjects/{soql_object}/describe"
+        ,headers = {
+            **sf.headers
+            ,**({"If-Modified-Since": describe_cache["last_modified"]} if describe_cache else {})
+        }
+    )
+
+    # Salesforce returns a 304 status code if the metadata has not changed, therefore the cached metadata is still correct
+    if describe_response.status_code == 304:
+
+        describe_cache["cached_at"] = time.time()
+
+    else:
+
+        describe_response.raise_for_status()
+
+        describe_cache = {
+            "cached_at": time.time()
+            # The date the metadata was last changed, which is used within the If-Modified-Since request header next time
+            ,"last_modified": describe_response.headers.get("Last-Modified", formatdate(usegmt = True))
+            ,"describe": describe_response.json()
+        }
+
+    # Save the Salesforce object metadata into the cache
+    with open(describe_cache_file, "w") as describe_cache_json:
+
+        json.dump(describe_cache, describe_cache_json)
+
+# Create a dictionary to collect Salesforce object metadata
+desc_sf_obj = describe_cache["describe"]
+
+# Create a list to collect all of the field names from the desc_sf_obj dictionary
+field_names = [field['name'] for field in desc_sf_obj['fields']]
+
+# Create a dictionary of the Pandas DataFrame data type for each field, using the Salesforce field type of each field
+soql_dtypes = {
+    field['name']: salesforce_field_dtypes[field['type']]
+    for field in desc_sf_obj['fields']
+    if field['type'] in salesforce_field_dtypes
+}
+
+# Create a list of the date fields and date time fields
+soql_date_fields = [field['name'] for field in desc_sf_obj['fields'] if field['type'] in ("date", "datetime")]
+
+"""
+# Display all of the field names within the field_names list
+    # Comment out once all of the field names have been identified
+print()
+print("field_names results:")
+print()
+print(field_names)
+"""
+
+
+##############################################################################################################
+# Step 6: Retrieve the watermark of the last extraction from the Salesforce object
+    # Only the records that have changed after the watermark are extracted, therefore each extraction only extracts the changed records
+##############################################################################################################
+
+
+# The format of date times within SOQL queries, such as 2024-01-31T00:00:00Z
+soql_datetime_format = "%Y-%m-%dT%H:%M:%SZ"
+
+# Connect to the SQLite database that contains the watermark
+    # The connection is closed at the end of the data pipeline, using the watermark_conn.close() command
+watermark_conn = sqlite3.connect(watermark_path)
+
+# Create the table that contains the watermark, which is the date time that the last extraction ended at per Salesforce environment and Salesforce object, if the table does not already exist
+watermark_conn.execute("""
+    CREATE TABLE IF NOT EXISTS sf_watermark (
+        instance TEXT NOT NULL
+        ,object TEXT NOT NULL
+        ,last_modstamp TEXT NOT NULL
+        ,PRIMARY KEY (instance, object)
+    )
+""")
+
+# Retrieve the watermark for the Salesforce environment and Salesforce object
+watermark_row = watermark_conn.execute(
+    "SELECT last_modstamp FROM sf_watermark WHERE instance = ? AND object = ?"
+    ,(sf.sf_instance, soql_object)
+).fetchone()
+
+# The date time that the extraction starts after
+    # If the Salesforce object has not been extracted before, the extraction starts from the soql_start_date variable
+if watermark_row is None or soql_ignore_watermark:
+
+    soql_extract_start = soql_start_date
+
+else:
+
+    soql_extract_start = datetime.strptime(watermark_row[0], soql_datetime_format).replace(tzinfo = timezone.utc)
+
+# The date time that the extraction ends at, which becomes the watermark for the next extraction
+soql_extract_end = (datetime.now(timezone.utc) - timedelta(seconds = soql_watermark_lag_seconds)).replace(microsecond = 0)
+
+"""
+# Display the watermark
+    # Comment out once the watermark has been verified
+print()
+print(f"Extracting the records changed after {soql_extract_start:{soql_datetime_format}} and up to {soql_extract_end:{soql_datetime_format}}")
+print()
+"""
+
+
+####################################################################################################
+# Step 7: Query and Extract the changed data from the Salesforce object
+####################################################################################################
+
+
+# ***** Choose one of the 2 soql_fields lists below *****
+
+# The fields that will be extracted from the Salesforce object
+    # This is the list of columns within the SELECT clause of the SOQL query below
+        # Each field must be written the same way as the field name returned by Salesforce, such as "Name" rather than "name"
+        # Fields from related Salesforce objects are separated by a decimal ("."), such as "Owner.Name"
+soql_fields = [
+    '<Column_1>'
+    ,'<Column_2>'
+    ,'<Column_N>'
+]
+
+# All of the fields within the Salesforce object, using the Salesforce object metadata
+    # Address and location fields are excluded, as they are a combination of other fields that are already included, such as BillingCity and BillingState
+soql_fields = [field['name'] for field in desc_sf_obj['fields'] if field['type'] not in ("address", "location")]
+
+# Add the Id field and the IsDeleted field to the soql_fields list, if they are not already included
+    # The Id field identifies which records to update or delete within the destination location
+    # The IsDeleted field identifies which records have been deleted, when soql_include_deleted is set to True
+soql_fields += [
+    soql_field
+    for soql_field in ["Id"] + (["IsDeleted"] if soql_include_deleted else [])
+    if soql_field not in soql_fields
+]
+
+# Write the SOQL query that will extract the records changed after the watermark from the Salesforce object
+    # The soql_where variable is kept separate, allowing Method 4 below to query smaller slices of time
+soql_where = f"{soql_watermark_field} > {soql_extract_start:{soql_datetime_format}} AND {soql_watermark_field} <= {soql_extract_end:{soql_datetime_format}}"
+
+soql_query = f"""
+    SELECT
+        {", ".join(soql_fields)}
+    
+    FROM {soql_object}
+
+    WHERE {soql_where}
+"""
+
+# ***** Choose one of the 4 methods below *****
+
+
+# Method 1: Query the Salesforce object using the REST API
+    # The REST API returns 2,000 records at a time, one page after another
+
+# Load the data from the SOQL query into the soql_result variable
+    # include_deleted uses the queryAll endpoint, which also returns the deleted records within the Salesforce recycle bin
+soql_result = sf.query_all(soql_query, include_deleted = soql_include_deleted)
+
+"""
+# Display the data within the soql_result variable
+    # Comment out once the data has been verified
+print()
+print("soql_result results:")
+print()
+print(soql_result)
+"""
+
+
+# Method 2: Query the Salesforce object using the Bulk API 2.0
+    # Use this method for Salesforce objects that contain millions of records
+        # Salesforce splits the query into chunks of records by ID (PK chunking) and runs the chunks itself, then returns the results as CSV files
+            # The Bulk API 2.0 uses the connection established within the sf variable, therefore no additional login is required
+
+# The list will collect the Pandas DataFrame for each page of results, in the same order that the pages are returned
+bulk_data = []
+
+# Create the Bulk API 2.0 query job for the SOQL query
+bulk_job = sf.session.post(
+    f"{sf.base_url}jobs/query"
+    ,headers = sf.headers
+    ,json = {
+        # The queryAll operation also returns the deleted records within the Salesforce recycle bin
+        "operation": "queryAll" if soql_include_deleted else "query"
+        ,"query": soql_query
+    }
+)
+
+# Stop the data pipeline if the query job could not be created, such as when the SOQL query is invalid
+bulk_job.raise_for_status()
+
+# The ID of the query job, which is used to check on the query job and download the results
+bulk_job_id = bulk_job.json()["id"]
+
+# Wait until the query job has completed, checking the state of the query job every bulk_poll_seconds seconds
+while True:
+
+    bulk_job_state = sf.session.get(
+        f"{sf.base_url}jobs/query/{bulk_job_id}"
+        ,headers = sf.headers
+    ).json()["state"]
+
+    if bulk_job_state == "JobComplete":
+
+        break
+
+    # Stop the data pipeline if the query job failed or was aborted
+    if bulk_job_state in ("Failed", "Aborted"):
+
+        raise RuntimeError(f"The Bulk API 2.0 query job {bulk_job_id} did not complete successfully. Job state: {bulk_job_state}")
+
+    time.sleep(bulk_poll_seconds)
+
+# Establish a pool of threads, which loads up to bulk_max_workers pages of results into Pandas DataFrames at the same time
+    # The pool of threads closes automatically after the with block is exited, once all of the pages have been loaded
+with ThreadPoolExecutor(max_workers = bulk_max_workers) as executor:
+
+    # The list will collect each page of results that is being loaded into a Pandas DataFrame
+    bulk_page_list = []
+
+    # The locator identifies the next page of results to download
+        # The first page of results does not require a locator
+    bulk_locator = None
+
+    # Loop through each page of results, until Salesforce returns "null" as the locator for the next page
+    while bulk_locator != "null":
+
+        # Download the next page of results as a CSV file
+        bulk_page = sf.session.get(
+            f"{sf.base_url}jobs/query/{bulk_job_id}/results"
+            ,headers = {**sf.headers, "Accept": "text/csv"}
+            ,params = {
+                "maxRecords": bulk_max_records
+                ,**({"locator": bulk_locator} if bulk_locator else {})
+            }
+        )
+
+        bulk_page.raise_for_status()
+
+        # Load the page of results into a Pandas DataFrame within the pool of threads
+            # This allows the next page of results to be downloaded while the current page is being loaded
+            # A page without any data, such as the results of a SOQL query that matched no records, is skipped, as pd.read_csv raises an EmptyDataError for a page without the column names
+        if bulk_page.content.strip():
+
+            bulk_page_list.append(executor.submit(pd.read_csv, io.BytesIO(bulk_page.content)))
+
+        # The locator for the next page of results
+        bulk_locator = bulk_page.headers["Sforce-Locator"]
+
+    # Collect the Pandas DataFrame for each page of results, in the same order that the pages were downloaded
+    bulk_data = [bulk_page_df.result() for bulk_page_df in bulk_page_list]
+
+
+# Method 3: Query the Salesforce object using the REST API, collecting the values for each column as each record is returned
+    # Use this method for Salesforce objects that are too large to hold every record in memory, when the Bulk API 2.0 is not available
+        # Only 1 page of 2,000 records is held in memory at a time, rather than every record
+        # Each record is a dictionary that includes an attributes dictionary, which is skipped rather than being loaded and dropped afterwards
+            # The Pandas DataFrame is created once from the lists of values, which uses far less memory than creating the Pandas DataFrame from every record
+
+# The dictionary will collect a list of values per field, in the same order as the soql_fields list
+soql_columns = {soql_field: [] for soql_field in soql_fields}
+
+# Create a list containing the parts of each field name and the function that adds a value to the list of values for the field
+    # The parts of each field name are used to find the value of fields from related Salesforce objects, such as "Owner.Name"
+        # Creating this list once prevents splitting each field name for every record
+soql_column_appenders = [
+    (soql_field.split("."), soql_columns[soql_field].append)
+    for soql_field in soql_fields
+]
+
+# Loop through each record returned by the SOQL query, one at a time
+    # query_all_iter only requests the next page of records once the previous page has been looped through
+for soql_record in sf.query_all_iter(soql_query, include_deleted = soql_include_deleted):
+
+    # Loop through each field, adding the value of the field within the record to the list of values for the field
+    for soql_field_parts, append_value in soql_column_appenders:
+
+        soql_value = soql_record
+
+        # Find the value of the field, one part of the field name at a time
+            # If a related Salesforce object does not exist for the record, the value of the field is None
+        for soql_field_part in soql_field_parts:
+
+            soql_value = soql_value.get(soql_field_part) if soql_value is not None else None
+
+        append_value(soql_value)
+
+
+# Method 4: Split the extraction into slices of time, then query the slices of time at the same time using the REST API
+    # Use this method for large backfills, such as the first extraction of the Salesforce object or when soql_ignore_watermark is set to True
+        # Each slice of time is a separate SOQL query, therefore the slices are queried at the same time rather than one page after another
+
+# Create a list of the slices of time between the soql_extract_start and soql_extract_end variables, each containing up to soql_slice_days days
+soql_slices = []
+
+soql_slice_start = soql_extract_start
+
+while soql_slice_start < soql_extract_end:
+
+    soql_slice_end = min(soql_slice_start + timedelta(days = soql_slice_days), soql_extract_end)
+
+    soql_slices.append((soql_slice_start, soql_slice_end))
+
+    soql_slice_start = soql_slice_end
+
+# Define the function that queries 1 slice of time and loads the records into a Pandas DataFrame
+    # The values for each column are collected as each record is returned, the same as Method 3 above
+def extract_soql_slice(soql_slice):
+
+    soql_slice_start, soql_slice_end = soql_slice
+
+    # Write the SOQL query that will extract the records changed within the slice of time
+    soql_slice_query = f"""
+        SELECT
+            {", ".join(soql_fields)}
+        
+        FROM {soql_object}
+
+        WHERE {soql_watermark_field} > {soql_slice_start:{soql_datetime_format}} AND {soql_watermark_field} <= {soql_slice_end:{soql_datetime_format}}
+    """
+
+    # The dictionary will collect a list of values per field, in the same order as the soql_fields list
+    soql_slice_columns = {soql_field: [] for soql_field in soql_fields}
+
+    # Create a list containing the parts of each field name and the function that adds a value to the list of values for the field
+    soql_slice_appenders = [
+        (soql_field.split("."), soql_slice_columns[soql_field].append)
+        for soql_field in soql_fields
+    ]
+
+    # Loop through each record returned by the SOQL query, one at a time
+    for soql_record in sf.query_all_iter(soql_slice_query, include_deleted = soql_include_deleted):
+
+        for soql_field_parts, append_value in soql_slice_appenders:
+
+            soql_value = soql_record
+
+            for soql_field_part in soql_field_parts:
+
+                soql_value = soql_value.get(soql_field_part) if soql_value is not None else None
+
+            append_value(soql_value)
+
+    # Create the Pandas DataFrame from the lists of values, with 1 column per field in the same order as the soql_fields list
+    return pd.DataFrame(soql_slice_columns, columns = soql_fields)
+
+# Establish a pool of threads, which queries up to soql_max_workers slices of time at the same time
+    # executor.map returns the Pandas DataFrame for each slice of time in the same order as the soql_slices list
+with ThreadPoolExecutor(max_workers = soql_max_workers) as executor:
+
+    soql_slice_data = list(executor.map(extract_soql_slice, soql_slices))
+
+"""
+# Display the number of records within each slice of time
+    # Comment out once the data has been verified
+print()
+for (soql_slice_start, soql_slice_end), df_slice in zip(soql_slices, soql_slice_data):
+    print(f"{soql_slice_start:{soql_datetime_format}} to {soql_slice_end:{soql_datetime_format}}: {len(df_slice)} records")
+"""
+
+
+####################################################################################################
+# Step 8: Load the data from the SOQL query into a Pandas DataFrame
+####################################################################################################
+
+
+# ***** Choose one of the 4 methods below *****
+    # The method must match the method chosen within Step 7
+
+
+# Method 1: Load the data from the REST API into a Pandas DataFrame
+
+# Load the data from the soql_result variable above into a Pandas DataFrame
+df = pd.DataFrame(soql_result.get('records'))
+
+"""
+# Display the data within the df Pandas DataFrame
+    # Comment out once the data has been verified
+print()
+print("df results:")
+print()
+print(df)
+"""
+
+# Drop the attributes column, as we do not wish to load this column into Snowflake
+df = df.drop(columns = ["attributes"])
+
+"""
+# Display the updated data within the Pandas DataFrame with the attributes column removed
+    # Comment out once the data has been verified
+print()
+print("df results with the attributes column removed:")
+print()
+print(df)
+"""
+
+
+# Method 2: Load the data from the Bulk API 2.0 into a Pandas DataFrame
+    # The Bulk API 2.0 does not return the attributes column, therefore the attributes column does not need to be removed
+
+# Concat all of the separate pages of results into a formal Pandas DataFrame
+    # If the SOQL query did not match any records, an empty Pandas DataFrame is created with 1 column per field, as pd.concat raises a ValueError for an empty list
+if len(bulk_data) != 0:
+
+    df = pd.concat(bulk_data, ignore_index = True)
+
+else:
+
+    df = pd.DataFrame(columns = soql_fields)
+
+"""
+# Display the data within the df Pandas DataFrame
+    # Comment out once the data has been verified
+print()
+print("df results:")
+print()
+print(df)
+"""
+
+
+# Method 3: Load the lists of values for each field into a Pandas DataFrame
+    # The attributes column was never collected, therefore the attributes column does not need to be removed
+
+# Create the Pandas DataFrame from the lists of values, with 1 column per field in the same order as the soql_fields list
+df = pd.DataFrame(soql_columns, columns = soql_fields)
+
+# Remove the lists of values, as the data is now stored within the df Pandas DataFrame
+del soql_columns, soql_column_appenders
+
+"""
+# Display the data within the df Pandas DataFrame
+    # Comment out once the data has been verified
+print()
+print("df results:")
+print()
+print(df)
+"""
+
+
+# Method 4: Concat the Pandas DataFrame for each slice of time into a formal Pandas DataFrame
+
+# Concat all of the separate slices of time into a formal Pandas DataFrame
+    # If the watermark is already at or after the end of the extraction, there are no slices of time, therefore an empty Pandas DataFrame is created with 1 column per field, as pd.concat raises a ValueError for an empty list
+if len(soql_slice_data) != 0:
+
+    df = pd.concat(soql_slice_data, ignore_index = True)
+
+else:
+
+    df = pd.DataFrame(columns = soql_fields)
+
+"""
+# Display the data within the df Pandas DataFrame
+    # Comment out once the data has been verified
+print()
+print("df results:")
+print()
+print(df)
+"""
+
+
+####################################################################################################
+# Step 9: Convert the columns within the Pandas DataFrame to the data types of the Salesforce object fields
+    # Only the fields within the soql_fields list are converted
+####################################################################################################
+
+
+# Convert the number and boolean columns to the data types within the soql_dtypes dictionary
+df = df.astype({field: dtype for field, dtype in soql_dtypes.items() if field in df.columns})
+
+# Convert the date and date time columns to dates
+    # Salesforce returns all date times in UTC
+for soql_date_field in soql_date_fields:
+
+    if soql_date_field in df.columns:
+
+        df[soql_date_field] = pd.to_datetime(df[soql_date_field], utc = True)
+
+"""
+# Display the data types of each column within the df Pandas DataFrame
+    # Comment out once the data types have been verified
+print()
+print("df data types:")
+print()
+print(df.dtypes)
+"""
+
+
+####################################################################################################
+# Step 10: Separate the deleted records from the changed records
+    # Only required when soql_include_deleted is set to True
+####################################################################################################
+
+
+# Verify if the deleted records were extracted from the Salesforce object
+if soql_include_deleted:
+
+    # Identify the records that have been deleted within Salesforce
+    soql_deleted_rows = df["IsDeleted"].astype(bool)
+
+    # Collect the Id of each deleted record, which identifies the records to delete from the destination location
+    df_deleted = df.loc[soql_deleted_rows, ["Id"]]
+
+    # Keep only the records that have been created or changed within Salesforce
+    df = df.loc[~soql_deleted_rows]
+
+    """
+    # Display the number of deleted records
+        # Comment out once the data has been verified
+    print()
+    print(f"{len(df_deleted)} deleted records")
+    print()
+    """
+
+    # ENTER THE DATA DELETE LOGIC HERE FOR DELETING THE RECORDS WITHIN df_deleted FROM THE DESTINATION LOCATION
+
+# ENTER THE DATA LOAD LOGIC HERE FOR MERGING THE RECORDS WITHIN df INTO THE DESTINATION LOCATION, USING THE Id COLUMN
+    # To load the data into Snowflake, use the write_pandas function within Step 8 of the "Connect to Snowflake - Template" file
+
+
+####################################################################################################
+# Step 11: Save the watermark of the extraction
+    # Only save the watermark once the data has been loaded into the destination location
+        # If the data pipeline fails before this step, the same records will be extracted the next time the data pipeline is executed
+####################################################################################################
+
+
+# Move the watermark to the date time that the extraction ended at
+    # The watermark is never moved backwards, such as when soql_ignore_watermark is set to True
+        # The date times are stored in the soql_datetime_format format, therefore the date times can be compared as strings
+watermark_conn.execute(
+    """
+        INSERT INTO sf_watermark (instance, object, last_modstamp)
+        VALUES (?, ?, ?)
+        ON CONFLICT (instance, object) DO UPDATE SET last_modstamp = MAX(last_modstamp, excluded.last_modstamp)
+    """
+    ,(sf.sf_instance, soql_object, f"{soql_extract_end:{soql_datetime_format}}")
+)
+
+# Save the changes to the watermark, then close the connection to the SQLite database
+watermark_conn.commit()
+watermark_conn.close()
@@ -1,192 +1,616 @@
-"""
-    The "Connect to Snowflake - Template" file showcases how to pull data from Snowflake, then load the data into a Pandas DataFrame
-
-    Data Pipeline Process:
-
-        Step 1: Install Required Python Packages
-
-        Step 2: Install Required Python Libraries
-
-        Step 3: Setup the credentials and connect to Snowflake
-
-            Step 4: Establish a cursor
-
-            Step 5: Assign the proper values for the following Snowflake object
-
-            Step 6: Query the data from the Snowflake data warehouse
-            
-            Step 7: Load the data from the SQL query into a Pandas DataFrame
-"""
-
-
-##############################################################################################################
-# Step 1: Install Required Python Packages
-    # Install all of the require Python packages in order to perform the necessary actions within the Python notebook
-        # This section is only used for tools that require you to install all of the necessary packages before each time the code is executed, such as Databricks
-##############################################################################################################
-
-
-# Install the datetime Python package
-    # Used when working with and manipulating dates and times	
-%pip install datetime
-
-# Install the snowflake-connector-python[pandas] Python package
-    # Used to connect to Snowflake and utilize Pandas DataFrames	
-%pip install snowflake-connector-python[pandas]
-
-# Install the pandas Python package
-    # Used to store data in Series and DataFrames	
-%pip install pandas
-
-# Restart the kernel to use updated packages
-    # Databricks specific command that is required to use any newly install Python packages listed above
-%restart_python
-
-
-####################################################################################################
-# Step 2: Install Required Python Libraries
-    # Install all of the require Python libraries in order to perform the necessary actions within the Python notebook
-####################################################################################################
-
-
-# Used when working with and manipulating dates and times
-from datetime import datetime, timedelta
-
-# Enables the ability to connect to the Snowflake Data Warehouse
-import snowflake.connector
-
-# Enables the ability to write data into Snowflake from Pandas DataFrames
-from snowflake.connector.pandas_tools import write_pandas
-
-# Enables the ability to utilize DataFrames, which are 2 dimension data structures, such as a 2-dimension arrays or a tables with rows and columns
-import pandas as pd
-
-
-####################################################################################################
-# Step 3: Setup the credentials and connect to Snowflake
-    # Setup the credentials to connect to the Snowflake data warehouse
-    # Connect to the Snowflake data warehouse
-####################################################################################################
-
-
-# Connect to the Snowflake Data Warehouse using the credentials specified above
-    # The connection to the Snowflake data warehouse closes automatically after the with block is exited
-        # Therefore, no need for the dw_conn.close() command
-with snowflake.connector.connect(
-    # The username should be tied to a service account, rather than and specific individual
-    user = "<Snowflake_User_Name>"
-    # The password should be tied to a service account, rather than and specific individual
-    ,password = "<Snowflake_User_Password>"
-    # The account consists of 3 parts separated by a decimal (".")
-        # Part 1: Snowflake account identifier
-        # Part 2: Snowflake cloud region
-        # Part 3: Snowflake cloud provider
-    ,account = "<Snowflake_Account_Identifier>.<Snowflake_Cloud_Region>.<Snowflake_Cloud_Provider>"
-    # The Snowflake warehouse that will be used to write the data into Snowflake
-    ,warehouse = "<Snowflake_Warehouse_Name>"
-    # The Snowflake database where the data will be written into
-    ,database = "<Snowflake_Database_Name>"
-    # Enables the use of Multi-Factor Authentication
-        # Remove if not using MFA with Snowflake login
-    ,passcode = "<MFA_Passcode>"
-) as dw_conn:
-
-
-    ####################################################################################################
-    # Step 4: Establish a cursor
-    ####################################################################################################
-
-
-    # Setup a cursor in order to execute SQL queries to retrieve data from the Snowflake data warehouse
-        # The cursor closes automatically after the with block is exited
-            # Therefore, no need for the cursor.close() command
-    with dw_conn.cursor() as cur:
-
-
-        ####################################################################################################
-        # Test the connection to Snowflake
-            # Comment out once the connection has been verified
-        ####################################################################################################
-
-        
-        """
-        # Write and execute the SQL query that will return the current version of the Snowflake data warehouse
-            # Identifying the current version of the Snowflake data warehouse ensures a successful connection to the Snowflake data warehouse
-        cur.execute('''
-            SELECT current_version()
-        ''')
-
-        # Fetch the first row/record from the SQL query above
-        one_row = cur.fetchone()
-        
-        # Display the first row/record from the SQL query above
-        print(one_row[0])
-        """
-        
-        
-        ####################################################################################################
-        # Step 5: Assign the proper values for the following Snowflake object
-            # Role
-            # Warehouse
-            # Database
-        ####################################################################################################
-
-        
-        # Assume the <Role_Name> role
-        cur.execute("""
-            USE ROLE <Role_Name>;
-        """)
-
-        # Assume the <Warehouse_Name> Warehouse
-        cur.execute("""
-            USE WAREHOUSE <Warehouse_Name>;
-        """)
-
-        # Assume the <Database_Name> database
-        cur.execute("""
-            USE DATABASE <Database_Name>;
-        """)
-
-
-        ####################################################################################################
-        # Step 6: Query the data from the Snowflake data warehouse
-        ####################################################################################################
-
-
-        # There are multiple ways to write and execute SQL queries using the cursor
-            # Method 1 is preferred, but not required
-                # Choose which method you prefer and remove the other
-
-
-        # Method 1: Write and execute the SQL query in 1 part
-        
-        # Write and execute the SQL query
-        cur.execute("""
-            <SQL Query>
-        """)
-
-
-        # Method 2: Write and execute the SQL query in 2 parts
-        
-        # Part 1: Write the SQL query
-        sql = """
-            <SQL Query>
-        """
-
-        # Part 2: Execute the SQL query from above
-        cur.execute(sql)
-
-
-        ####################################################################################################
-        # Step 7: Load the data from the SQL query into a Pandas DataFrame
-        ####################################################################################################
-
-
-        # Fetch the result set from the cursor and deliver it as the pandas DataFrame.
-        df = cur.fetch_pandas_all()
-
-        """
-        # Display the data within the Pandas DataFrame
-            # Remove once the data has been verified
-        print(df)
-        """
\ No newline at end of file
+"""
+    The "Connect to Snowflake - Template" file showcases how to pull data from Snowflake, then load the data into a Pandas DataFrame
+
+    Data Pipeline Process:
+
+        Step 1: Install Required Python Packages
+
+        Step 2: Install Required Python Libraries
+
+        Step 3: Setup the credentials and the pool of connections to Snowflake
+
+            Step 4: Check out a connection from the pool and establish a cursor
+
+            Step 5: Verify the role, warehouse, database and schema assigned to the connection
+
+            Step 6: Query the data from the Snowflake data warehouse
+            
+            Step 7: Load the data from the SQL query into a Pandas DataFrame, or stream the data in batches
+
+            Step 8: Write the data from a Pandas DataFrame into a Snowflake table
+
+        Step 9: Run multiple SQL queries at the same time, using either the pool of connections or asynchronous SQL queries
+
+        Step 10: Close all of the connections within the pool
+"""
+
+
+##############################################################################################################
+# Step 1: Install Required Python Packages
+    # Install all of the require Python packages in order to perform the necessary actions within the Python notebook
+        # This section is only used for tools that require you to install all of the necessary packages before each time the code is executed, such as Databricks
+##############################################################################################################
+
+
+# Install the snowflake-connector-python[pandas] Python package
+    # Used to connect to Snowflake and utilize Pandas DataFrames	
+%pip install snowflake-connector-python[pandas]
+
+# Install the pandas Python package
+    # Used to store data in Series and DataFrames	
+%pip install pandas
+
+# Restart the kernel to use updated packages
+    # Databricks specific command that is required to use any newly install Python packages listed above
+%restart_python
+
+
+####################################################################################################
+# Step 2: Install Required Python Libraries
+    # Install all of the require Python libraries in order to perform the necessary actions within the Python notebook
+####################################################################################################
+
+
+# Used when working with and manipulating dates and times
+from datetime import datetime, timedelta
+
+# Enables the ability to connect to the Snowflake Data Warehouse
+import snowflake.connector
+
+# Enables the ability to write data into Snowflake from Pandas DataFrames
+from snowflake.connector.pandas_tools import write_pandas
+
+# Enables the ability to utilize DataFrames, which are 2 dimension data structures, such as a 2-dimension arrays or a tables with rows and columns
+import pandas as pd
+
+# Enables the ability to define the data types of Arrow tables, and to write Arrow tables into Parquet files
+    # pyarrow is installed as part of the snowflake-connector-python[pandas] Python package
+    # Resource: https://arrow.apache.org/docs/python/parquet.html
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Enables the ability to measure how long it takes to write the data into Snowflake, and how long each connection within the pool has been idle
+import time
+
+# Enables the ability to share a pool of connections between multiple threads
+    # Resource: https://docs.python.org/3/library/queue.html
+import queue
+
+# Enables the ability to create functions that are used within a with block
+    # Resource: https://docs.python.org/3/library/contextlib.html
+from contextlib import contextmanager
+
+# Enables the ability to run the same function multiple times at the same time, using a pool of threads
+    # Resource: https://docs.python.org/3/library/concurrent.futures.html
+from concurrent.futures import ThreadPoolExecutor
+
+
+####################################################################################################
+# Step 3: Setup the credentials and the pool of connections to Snowflake
+    # Setup the credentials to connect to the Snowflake data warehouse
+    # Setup the pool of connections to the Snowflake data warehouse
+        # Connecting to Snowflake takes longer than most small SQL queries, therefore each connection is reused by multiple SQL queries
+####################################################################################################
+
+
+# The location of the Parquet file that the data is written into, when streaming the data into a Parquet file within Step 7
+parquet_file_path = "<Path_To_Parquet_Folder>/<File_Name>.parquet"
+
+# Identifies if integer columns with more than 18 digits, such as NUMBER(38,0), are written into the Parquet file within Method 3 of Step 7 as decimal128 rather than int64
+    # Leave as False for columns whose values fit into int64, which includes most INTEGER columns, as decimal128 columns are loaded into Pandas DataFrames as Python Decimal objects
+    # Set to True for columns with values too large for int64, such as large identifiers, which otherwise raise an error when the Parquet file is written
+parquet_wide_integers_as_decimal = False
+
+# The Snowflake table that the data is written into within Step 8
+    # The table is within the database and schema of the connection, and is only created when it does not already exist if auto_create_table is True below
+snowflake_table_name = "<Snowflake_Table_Name>"
+
+# The number of rows within each Parquet file that is uploaded into Snowflake within Step 8
+    # Each Parquet file is uploaded into the stage of the Snowflake table, then all of the Parquet files are loaded using 1 COPY INTO command
+write_chunk_size = 100000
+
+# The number of Parquet files that are uploaded into Snowflake at the same time within Step 8
+write_parallel = 4
+
+# Identifies if all of the existing data within the Snowflake table is replaced, rather than appending the data to the existing data
+write_overwrite = False
+
+# Identifies if the Snowflake table is created within Step 8 when it does not already exist, using the columns and data types of the Pandas DataFrame
+    # Leave as False for tables with defined data types, such as VARCHAR lengths, NUMBER precisions or clustering keys, which should be created beforehand using CREATE TABLE
+        # When False, write_pandas raises an error if the Snowflake table does not exist, rather than creating a table with the data types chosen by Pandas
+auto_create_table = False
+
+# The maximum number of connections to the Snowflake data warehouse within the pool
+    # This is also the maximum number of SQL queries that are run at the same time within Step 9
+snowflake_pool_size = 4
+
+# The number of seconds a connection within the pool can be idle before the connection is verified with Snowflake when checked out
+    # Connections that have been used recently are handed out without verifying, which avoids an extra request to Snowflake per SQL query
+snowflake_health_check_seconds = 300
+
+# The maximum number of asynchronous SQL queries that are running within Snowflake at the same time, when using Method 2 of Step 9
+    # Snowflake queues the SQL queries that exceed the concurrency of the warehouse, therefore keep this number close to the MAX_CONCURRENCY_LEVEL of the warehouse
+snowflake_async_max_queries = 8
+
+# The number of seconds to wait between each check of whether the asynchronous SQL queries have completed, when using Method 2 of Step 9
+snowflake_async_poll_seconds = 1
+
+# The credentials and settings used for each connection to the Snowflake data warehouse
+    # The role, warehouse, database and schema are assigned when connecting, rather than running separate USE commands after connecting
+snowflake_connection_parameters = {
+    # The username should be tied to a service account, rather than and specific individual
+    "user": "<Snowflake_User_Name>"
+    # The password should be tied to a service account, rather than and specific individual
+    ,"password": "<Snowflake_User_Password>"
+    # The account consists of 3 parts separated by a decimal (".")
+        # Part 1: Snowflake account identifier
+        # Part 2: Snowflake cloud region
+        # Part 3: Snowflake cloud provider
+    ,"account": "<Snowflake_Account_Identifier>.<Snowflake_Cloud_Region>.<Snowflake_Cloud_Provider>"
+    # The Snowflake role that will be used to read and write the data within Snowflake
+    ,"role": "<Role_Name>"
+    # The Snowflake warehouse that will be used to write the data into Snowflake
+    ,"warehouse": "<Snowflake_Warehouse_Name>"
+    # The Snowflake database where the data will be written into
+    ,"database": "<Snowflake_Database_Name>"
+    # The Snowflake schema where the data will be written into
+    ,"schema": "<Snowflake_Schema_Name>"
+    # Enables the use of Multi-Factor Authentication
+        # Remove the authenticator, passcode and client_request_mfa_token settings if not using MFA with Snowflake login
+            # The MFA token is cached after the first connection, therefore the remaining connections within the pool do not require a new passcode
+    ,"authenticator": "username_password_mfa"
+    ,"passcode": "<MFA_Passcode>"
+    ,"client_request_mfa_token": True
+    # Keeps each connection logged in while the connection is idle within the pool, rather than the session expiring after 4 hours
+    ,"client_session_keep_alive": True
+    # The number of threads that download the chunks of the result set at the same time
+        # Snowflake returns large result sets as multiple chunks, which are downloaded in the background while the previous chunks are being processed
+            # Increase the number of threads for large result sets, up to a maximum of 10
+    ,"client_prefetch_threads": 4
+}
+
+# Create the pool of connections
+    # Each item within the pool is a connection and the time the connection was last used
+        # The pool starts with empty slots, therefore connections are only created once they are needed
+            # The most recently used connection is handed out first, which keeps the number of idle connections small
+snowflake_pool = queue.LifoQueue(maxsize = snowflake_pool_size)
+
+for _ in range(snowflake_pool_size):
+
+    snowflake_pool.put((None, None))
+
+# Define the function that verifies if a connection within the pool can still be used
+def snowflake_connection_is_healthy(dw_conn, last_used):
+
+    # The slot within the pool does not have a connection yet, or the connection has been closed
+    if dw_conn is None or dw_conn.is_closed():
+
+        return False
+
+    # The connection has been used recently, therefore the connection is still logged in
+    if time.monotonic() - last_used < snowflake_health_check_seconds:
+
+        return True
+
+    # Run a small SQL query to verify the connection is still logged in
+    try:
+
+        with dw_conn.cursor() as health_check_cur:
+
+            health_check_cur.execute("SELECT 1")
+
+        return True
+
+    except snowflake.connector.errors.Error:
+
+        return False
+
+# Define the function that checks out a connection from the pool, then returns the connection to the pool after the with block is exited
+    # If all of the connections are checked out, the function waits until a connection is returned to the pool
+@contextmanager
+def get_snowflake_connection():
+
+    dw_conn, last_used = snowflake_pool.get()
+
+    try:
+
+        # Replace the connection with a new connection, if the connection can no longer be used
+        if not snowflake_connection_is_healthy(dw_conn, last_used):
+
+            if dw_conn is not None:
+
+                dw_conn.close()
+
+            dw_conn = None
+
+            dw_conn = snowflake.connector.connect(**snowflake_connection_parameters)
+
+        yield dw_conn
+
+    finally:
+
+        # Return the connection to the pool, even if the SQL queries within the with block failed
+        snowflake_pool.put((dw_conn, time.monotonic()))
+
+
+####################################################################################################
+# Step 4: Check out a connection from the pool and establish a cursor
+####################################################################################################
+
+
+# Check out a connection to the Snowflake Data Warehouse from the pool
+    # The connection is returned to the pool after the with block is exited, rather than being closed
+        # The connections within the pool are closed within Step 10
+with get_snowflake_connection() as dw_conn:
+
+
+    # Setup a cursor in order to execute SQL queries to retrieve data from the Snowflake data warehouse
+        # The cursor closes automatically after the with block is exited
+            # Therefore, no need for the cursor.close() command
+    with dw_conn.cursor() as cur:
+
+
+        ####################################################################################################
+        # Test the connection to Snowflake
+            # Comment out once the connection has been verified
+        ####################################################################################################
+
+        
+        """
+        # Write and execute the SQL query that will return the current version of the Snowflake data warehouse
+            # Identifying the current version of the Snowflake data warehouse ensures a successful connection to the Snowflake data warehouse
+        cur.execute('''
+            SELECT current_version()
+        ''')
+
+        # Fetch the first row/record from the SQL query above
+        one_row = cur.fetchone()
+        
+        # Display the first row/record from the SQL query above
+        print(one_row[0])
+        """
+        
+        
+        ####################################################################################################
+        # Step 5: Verify the role, warehouse, database and schema assigned to the connection
+            # The role, warehouse, database and schema are assigned when connecting within Step 3, therefore no USE commands are required
+            # Comment out once the role, warehouse, database and schema have been verified
+        ####################################################################################################
+
+
+        """
+        # Write and execute the SQL query that will return the role, warehouse, database and schema assigned to the connection
+        cur.execute('''
+            SELECT current_role(), current_warehouse(), current_database(), current_schema()
+        ''')
+
+        # Display the role, warehouse, database and schema assigned to the connection
+        print(cur.fetchone())
+        """
+
+
+        ####################################################################################################
+        # Step 6: Query the data from the Snowflake data warehouse
+        ####################################################################################################
+
+
+        # There are multiple ways to write and execute SQL queries using the cursor
+            # Method 1 is preferred, but not required
+                # Choose which method you prefer and remove the other
+
+
+        # Method 1: Write and execute the SQL query in 1 part
+        
+        # Write and execute the SQL query
+        cur.execute("""
+            <SQL Query>
+        """)
+
+
+        # Method 2: Write and execute the SQL query in 2 parts
+        
+        # Part 1: Write the SQL query
+        sql = """
+            <SQL Query>
+        """
+
+        # Part 2: Execute the SQL query from above
+        cur.execute(sql)
+
+
+        ####################################################################################################
+        # Step 7: Load the data from the SQL query into a Pandas DataFrame, or stream the data in batches
+        ####################################################################################################
+
+
+        # ***** Choose one of the 3 methods below *****
+
+
+        # Method 1: Load the entire result set into 1 Pandas DataFrame
+            # The entire result set must fit into memory, and no data is available until the last chunk of the result set has been downloaded
+
+        # Fetch the result set from the cursor and deliver it as the pandas DataFrame.
+        df = cur.fetch_pandas_all()
+
+        """
+        # Display the data within the Pandas DataFrame
+            # Remove once the data has been verified
+        print(df)
+        """
+
+
+        # Method 2: Stream the result set into Pandas DataFrames, 1 batch at a time
+            # Use this method for result sets that are too large to fit into memory
+                # Each batch is 1 chunk of the result set, which is available as soon as the chunk has been downloaded
+                    # Only the batches being processed and the chunks being downloaded are held in memory at a time
+
+        # Loop through each batch of the result set, one at a time
+        for df_batch in cur.fetch_pandas_batches():
+
+            # ENTER THE DATA LOAD LOGIC HERE FOR LOADING EACH BATCH INTO THE DESTINATION LOCATION
+
+            """
+            # Display the data within the df_batch Pandas DataFrame for each batch
+                # Comment out once the data has been verified
+            print(df_batch)
+            """
+
+
+        # Method 3: Stream the result set into a Parquet file, 1 Arrow batch at a time
+            # Use this method to write large result sets into a Parquet file without converting the data into Pandas DataFrames
+                # Snowflake returns each chunk of the result set in the Arrow format, therefore each batch is written into the Parquet file as it is
+                    # Only the batches being processed and the chunks being downloaded are held in memory at a time
+
+        # Define the function that widens the numeric data types of the schema of the first Arrow batch
+            # Snowflake returns each batch of a NUMBER column using the smallest data type that fits the values within the batch, such as int8 within 1 batch and int64 within a later batch
+                # The Parquet file uses 1 schema for every batch, therefore each integer column is widened to int64 and each decimal column is widened to the largest precision
+            # Integer columns stay int64, even though INTEGER columns within Snowflake are NUMBER(38,0), as decimal128 columns are loaded into Pandas DataFrames as Python Decimal objects, which use far more memory
+                # A batch with a value that does not fit into int64 raises an error when it is cast, rather than writing an incorrect value
+                    # Set parquet_wide_integers_as_decimal to True within Step 3 to write integer columns with a precision larger than 18 digits within cur.description as decimal128 instead
+        def get_parquet_schema(arrow_schema, cursor_description):
+
+            column_precisions = {column[0]: column[4] for column in cursor_description} if parquet_wide_integers_as_decimal else {}
+
+            parquet_fields = []
+
+            for arrow_field in arrow_schema:
+
+                if pa.types.is_integer(arrow_field.type):
+
+                    column_precision = column_precisions.get(arrow_field.name) or 0
+
+                    arrow_field = arrow_field.with_type(pa.decimal128(column_precision, 0) if column_precision > 18 else pa.int64())
+
+                elif pa.types.is_decimal(arrow_field.type):
+
+                    arrow_field = arrow_field.with_type(pa.decimal128(38, arrow_field.type.scale))
+
+                parquet_fields.append(arrow_field)
+
+            return pa.schema(parquet_fields, metadata = arrow_schema.metadata)
+
+        # The Parquet writer is created once the first batch has been downloaded, as the Parquet writer requires the columns and data types of the result set
+            # No Parquet file is created if the result set is empty
+        parquet_writer = None
+
+        # The number of rows written into the Parquet file
+        parquet_row_count = 0
+
+        try:
+
+            # Loop through each Arrow batch of the result set, one at a time
+            for arrow_batch in cur.fetch_arrow_batches():
+
+                if parquet_writer is None:
+
+                    parquet_writer = pq.ParquetWriter(parquet_file_path, get_parquet_schema(arrow_batch.schema, cur.description))
+
+                # Write the batch into the Parquet file, using the widened data types
+                    # Later batches can use a smaller or larger data type than the first batch, which the Parquet file does not allow
+                    # safe = True raises an error for any value that does not fit into the widened data type, rather than writing an incorrect value
+                parquet_writer.write_table(arrow_batch.cast(parquet_writer.schema, safe = True))
+
+                parquet_row_count += arrow_batch.num_rows
+
+        finally:
+
+            # Close the Parquet writer, which completes the Parquet file
+                # The Parquet writer is also closed if a batch fails to download, which releases the Parquet file
+            if parquet_writer is not None:
+
+                parquet_writer.close()
+
+        """
+        # Display the number of rows written into the Parquet file
+            # Comment out once the data has been verified
+        print()
+        print(f"{parquet_row_count} rows written into {parquet_file_path}")
+        print()
+        """
+
+
+        ####################################################################################################
+        # Step 8: Write the data from a Pandas DataFrame into a Snowflake table
+            # write_pandas splits the Pandas DataFrame into compressed Parquet files of write_chunk_size rows
+                # The Parquet files are uploaded into the stage of the Snowflake table, write_parallel files at a time, using the PUT command
+                    # All of the Parquet files are then loaded into the Snowflake table using 1 COPY INTO command
+                        # This is far faster than inserting the data 1 row at a time using INSERT statements
+            # When using Method 2 within Step 7, write each df_batch Pandas DataFrame within the loop instead, with write_overwrite set to False
+            # Resource: https://docs.snowflake.com/en/developer-guide/python-connector/python-connector-api#write_pandas
+        ####################################################################################################
+
+
+        # The time that the write started, which is used to calculate the number of rows written per second
+        write_start_time = time.perf_counter()
+
+        # Write the data within the df Pandas DataFrame into the Snowflake table
+        write_success, write_chunk_count, write_row_count, write_output = write_pandas(
+            conn = dw_conn
+            ,df = df
+            ,table_name = snowflake_table_name
+            ,chunk_size = write_chunk_size
+            # snappy compresses and decompresses faster than gzip, at the cost of slightly larger Parquet files
+            ,compression = "snappy"
+            ,parallel = write_parallel
+            # Create the Snowflake table using the columns and data types of the Pandas DataFrame, if the table does not already exist and auto_create_table is True within Step 3
+            ,auto_create_table = auto_create_table
+            # Replace all of the existing data within the Snowflake table, rather than appending the data
+            ,overwrite = write_overwrite
+        )
+
+        # The number of seconds it took to write the data into Snowflake
+        write_seconds = time.perf_counter() - write_start_time
+
+        # Stop the data pipeline if the data could not be written into the Snowflake table
+        if not write_success:
+
+            raise RuntimeError(f"The data could not be written into the {snowflake_table_name} Snowflake table: {write_output}")
+
+        """
+        # Display the number of rows written into the Snowflake table, along with the number of rows written per second
+            # Comment out once the data has been verified
+        print()
+        print(f"{write_row_count} rows written into {snowflake_table_name} from {write_chunk_count} Parquet files in {write_seconds:.1f} seconds ({write_row_count / write_seconds:,.0f} rows/sec)")
+        print()
+        """
+
+
+####################################################################################################
+# Step 9: Run multiple SQL queries at the same time, using either the pool of connections or asynchronous SQL queries
+    # Independent SQL queries complete in the time of the slowest SQL query, rather than the total time of every SQL query
+####################################################################################################
+
+
+# The SQL queries that will be run at the same time, using a name to identify each SQL query
+    # Each SQL query must return a result set, such as a SELECT query
+sql_queries = {
+    "<Query_Name_1>": """
+        <SQL Query 1>
+    """
+    ,"<Query_Name_2>": """
+        <SQL Query 2>
+    """
+    ,"<Query_Name_N>": """
+        <SQL Query N>
+    """
+}
+
+# The SQL queries that must complete before each SQL query is run, when using Method 2 below
+    # SQL queries that are not listed do not depend on any other SQL query, therefore they are run straight away
+sql_dependencies = {
+    "<Query_Name_N>": ["<Query_Name_1>", "<Query_Name_2>"]
+}
+
+# The dictionary will collect the Pandas DataFrame for each SQL query, using the name of each SQL query
+sql_data = {}
+
+# ***** Choose one of the 2 methods below *****
+
+
+# Method 1: Run the SQL queries at the same time using a pool of threads, 1 connection from the pool of connections per SQL query
+    # Each SQL query checks out its own connection from the pool, therefore up to snowflake_pool_size SQL queries are run at the same time
+        # The connections are reused by each SQL query, rather than connecting to Snowflake for each SQL query
+            # The sql_dependencies dictionary is not used by this method
+
+# Define the function that runs 1 SQL query using a connection from the pool, then loads the data from the SQL query into a Pandas DataFrame
+def run_snowflake_query(sql):
+
+    with get_snowflake_connection() as dw_conn:
+
+        with dw_conn.cursor() as cur:
+
+            cur.execute(sql)
+
+            return cur.fetch_pandas_all()
+
+# Establish a pool of threads, which runs up to snowflake_pool_size SQL queries at the same time
+    # executor.map returns the Pandas DataFrame for each SQL query in the same order as the sql_queries dictionary
+with ThreadPoolExecutor(max_workers = snowflake_pool_size) as executor:
+
+    sql_data = dict(zip(sql_queries, executor.map(run_snowflake_query, sql_queries.values())))
+
+
+# Method 2: Submit the SQL queries to Snowflake as asynchronous SQL queries, using 1 connection
+    # Snowflake runs the asynchronous SQL queries in the background, therefore no thread is needed per SQL query
+        # Each SQL query is submitted once the SQL queries listed within the sql_dependencies dictionary have completed
+            # The results of each SQL query are loaded into a Pandas DataFrame as soon as the SQL query completes, using the query ID
+    # Resource: https://docs.snowflake.com/en/developer-guide/python-connector/python-connector-example#performing-an-asynchronous-query
+
+with get_snowflake_connection() as dw_conn:
+
+    # The list of SQL queries that have not been submitted yet, in the same order as the sql_queries dictionary
+    sql_waiting_list = list(sql_queries)
+
+    # The dictionary will collect the query ID of each SQL query that is running, using the name of each SQL query
+    sql_running = {}
+
+    # Loop until every SQL query has been submitted and has completed
+    while sql_waiting_list or sql_running:
+
+        # Submit each SQL query whose dependencies have completed, until snowflake_async_max_queries SQL queries are running
+        for sql_name in list(sql_waiting_list):
+
+            if len(sql_running) >= snowflake_async_max_queries:
+
+                break
+
+            if all(sql_dependency in sql_data for sql_dependency in sql_dependencies.get(sql_name, [])):
+
+                with dw_conn.cursor() as cur:
+
+                    cur.execute_async(sql_queries[sql_name])
+
+                    sql_running[sql_name] = cur.sfqid
+
+                sql_waiting_list.remove(sql_name)
+
+        # Stop the data pipeline if no SQL query is running and the remaining SQL queries can never be submitted
+            # This happens when a SQL query depends on a name that is not within the sql_queries dictionary, or when SQL queries depend on each other
+        if not sql_running:
+
+            raise ValueError(f"The dependencies of the following SQL queries can not be met: {sql_waiting_list}")
+
+        # Wait before checking whether the running SQL queries have completed
+        time.sleep(snowflake_async_poll_seconds)
+
+        # Check whether each running SQL query has completed
+        for sql_name, sql_query_id in list(sql_running.items()):
+
+            # Stop the data pipeline if the SQL query failed
+            sql_status = dw_conn.get_query_status_throw_if_error(sql_query_id)
+
+            if dw_conn.is_still_running(sql_status):
+
+                continue
+
+            # Load the results of the completed SQL query into a Pandas DataFrame, using the query ID
+            with dw_conn.cursor() as cur:
+
+                cur.get_results_from_sfqid(sql_query_id)
+
+                sql_data[sql_name] = cur.fetch_pandas_all()
+
+            del sql_running[sql_name]
+
+"""
+# Display the data within the Pandas DataFrame for each SQL query
+    # Remove once the data has been verified
+for sql_name, df_sql in sql_data.items():
+    print(sql_name)
+    print(df_sql)
+"""
+
+
+####################################################################################################
+# Step 10: Close all of the connections within the pool
+    # Only close the connections once all of the SQL queries have completed
+####################################################################################################
+
+
+while not snowflake_pool.empty():
+
+    dw_conn, last_used = snowflake_pool.get()
+
+    if dw_conn is not None:
+
+        dw_conn.close()
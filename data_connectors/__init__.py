@@ -0,0 +1,53 @@
+"""
+    The data_connectors package contains the data pipeline steps from the "Connect to ... - Template" files, so that a data pipeline can import them rather than copying a template into each notebook
+
+    Connectors:
+
+        s3: Extract the file(s) within an AWS S3 Bucket, including the manifest of the file(s) that have already been loaded
+
+        azure_blob: Download, archive and delete the file(s) within Azure Blob Storage
+
+        sftp: Download the file(s) within a SFTP file path, using multiple SFTP channels at the same time
+
+        salesforce: Query Salesforce objects, using the REST API or the Bulk API 2.0, including the metadata cache and the watermark
+
+        snowflake: Query and write data into Snowflake, using a pool of connections
+
+        files: Read the data within the file(s) into Pandas DataFrames, and write Pandas DataFrames into Parquet, Feather or CSV files
+
+        pipeline: Run the source, the download, the transform and the sink of a data pipeline at the same time, connected by bounded queues
+
+    Each connector is only imported the first time it is used, such as data_connectors.s3
+        The Python packages used by each connector, such as boto3 or paramiko, are only imported by the functions that use them
+            Therefore, importing data_connectors or a connector does not import the Python packages of the other connectors
+
+    The Python packages used by each connector are installed once on the cluster, rather than using %pip install within each notebook
+        Run "python -m data_connectors" to measure the time it takes to import each connector
+"""
+
+
+# Enables the ability to import a connector the first time it is used
+import importlib
+
+
+# The connectors within the data_connectors package
+__all__ = [
+    "azure_blob"
+    ,"files"
+    ,"pipeline"
+    ,"s3"
+    ,"salesforce"
+    ,"sftp"
+    ,"snowflake"
+]
+
+
+# Import the connector the first time it is used, such as data_connectors.s3
+    # Python only calls this function when the connector has not been imported yet
+def __getattr__(name):
+
+    if name in __all__:
+
+        return importlib.import_module(f".{name}", __name__)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
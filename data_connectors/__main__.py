@@ -0,0 +1,90 @@
+"""
+    Measure the time it takes to import each connector within the data_connectors package, using python -X importtime
+
+    Usage:
+
+        python -m data_connectors
+
+        python -m data_connectors s3 snowflake
+
+    Each connector is imported within a new Python process, so that the Python packages imported by one connector are not already imported for the next connector
+        The Python packages that each connector imports the first time a function is used, such as boto3, are measured separately
+"""
+
+
+# Enables the ability to run a new Python process
+import subprocess
+
+# Enables the ability to identify the Python executable and the arguments passed into the command
+import sys
+
+from . import __all__ as connector_list
+
+
+# The Python packages that each connector imports the first time a function is used, rather than when the connector is imported
+CONNECTOR_PACKAGES = {
+    "azure_blob": ["azure.storage.blob", "pandas"]
+    ,"files": ["pandas", "pyarrow.parquet"]
+    ,"pipeline": []
+    ,"s3": ["boto3", "pandas"]
+    ,"salesforce": ["simple_salesforce", "pandas"]
+    ,"sftp": ["paramiko", "pandas"]
+    ,"snowflake": ["snowflake.connector", "pyarrow.parquet"]
+}
+
+
+# Define the function that returns the number of microseconds spent importing modules within a new Python process
+    # python -X importtime writes 1 line per imported module, formatted as "import time: <self us> | <cumulative us> | <module name>"
+        # Modules imported by another module are indented, therefore only the modules that are not indented are added together
+    # Returns None if the modules could not be imported, such as when the Python package is not installed
+def measure_imports(module_names):
+
+    import_process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(module_names)}" if module_names else "pass"]
+        ,capture_output = True
+        ,text = True
+    )
+
+    if import_process.returncode != 0:
+
+        return None
+
+    import_us = 0
+
+    for line in import_process.stderr.splitlines():
+
+        line_parts = line.split("|")
+
+        if line.startswith("import time:") and len(line_parts) == 3 and not line_parts[2].startswith("  "):
+
+            # The header line contains "cumulative" rather than a number
+            if line_parts[1].strip().isdigit():
+
+                import_us += int(line_parts[1])
+
+    return import_us
+
+
+def main(connector_names):
+
+    # The modules that Python imports when it starts, which are not part of the time it takes to import each connector
+    startup_us = measure_imports([])
+
+    print(f"{'connector':<12} {'connector import':>18} {'first use imports':>18}")
+
+    for connector_name in connector_names:
+
+        connector_us = measure_imports([f"data_connectors.{connector_name}"])
+
+        package_us = measure_imports(CONNECTOR_PACKAGES[connector_name])
+
+        print(
+            f"{connector_name:<12}"
+            f" {'not installed' if connector_us is None else f'{max(connector_us - startup_us, 0) / 1000:,.1f} ms':>18}"
+            f" {'not installed' if package_us is None else f'{max(package_us - startup_us, 0) / 1000:,.1f} ms':>18}"
+        )
+
+
+if __name__ == "__main__":
+
+    main(sys.argv[1:] or connector_list)
@@ -0,0 +1,114 @@
+"""
+    The azure_blob connector downloads, archives and deletes the file(s) within Azure Blob Storage, using the steps from the "Connect to Azure Blob Storage - Template" file
+
+    Functions:
+
+        connect: Establish a BlobServiceClient, which connects to Azure Blob Storage
+
+        list_files: List the file(s) within the Azure Blob Storage container that match the specified pattern
+
+        download_file: Download the data within 1 Azure Blob Storage file, or return a stream of the file
+
+        extract_file: Load the data within 1 Azure Blob Storage file into a Pandas DataFrame
+
+        archive_file: Write the data into the Azure Blob Storage archive container file, or copy the original file into the archive container, then delete the original file
+"""
+
+
+# Enables the ability to search for file names based on specified string pattern(s)
+import fnmatch
+
+# Enables the ability to treat data held in memory as a file
+import io
+
+# Enables the ability to pause the data pipeline for a specified number of seconds
+import time
+
+# Enables the ability to load the data within each file into a Pandas DataFrame
+from . import files
+
+
+# azure.storage.blob is imported within the connect function, rather than when the connector is imported
+    # The ContainerClients returned by the BlobServiceClient are used by the remaining functions, therefore they do not import azure.storage.blob
+
+
+# Define the function that establishes a BlobServiceClient in order to interact with Azure Blob Storage at the account level
+    # Use get_container_client to establish a ContainerClient for the source container and the archive container
+        # ContainerClients can be shared by multiple threads, therefore the same ContainerClients are used for every file
+def connect(account_name, account_key):
+
+    from azure.storage.blob import BlobServiceClient
+
+    return BlobServiceClient.from_connection_string(
+        f"DefaultEndpointsProtocol=https;AccountName={account_name};AccountKey={account_key};EndpointSuffix=core.windows.net"
+    )
+
+
+# Define the function that lists the file(s) within the Azure Blob Storage container that match the specified pattern
+    # The list of files is retrieved from Azure Blob Storage as it is looped through, 1 page of files at a time
+def list_files(container_client, blob_name_pattern = "*", name_starts_with = None):
+
+    for blob in container_client.list_blob_names(name_starts_with = name_starts_with):
+
+        if fnmatch.fnmatch(blob, blob_name_pattern):
+
+            yield blob
+
+
+# Define the function that downloads the data within 1 Azure Blob Storage file
+    # If stream is True, a stream of the file is returned, which downloads the data as it is read
+        # Use stream = True for files that are too large to fit into memory
+def download_file(container_client, blob, stream = False):
+
+    if stream:
+
+        return container_client.download_blob(blob)
+
+    return io.BytesIO(container_client.download_blob(blob).readall())
+
+
+# Define the function that loads the data within 1 Azure Blob Storage file into a Pandas DataFrame
+    # If chunk_size is specified, the file is streamed and an iterator is returned that loads chunk_size rows each time it is looped through
+    # Compressed files, such as .csv.gz or .csv.zst, are decompressed as the data is read from the StorageStreamDownloader
+def extract_file(container_client, blob, file_columns, sep = ",", names = None, chunk_size = None, engine = "c"):
+
+    return files.read_file(
+        download_file(container_client, blob, stream = chunk_size is not None)
+        ,file_columns
+        ,sep = sep
+        ,names = names
+        ,chunk_size = chunk_size
+        ,engine = engine
+        ,file_name = blob
+    )
+
+
+# Define the function that archives 1 Azure Blob Storage file, then deletes the file from the source container
+    # If archive_data is specified, archive_data is written into the archive container as archive_blob, such as the file returned by files.write_output
+    # If archive_data is not specified, the original file is copied into the archive container by Azure Blob Storage itself
+        # The original file is only deleted once the copy has completed successfully
+def archive_file(container_client, archive_container_client, blob, archive_data = None, archive_blob = None, copy_poll_seconds = 1):
+
+    archive_blob_client = archive_container_client.get_blob_client(archive_blob or blob)
+
+    if archive_data is not None:
+
+        archive_blob_client.upload_blob(archive_data, overwrite = True)
+
+    else:
+
+        copy_status = archive_blob_client.start_copy_from_url(container_client.get_blob_client(blob).url)["copy_status"]
+
+        while copy_status == "pending":
+
+            time.sleep(copy_poll_seconds)
+
+            copy_status = archive_blob_client.get_blob_properties().copy.status
+
+        if copy_status != "success":
+
+            raise RuntimeError(f"The archive copy of {blob} did not complete successfully. Copy status: {copy_status}")
+
+    # Delete the file from the Azure Blob Storage source container
+        # This prevents the same file from being loaded into the destination multiple times, which will create duplicate data
+    container_client.delete_blob(blob)
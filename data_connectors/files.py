@@ -0,0 +1,693 @@
+"""
+    The files connector reads the data within file(s) into Pandas DataFrames, and writes Pandas DataFrames into Parquet, Feather or CSV files
+
+    Used by every other connector, once the data within each file has been downloaded
+
+    Functions:
+
+        get_compression: Identify the compression of a file from the extension of the file name, or from the first bytes of the file
+
+        open_decompressed: Decompress the data within a file as it is read, straight from the file-like object returned by the source
+
+        open_compressed: Compress the data written into a file-like object as it is written
+
+        get_output_extension: Identify the extension of the file written by write_output, such as .parquet or .csv.gz
+
+        get_parse_engine: Identify the engine used to load the data within a file, falling back to the "c" engine for options the "pyarrow" engine does not support
+
+        get_arrow_type: Convert the data type of a column within the file_columns dictionary into the matching Arrow data type
+
+        read_file_chunks: Stream the data within a file into Pandas DataFrames of chunk_size rows, using pyarrow.csv.open_csv
+
+        read_file: Load the data within a file into a Pandas DataFrame, or into Pandas DataFrames chunk_size rows at a time
+
+        benchmark_read_file: Measure how long read_file takes using each engine, for each file size, number of columns and delimiter
+
+        parse_file: Load the data within a file into an Arrow table within a separate process, returning the Arrow table in the Arrow IPC format
+
+        read_arrow_ipc: Load an Arrow table in the Arrow IPC format, returned by parse_file, into a Pandas DataFrame
+
+        map_in_order: Call a function for each item using a pool of threads or processes, keeping a limited number of items in progress at a time
+
+        parse_files: Load the data within multiple files into Pandas DataFrames at the same time, using a pool of processes
+
+        benchmark_parse_files: Measure how long parse_files takes for each number of processes
+
+        concat_data: Consolidate the Pandas DataFrame for each file into 1 Pandas DataFrame, keeping the data types of each column
+
+        open_output_writer: Create the writer for the output format, which writes Arrow tables straight into a file-like object
+
+        write_output: Convert a Pandas DataFrame to the output format, writing the data into memory as a file
+"""
+
+
+# Enables the ability to keep the items in progress in the order they were submitted
+from collections import deque
+
+# Enables the ability to pass the settings of each file into parse_file, within a separate process
+from functools import partial
+
+# Enables the ability to treat data held in memory as a file
+import io
+
+# Enables the ability to identify the extension of each file name
+import os
+
+# Enables the ability to measure how long each engine and each number of processes takes
+import time
+
+
+# pandas and pyarrow are imported within each function, rather than when the connector is imported
+    # This prevents connectors that never read or write files from waiting on pandas and pyarrow to be imported
+    # ProcessPoolExecutor is also imported within the parse_files function, as it imports multiprocessing
+    # gzip, bz2 and zstandard are imported within the functions that decompress and compress files, and only for the compression that is used
+
+
+# The compression used by each file extension
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip"
+    ,".gzip": "gzip"
+    ,".bz2": "bz2"
+    ,".zst": "zstd"
+    ,".zstd": "zstd"
+}
+
+# The first bytes of a file for each compression, which identify the compression of files whose name does not include the compression extension
+COMPRESSION_MAGIC_NUMBERS = {
+    b"\x1f\x8b": "gzip"
+    ,b"BZh": "bz2"
+    ,b"\x28\xb5\x2f\xfd": "zstd"
+}
+
+
+# A file-like object that returns the bytes that were already read from a file, followed by the rest of the file
+    # Used to identify the compression of a file that can only be read once, such as the StreamingBody returned by AWS S3, without downloading the entire file first
+class PrefixedFile(io.RawIOBase):
+
+    def __init__(self, prefix, file_data):
+
+        self.prefix = memoryview(prefix)
+
+        self.file_data = file_data
+
+    def readable(self):
+
+        return True
+
+    def readinto(self, buffer):
+
+        if len(self.prefix) != 0:
+
+            read_size = min(len(buffer), len(self.prefix))
+
+            buffer[:read_size] = self.prefix[:read_size]
+
+            self.prefix = self.prefix[read_size:]
+
+            return read_size
+
+        file_bytes = self.file_data.read(len(buffer))
+
+        buffer[:len(file_bytes)] = file_bytes
+
+        return len(file_bytes)
+
+
+# Define the function that identifies the compression of a file
+    # The extension of file_name is used first, such as .csv.gz or .csv.zst
+        # If the extension does not identify a compression, the first bytes of the file are compared against the first bytes of each compression
+    # Returns the compression, or None if the file is not compressed, along with the file-like object to read the file from
+        # Files that can only be read once, such as the StreamingBody returned by AWS S3, are returned as a new file-like object that starts with the bytes that were already read
+def get_compression(file_data, file_name = None):
+
+    if file_name is not None:
+
+        file_extension = os.path.splitext(file_name)[1].lower()
+
+        if file_extension in COMPRESSION_EXTENSIONS:
+
+            return COMPRESSION_EXTENSIONS[file_extension], file_data
+
+    magic_number_size = max(len(magic_number) for magic_number in COMPRESSION_MAGIC_NUMBERS)
+
+    if getattr(file_data, "seekable", lambda: False)():
+
+        file_position = file_data.tell()
+
+        file_header = file_data.read(magic_number_size)
+
+        file_data.seek(file_position)
+
+    else:
+
+        file_header = file_data.read(magic_number_size)
+
+        file_data = io.BufferedReader(PrefixedFile(file_header, file_data))
+
+    for magic_number, compression in COMPRESSION_MAGIC_NUMBERS.items():
+
+        if file_header.startswith(magic_number):
+
+            return compression, file_data
+
+    return None, file_data
+
+
+# Define the function that decompresses the data within a file as it is read
+    # The file is decompressed straight from the file-like object returned by the source, such as the StreamingBody returned by AWS S3, the StorageStreamDownloader returned by Azure Blob Storage or a SFTP file
+        # Only the blocks being decompressed are held in memory, and nothing is written to disk
+    # compression is "gzip", "bz2", "zstd", None for files that are not compressed, or "infer" to identify the compression using get_compression
+        # "zstd" requires the zstandard Python package
+def open_decompressed(file_data, file_name = None, compression = "infer"):
+
+    if isinstance(file_data, (bytes, bytearray, memoryview)):
+
+        file_data = io.BytesIO(file_data)
+
+    if compression == "infer":
+
+        compression, file_data = get_compression(file_data, file_name)
+
+    if compression is None:
+
+        return file_data
+
+    if compression == "gzip":
+
+        import gzip
+
+        return gzip.GzipFile(fileobj = file_data, mode = "rb")
+
+    if compression == "bz2":
+
+        import bz2
+
+        return bz2.BZ2File(file_data, mode = "rb")
+
+    if compression == "zstd":
+
+        import zstandard
+
+        # Files that contain multiple zstd frames, such as files written in multiple parts, are read as 1 file
+        return zstandard.ZstdDecompressor().stream_reader(file_data, read_across_frames = True)
+
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+# Define the function that compresses the data written into a file-like object as it is written
+    # output_compression is "gzip", "bz2" or "zstd"
+        # "zstd" requires the zstandard Python package
+    # Closing the returned file-like object writes the end of the compressed data, but does not close output_stream
+def open_compressed(output_stream, output_compression):
+
+    if output_compression == "gzip":
+
+        import gzip
+
+        return gzip.GzipFile(fileobj = output_stream, mode = "wb")
+
+    if output_compression == "bz2":
+
+        import bz2
+
+        return bz2.BZ2File(output_stream, mode = "wb")
+
+    if output_compression == "zstd":
+
+        import zstandard
+
+        return zstandard.ZstdCompressor().stream_writer(output_stream, closefd = False)
+
+    raise ValueError(f"Unsupported compression: {output_compression}")
+
+
+# Define the function that identifies the extension of the file written by write_output
+    # Parquet and Feather files compress the data within the file, therefore only CSV files include the compression within the extension, such as .csv.gz
+def get_output_extension(output_format = "parquet", output_compression = "zstd"):
+
+    if output_format == "csv" and output_compression in COMPRESSION_EXTENSIONS.values():
+
+        return f".csv.{next(file_extension for file_extension, compression in COMPRESSION_EXTENSIONS.items() if compression == output_compression)[1:]}"
+
+    return f".{output_format}"
+
+
+# The pd.read_csv options that the "pyarrow" engine does not support
+    # Resource: https://pandas.pydata.org/docs/user_guide/io.html#specifying-the-parser-engine
+PYARROW_UNSUPPORTED_OPTIONS = {
+    "comment"
+    ,"converters"
+    ,"dayfirst"
+    ,"delim_whitespace"
+    ,"dialect"
+    ,"float_precision"
+    ,"iterator"
+    ,"lineterminator"
+    ,"low_memory"
+    ,"memory_map"
+    ,"nrows"
+    ,"quoting"
+    ,"skipfooter"
+    ,"skipinitialspace"
+    ,"thousands"
+}
+
+
+# Define the function that identifies the engine used to load the data within a file
+    # engine is one of the following:
+        # "c" - The default engine of pd.read_csv, which parses the file using 1 thread
+        # "pyarrow" - Parses blocks of the file using multiple threads, which is usually several times faster than the "c" engine for large files
+            # If chunk_size is specified, the file is streamed 1 block at a time using pyarrow.csv.open_csv, rather than loading the entire file
+    # Falls back to the "c" engine when the "pyarrow" engine does not support the options, rather than pd.read_csv raising a ValueError:
+        # sep must be a single character, as the "pyarrow" engine does not support regular expressions
+        # names is not supported together with usecols, which read_file always passes, when loading the entire file
+            # pyarrow compares usecols against the column names within the file rather than names, therefore pd.read_csv raises an ArrowKeyError
+            # Streaming the file using chunk_size passes names into pyarrow.csv.open_csv, which supports names, therefore the streamed file keeps the "pyarrow" engine
+        # Streaming the file using chunk_size does not support any of the additional pd.read_csv options
+def get_parse_engine(engine = "c", sep = ",", names = None, chunk_size = None, **read_csv_options):
+
+    if engine != "pyarrow":
+
+        return engine
+
+    if sep is None or len(sep) != 1:
+
+        return "c"
+
+    if PYARROW_UNSUPPORTED_OPTIONS.intersection(read_csv_options):
+
+        return "c"
+
+    if names is not None and chunk_size is None:
+
+        return "c"
+
+    if chunk_size is not None and read_csv_options:
+
+        return "c"
+
+    return "pyarrow"
+
+
+# Define the function that converts the data type of a column within the file_columns dictionary into the matching Arrow data type
+    # Returns None for data types that do not have a matching Arrow data type, such as datetime columns, which lets pyarrow identify the data type
+def get_arrow_type(column_dtype):
+
+    import pandas as pd
+    import pyarrow as pa
+
+    pandas_dtype = pd.api.types.pandas_dtype(column_dtype)
+
+    if isinstance(pandas_dtype, pd.CategoricalDtype):
+
+        return pa.dictionary(pa.int32(), pa.string())
+
+    if isinstance(pandas_dtype, pd.ArrowDtype):
+
+        return pandas_dtype.pyarrow_dtype
+
+    if isinstance(pandas_dtype, pd.StringDtype) or pandas_dtype == object:
+
+        return pa.string()
+
+    try:
+
+        # Nullable data types, such as Float64 and Int64, store their values using a NumPy data type
+        return pa.from_numpy_dtype(getattr(pandas_dtype, "numpy_dtype", pandas_dtype))
+
+    except (TypeError, NotImplementedError, pa.ArrowException):
+
+        return None
+
+
+# Define the function that streams the data within a file into Pandas DataFrames of chunk_size rows, using pyarrow.csv.open_csv
+    # pyarrow parses each block of the file using multiple threads while the previous block is being converted into a Pandas DataFrame
+        # The blocks are combined and split into chunk_size rows without copying the data
+    # Each column is parsed straight into the Arrow data type of the column within the file_columns dictionary
+def read_file_chunks(file_data, file_columns, sep = ",", names = None, chunk_size = 100000):
+
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    arrow_types = {column_name: get_arrow_type(column_dtype) for column_name, column_dtype in file_columns.items()}
+
+    # Convert each Arrow data type into the data type within the file_columns dictionary, such as string[pyarrow] or Float64
+        # Arrow data types that are not listed are converted using the default data type, such as category for dictionary columns
+    pandas_types = {}
+
+    for column_name, column_dtype in file_columns.items():
+
+        pandas_dtype = pd.api.types.pandas_dtype(column_dtype)
+
+        if arrow_types[column_name] is not None and isinstance(pandas_dtype, pd.api.extensions.ExtensionDtype) and not isinstance(pandas_dtype, pd.CategoricalDtype):
+
+            pandas_types.setdefault(arrow_types[column_name], pandas_dtype)
+
+    arrow_reader = pa_csv.open_csv(
+        file_data
+        ,read_options = pa_csv.ReadOptions(column_names = names, use_threads = True)
+        ,parse_options = pa_csv.ParseOptions(delimiter = sep)
+        ,convert_options = pa_csv.ConvertOptions(
+            # Only parse the columns within the file_columns dictionary, in the same order as the file_columns dictionary
+            include_columns = list(file_columns)
+            ,column_types = {column_name: arrow_type for column_name, arrow_type in arrow_types.items() if arrow_type is not None}
+        )
+    )
+
+    def convert_chunk(arrow_table):
+
+        return arrow_table.to_pandas(types_mapper = pandas_types.get).astype(file_columns, copy = False)
+
+    pending_batches = []
+
+    pending_rows = 0
+
+    for arrow_batch in arrow_reader:
+
+        pending_batches.append(arrow_batch)
+
+        pending_rows += arrow_batch.num_rows
+
+        while pending_rows >= chunk_size:
+
+            arrow_table = pa.Table.from_batches(pending_batches, schema = arrow_reader.schema)
+
+            yield convert_chunk(arrow_table.slice(0, chunk_size))
+
+            pending_batches = arrow_table.slice(chunk_size).to_batches()
+
+            pending_rows -= chunk_size
+
+    if pending_rows > 0:
+
+        yield convert_chunk(pa.Table.from_batches(pending_batches, schema = arrow_reader.schema))
+
+
+# Define the function that loads the data within a file into a Pandas DataFrame
+    # file_columns is a dictionary of the columns to keep from the file, and the data type of each column
+        # Only these columns are parsed from the file, rather than parsing every column and removing the unwanted columns afterwards
+            # pd.read_csv raises a ValueError if any of these columns do not exist within the file
+    # names is used to specify columns names, if they do NOT exist or if you want to rename them from what they currently are
+    # If chunk_size is specified, an iterator is returned that loads chunk_size rows into a Pandas DataFrame each time it is looped through
+    # engine is either "c" or "pyarrow", which falls back to "c" for the options that the "pyarrow" engine does not support, as identified by get_parse_engine
+        # Columns that are not given a data type within file_columns are loaded as Arrow data types when using the "pyarrow" engine
+    # Compressed files are decompressed as they are read, using open_decompressed
+        # file_name is used to identify the compression from the extension of the file name, otherwise the compression is identified from the first bytes of the file
+    # read_csv_options are any additional pd.read_csv options, such as skiprows or na_values
+def read_file(file_data, file_columns, sep = ",", names = None, chunk_size = None, engine = "c", file_name = None, compression = "infer", **read_csv_options):
+
+    import pandas as pd
+
+    file_data = open_decompressed(file_data, file_name, compression)
+
+    engine = get_parse_engine(engine, sep, names, chunk_size, **read_csv_options)
+
+    if engine == "pyarrow" and chunk_size is not None:
+
+        return read_file_chunks(file_data, file_columns, sep = sep, names = names, chunk_size = chunk_size)
+
+    if engine == "pyarrow":
+
+        read_csv_options["dtype_backend"] = "pyarrow"
+
+    df = pd.read_csv(
+        file_data
+        ,sep = sep
+        ,names = names
+        # Only parse the columns within the file_columns dictionary, using the data type specified for each column
+        ,usecols = list(file_columns)
+        ,dtype = file_columns
+        ,chunksize = chunk_size
+        ,engine = engine
+        ,**read_csv_options
+    )
+
+    # Arrange the columns within the Pandas DataFrame in the same order as the file_columns dictionary
+    if chunk_size is None:
+
+        return df[list(file_columns)]
+
+    return (df_chunk[list(file_columns)] for df_chunk in df)
+
+
+# Define the function that measures how long read_file takes using each engine, for each file size, number of columns and delimiter
+    # Each file is generated in memory, where half of the columns are text and half of the columns are numbers
+    # Returns a list of the number of seconds taken by each engine, for each combination of the number of rows, the number of columns and the delimiter
+        # Compare the engines using files that are similar to the files being loaded, as the fastest engine depends on the size and shape of the file
+def benchmark_read_file(row_counts = (100000, 1000000), column_counts = (5, 20, 50), separators = (",", "|", "\t"), engines = ("c", "pyarrow"), chunk_size = None):
+
+    import numpy as np
+    import pandas as pd
+
+    random_generator = np.random.default_rng(0)
+
+    benchmark_results = []
+
+    print(f"{'rows':>10} {'columns':>8} {'sep':>5} {'MB':>8}" + "".join(f" {engine:>10}" for engine in engines))
+
+    for row_count in row_counts:
+
+        for column_count in column_counts:
+
+            df_benchmark = pd.DataFrame({
+                f"column_{column_number}": (
+                    random_generator.choice([f"value_{value_number}" for value_number in range(1000)], row_count)
+                    if column_number % 2 == 0
+                    else random_generator.random(row_count) * 1000
+                )
+                for column_number in range(column_count)
+            })
+
+            file_columns = {
+                column_name: "string[pyarrow]" if column_number % 2 == 0 else "Float64"
+                for column_number, column_name in enumerate(df_benchmark.columns)
+            }
+
+            for sep in separators:
+
+                file_bytes = df_benchmark.to_csv(sep = sep, index = False).encode()
+
+                benchmark_seconds = {}
+
+                for engine in engines:
+
+                    benchmark_start_time = time.perf_counter()
+
+                    df = read_file(io.BytesIO(file_bytes), file_columns, sep = sep, chunk_size = chunk_size, engine = engine)
+
+                    # Load every chunk, when chunk_size is specified
+                    if chunk_size is not None:
+
+                        for df_chunk in df:
+
+                            pass
+
+                    benchmark_seconds[engine] = time.perf_counter() - benchmark_start_time
+
+                benchmark_results.append({
+                    "rows": row_count
+                    ,"columns": column_count
+                    ,"sep": sep
+                    ,"bytes": len(file_bytes)
+                    ,"seconds": benchmark_seconds
+                })
+
+                print(
+                    f"{row_count:>10,} {column_count:>8} {sep!r:>5} {len(file_bytes) / 1048576:>8,.1f}"
+                    + "".join(f" {benchmark_seconds[engine]:>9.2f}s" for engine in engines)
+                )
+
+    return benchmark_results
+
+
+# Define the function that loads the data within a file into an Arrow table, returning the Arrow table in the Arrow IPC format
+    # Used within a separate process, so that multiple files are loaded at the same time using all of the CPUs, rather than 1 CPU at a time
+        # file_data is the data within the file, as bytes or a file-like object held in memory, such as the files returned by s3.download_file or sftp.download_file
+    # The Arrow IPC format is returned to the main process as 1 block of bytes per column, rather than pickling every value within the Pandas DataFrame
+        # The data types of the Pandas DataFrame, such as string[pyarrow] and category, are kept within the Arrow IPC format
+def parse_file(file_data, file_columns, sep = ",", names = None, engine = "c", file_name = None):
+
+    import pyarrow as pa
+
+    arrow_table = pa.Table.from_pandas(read_file(file_data, file_columns, sep = sep, names = names, engine = engine, file_name = file_name), preserve_index = False)
+
+    ipc_stream = pa.BufferOutputStream()
+
+    with pa.ipc.new_stream(ipc_stream, arrow_table.schema) as ipc_writer:
+
+        ipc_writer.write_table(arrow_table)
+
+    return ipc_stream.getvalue()
+
+
+# Define the function that loads an Arrow table in the Arrow IPC format, returned by parse_file, into a Pandas DataFrame
+def read_arrow_ipc(ipc_data):
+
+    import pyarrow as pa
+
+    return pa.ipc.open_stream(ipc_data).read_all().to_pandas()
+
+
+# Define the function that calls function for each item using executor, which is a pool of threads or processes, keeping up to max_in_progress items in progress at a time
+    # executor.map and executor.submit within a list take every item straight away, therefore every downloaded file or parsed file can build up in memory when the items are returned faster than they are used
+        # The next item is only taken from items once the oldest item in progress has been returned
+    # Returns the result for each item 1 at a time, in the same order as items
+def map_in_order(executor, function, items, max_in_progress):
+
+    item_futures = deque()
+
+    try:
+
+        for item in items:
+
+            if len(item_futures) >= max_in_progress:
+
+                yield item_futures.popleft().result()
+
+            item_futures.append(executor.submit(function, item))
+
+        while item_futures:
+
+            yield item_futures.popleft().result()
+
+    finally:
+
+        # Cancel the items that have not started, if the results are no longer used or an item failed
+        for item_future in item_futures:
+
+            item_future.cancel()
+
+
+# Define the function that loads the data within multiple files into Pandas DataFrames at the same time, using a pool of processes
+    # all_file_data is the data within each file, such as the files returned by s3.download_file or sftp.download_file
+        # Each file is passed into a process as soon as it is returned by all_file_data, therefore the files can still be downloading while the first files are loaded
+            # Up to 2 files per process are in progress at a time, therefore the next file is only taken from all_file_data once a process is ready for it
+    # The Pandas DataFrames are returned in the same order as all_file_data, no matter which file finishes loading first
+    # Each process uses 1 CPU, therefore max_workers defaults to the number of CPUs
+def parse_files(all_file_data, file_columns, sep = ",", names = None, max_workers = None, engine = "c"):
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    max_workers = max_workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers = max_workers) as executor:
+
+        return [
+            read_arrow_ipc(ipc_data)
+            for ipc_data in map_in_order(executor, partial(parse_file, file_columns = file_columns, sep = sep, names = names, engine = engine), all_file_data, 2 * max_workers)
+        ]
+
+
+# Define the function that measures how long parse_files takes for each number of processes
+    # all_file_data must be a list, such as the bytes within each downloaded file, as it is loaded once per number of processes
+    # Returns a dictionary of the number of seconds taken, using the number of processes
+        # The CPU is the bottleneck while the number of seconds keeps dropping as processes are added
+            # Use the number of processes where the number of seconds stops dropping, as additional processes only use additional memory
+def benchmark_parse_files(all_file_data, file_columns, sep = ",", names = None, worker_counts = (1, 2, 4, 8, 16), engine = "c"):
+
+    parse_seconds = {}
+
+    for max_workers in worker_counts:
+
+        parse_start_time = time.perf_counter()
+
+        parse_files(all_file_data, file_columns, sep = sep, names = names, max_workers = max_workers, engine = engine)
+
+        parse_seconds[max_workers] = time.perf_counter() - parse_start_time
+
+        print(f"{max_workers:>3} processes: {parse_seconds[max_workers]:,.2f} seconds, {parse_seconds[worker_counts[0]] / parse_seconds[max_workers]:,.2f}x")
+
+    return parse_seconds
+
+
+# Define the function that consolidates the Pandas DataFrame for each file into 1 Pandas DataFrame
+    # The columns within text_columns are converted to text, while the remaining columns keep the data types within the file_columns dictionary
+def concat_data(all_data, file_columns, text_columns = ()):
+
+    import pandas as pd
+    from pandas.api.types import union_categoricals
+
+    # Combine the distinct values of each category column across all of the Pandas DataFrames
+        # pd.concat converts a category column into Python strings if the Pandas DataFrames contain different distinct values, which uses far more memory
+    for column_name, column_dtype in file_columns.items():
+
+        if column_dtype == "category":
+
+            column_categories = union_categoricals([df[column_name] for df in all_data]).categories
+
+            for df in all_data:
+
+                df[column_name] = df[column_name].cat.set_categories(column_categories)
+
+    # Concat all of the separate Pandas DataFrames into a formal Pandas DataFrame
+    df_concat = pd.concat(all_data, ignore_index = True)
+
+    # Change the data type of the columns within text_columns to string
+    return df_concat.astype({text_column: "string[pyarrow]" for text_column in text_columns})
+
+
+# Define the function that creates the writer for the output format, which writes Arrow tables straight into a file-like object
+    # output_format is one of the following:
+        # "parquet" - Compressed and stored by column, which is the smallest format and the fastest format to load into a data warehouse
+        # "feather" - Compressed and stored in the Arrow format, which is the fastest format to write and to read back into a Pandas DataFrame
+        # "csv" - Uncompressed text, which is the largest and slowest format, only use when the destination location requires CSV files
+            # To compress the CSV file, pass the file-like object returned by open_compressed as output_stream
+    # The data is written into the file-like object 1 row group at a time, rather than building 1 large string of the entire file
+def open_output_writer(output_stream, arrow_schema, output_format = "parquet", output_compression = "zstd"):
+
+    import pyarrow as pa
+
+    if output_format == "parquet":
+
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(output_stream, arrow_schema, compression = output_compression)
+
+    if output_format == "feather":
+
+        return pa.ipc.new_file(output_stream, arrow_schema, options = pa.ipc.IpcWriteOptions(compression = output_compression))
+
+    if output_format == "csv":
+
+        import pyarrow.csv as pa_csv
+
+        return pa_csv.CSVWriter(output_stream, arrow_schema)
+
+    raise ValueError(f"Unsupported output format: {output_format}")
+
+
+# Define the function that converts a Pandas DataFrame to the output format, writing the data into memory as a file
+    # The returned file-like object is positioned at the beginning of the data, so that the entire file can be uploaded into the destination location
+    # CSV files are compressed as they are written when output_compression is "gzip", "bz2" or "zstd"
+        # Use get_output_extension to name the file within the destination location, such as .csv.gz
+def write_output(df, output_format = "parquet", output_compression = "zstd", row_group_size = 100000):
+
+    import pyarrow as pa
+
+    output_data = io.BytesIO()
+
+    arrow_table = pa.Table.from_pandas(df, preserve_index = False)
+
+    if output_format == "csv" and output_compression in COMPRESSION_EXTENSIONS.values():
+
+        output_stream = open_compressed(output_data, output_compression)
+
+    else:
+
+        output_stream = output_data
+
+    with open_output_writer(output_stream, arrow_table.schema, output_format, output_compression) as output_writer:
+
+        for arrow_batch in arrow_table.to_batches(max_chunksize = row_group_size):
+
+            output_writer.write_batch(arrow_batch)
+
+    # Write the end of the compressed data into output_data, without closing output_data
+    if output_stream is not output_data:
+
+        output_stream.close()
+
+    output_data.seek(0)
+
+    return output_data
@@ -0,0 +1,436 @@
+"""
+    The pipeline connector runs the steps of a data pipeline at the same time, connecting each step to the next step with a bounded queue
+
+    The data pipeline consists of:
+
+        Source: Any iterable that returns 1 item at a time, such as s3.list_files, azure_blob.list_files or sftp.list_files
+
+        Stages: The steps that each item passes through in order, such as downloading, loading into a Pandas DataFrame and writing into Snowflake
+            The last stage is the Sink, which loads each item into the destination location
+
+    Each stage has its own pool of threads, therefore the next file can be downloading while the current file is being loaded into a Pandas DataFrame and the previous file is being written into the destination location
+        The queue between each stage holds up to queue_size items, which prevents downloaded files from building up in memory when one stage is faster than the next stage
+
+    Functions:
+
+        Stage: Define a stage of the data pipeline
+
+        run_pipeline: Run the data pipeline, returning the result of the last stage for each item along with the statistics of each stage
+
+        format_stats: Format the statistics of each stage into a table that can be displayed
+
+        run_transfers_async: Transfer many files at the same time within 1 thread using asyncio, as used within the "Connect to AWS S3, Azure Blob Storage and SFTP - Template - Asyncio" file
+
+        benchmark_transfers: Compare transferring files 1 at a time, as within the other templates, with run_transfers_async, using local stand-ins for the network requests
+"""
+
+
+# Enables the ability to define each stage as a tuple with named values
+from collections import namedtuple
+
+# Enables the ability to pass items between the stages, which can be shared by multiple threads
+import queue
+
+# Enables the ability to run each stage within its own threads
+import threading
+
+# Enables the ability to measure how long each stage takes
+import time
+
+
+# ProcessPoolExecutor is imported within the run_pipeline function, and only when a stage uses processes
+    # Importing ProcessPoolExecutor also imports multiprocessing, which takes longer than importing the rest of this connector
+# asyncio is imported within the run_transfers_async and benchmark_transfers functions for the same reason
+
+
+# A stage of the data pipeline
+    # name - The name of the stage, which is used within the statistics
+    # function - The function that is called once per item, which returns the item passed into the next stage
+    # max_workers - The number of items that the stage processes at the same time
+    # use_processes - Identifies if the function is run within a pool of processes rather than threads
+        # Use processes for stages that use the CPU, such as loading files into Pandas DataFrames, as threads can only use 1 CPU at a time
+            # The function, the item and the returned item must be picklable, such as functions that are defined at the top level of a module
+Stage = namedtuple("Stage", ["name", "function", "max_workers", "use_processes"], defaults = [1, False])
+
+# The item placed into a queue once every item has been passed into the queue
+_DONE = object()
+
+# The number of seconds each thread waits on a queue before verifying whether the data pipeline has been stopped
+_QUEUE_TIMEOUT_SECONDS = 0.1
+
+
+# Define the function that runs the data pipeline
+    # Each item from the source passes through every stage in order
+        # Returns the result of the last stage for each item, in the same order as the source, along with the statistics of each stage
+    # If any stage fails, the data pipeline is stopped and the error is raised once every thread has stopped
+    # If report_seconds is specified, the statistics of each stage are displayed every report_seconds seconds while the data pipeline is running
+def run_pipeline(source, stages, queue_size = 8, report_seconds = None):
+
+    stages = [Stage(*stage) if not isinstance(stage, Stage) else stage for stage in stages]
+
+    # The queue in front of each stage
+    stage_queues = [queue.Queue(maxsize = queue_size) for _ in stages]
+
+    if any(stage.use_processes for stage in stages):
+
+        from concurrent.futures import ProcessPoolExecutor
+
+    # The pool of processes for each stage that uses processes
+    process_executors = {
+        stage_number: ProcessPoolExecutor(max_workers = stage.max_workers)
+        for stage_number, stage in enumerate(stages)
+        if stage.use_processes
+    }
+
+    stop_event = threading.Event()
+
+    errors = []
+
+    results = {}
+
+    stats_lock = threading.Lock()
+
+    stage_stats = [
+        {
+            "items": 0
+            ,"busy_seconds": 0.0
+            ,"queue_depth_total": 0
+            ,"max_queue_depth": 0
+            ,"finished_workers": 0
+        }
+        for _ in stages
+    ]
+
+    # Place the item into the queue, waiting until the queue has space
+        # Returns False if the data pipeline was stopped before the item could be placed into the queue
+    def put_item(stage_queue, item):
+
+        while not stop_event.is_set():
+
+            try:
+
+                stage_queue.put(item, timeout = _QUEUE_TIMEOUT_SECONDS)
+
+                return True
+
+            except queue.Full:
+
+                continue
+
+        return False
+
+    # Stop the data pipeline, keeping the error so that it can be raised once every thread has stopped
+    def stop_pipeline(error):
+
+        with stats_lock:
+
+            errors.append(error)
+
+        stop_event.set()
+
+    # Place each item from the source into the queue of the first stage, numbering each item to keep the order of the source
+    def read_source():
+
+        try:
+
+            for item_number, item in enumerate(source):
+
+                if not put_item(stage_queues[0], (item_number, item)):
+
+                    return
+
+        except BaseException as error:
+
+            stop_pipeline(error)
+
+            return
+
+        for _ in range(stages[0].max_workers):
+
+            put_item(stage_queues[0], _DONE)
+
+    # Process the items within the queue of the stage, then place the result into the queue of the next stage
+    def run_stage(stage_number):
+
+        stage = stages[stage_number]
+
+        stage_queue = stage_queues[stage_number]
+
+        next_queue = stage_queues[stage_number + 1] if stage_number + 1 < len(stages) else None
+
+        while not stop_event.is_set():
+
+            try:
+
+                queued_item = stage_queue.get(timeout = _QUEUE_TIMEOUT_SECONDS)
+
+            except queue.Empty:
+
+                continue
+
+            if queued_item is _DONE:
+
+                break
+
+            item_number, item = queued_item
+
+            # The number of items waiting within the queue, once this item has been taken
+            queue_depth = stage_queue.qsize()
+
+            stage_start_time = time.perf_counter()
+
+            try:
+
+                if stage.use_processes:
+
+                    result = process_executors[stage_number].submit(stage.function, item).result()
+
+                else:
+
+                    result = stage.function(item)
+
+            except BaseException as error:
+
+                stop_pipeline(error)
+
+                break
+
+            with stats_lock:
+
+                stage_stats[stage_number]["items"] += 1
+                stage_stats[stage_number]["busy_seconds"] += time.perf_counter() - stage_start_time
+                stage_stats[stage_number]["queue_depth_total"] += queue_depth
+                stage_stats[stage_number]["max_queue_depth"] = max(stage_stats[stage_number]["max_queue_depth"], queue_depth)
+
+                if next_queue is None:
+
+                    results[item_number] = result
+
+            if next_queue is not None and not put_item(next_queue, (item_number, result)):
+
+                break
+
+        # The last thread of the stage to finish tells each thread of the next stage that every item has been passed on
+        with stats_lock:
+
+            stage_stats[stage_number]["finished_workers"] += 1
+
+            last_worker = stage_stats[stage_number]["finished_workers"] == stage.max_workers
+
+        if last_worker and next_queue is not None:
+
+            for _ in range(stages[stage_number + 1].max_workers):
+
+                put_item(next_queue, _DONE)
+
+    pipeline_start_time = time.perf_counter()
+
+    pipeline_threads = [threading.Thread(target = read_source, name = "source")]
+
+    for stage_number, stage in enumerate(stages):
+
+        for worker_number in range(stage.max_workers):
+
+            pipeline_threads.append(threading.Thread(target = run_stage, args = (stage_number,), name = f"{stage.name}-{worker_number}"))
+
+    for pipeline_thread in pipeline_threads:
+
+        pipeline_thread.start()
+
+    try:
+
+        # Display the statistics of each stage every report_seconds seconds, until every thread has stopped
+        while any(pipeline_thread.is_alive() for pipeline_thread in pipeline_threads):
+
+            pipeline_threads[-1].join(timeout = report_seconds or _QUEUE_TIMEOUT_SECONDS)
+
+            if report_seconds and any(pipeline_thread.is_alive() for pipeline_thread in pipeline_threads):
+
+                print(format_stats(get_stats(stages, stage_stats, stage_queues, stats_lock, time.perf_counter() - pipeline_start_time)))
+
+    except BaseException as error:
+
+        # Stop every thread if the data pipeline is interrupted, such as when the notebook cell is cancelled
+        stop_pipeline(error)
+
+        for pipeline_thread in pipeline_threads:
+
+            pipeline_thread.join()
+
+    finally:
+
+        for process_executor in process_executors.values():
+
+            process_executor.shutdown()
+
+    if errors:
+
+        raise errors[0]
+
+    pipeline_stats = get_stats(stages, stage_stats, stage_queues, stats_lock, time.perf_counter() - pipeline_start_time)
+
+    return [results[item_number] for item_number in sorted(results)], pipeline_stats
+
+
+# Define the function that creates the statistics of each stage
+    # items_per_second - The number of items completed by the stage per second, since the data pipeline started
+    # utilization - The share of time the threads of the stage were busy, where 1.0 means the stage was always busy and is the slowest stage
+    # queue_depth - The number of items currently waiting within the queue in front of the stage
+    # average_queue_depth and max_queue_depth - The number of items waiting within the queue each time the stage took an item
+        # A queue that is usually full means the stage is slower than the stage before it
+def get_stats(stages, stage_stats, stage_queues, stats_lock, pipeline_seconds):
+
+    with stats_lock:
+
+        return {
+            stage.name: {
+                "items": stage_stats[stage_number]["items"]
+                ,"busy_seconds": stage_stats[stage_number]["busy_seconds"]
+                ,"items_per_second": stage_stats[stage_number]["items"] / pipeline_seconds if pipeline_seconds else 0.0
+                ,"utilization": stage_stats[stage_number]["busy_seconds"] / (pipeline_seconds * stage.max_workers) if pipeline_seconds else 0.0
+                ,"queue_depth": stage_queues[stage_number].qsize()
+                ,"average_queue_depth": stage_stats[stage_number]["queue_depth_total"] / stage_stats[stage_number]["items"] if stage_stats[stage_number]["items"] else 0.0
+                ,"max_queue_depth": stage_stats[stage_number]["max_queue_depth"]
+            }
+            for stage_number, stage in enumerate(stages)
+        }
+
+
+# Define the function that formats the statistics of each stage into a table that can be displayed
+def format_stats(pipeline_stats):
+
+    stats_lines = [f"{'stage':<16} {'items':>8} {'items/sec':>10} {'utilization':>12} {'queue':>6} {'avg queue':>10} {'max queue':>10}"]
+
+    for stage_name, stats in pipeline_stats.items():
+
+        stats_lines.append(
+            f"{stage_name:<16}"
+            f" {stats['items']:>8}"
+            f" {stats['items_per_second']:>10.2f}"
+            f" {stats['utilization']:>12.0%}"
+            f" {stats['queue_depth']:>6}"
+            f" {stats['average_queue_depth']:>10.1f}"
+            f" {stats['max_queue_depth']:>10}"
+        )
+
+    return "\n".join(stats_lines)
+
+
+# Define the function that lists the files and transfers transfers_in_progress files at the same time, within 1 thread using asyncio
+    # list_files - Function that returns an async iterable of the file names, such as list_s3_files within the Asyncio template
+    # transfer_file - Async function that downloads, loads and deletes 1 file, returning the result for the file
+    # Up to queue_size file names wait to be transferred, which pauses the listing when the listing is faster than the file transfers
+    # Returns the result of transfer_file for each file, in the same order that the files were listed
+        # If the listing or any transfer fails, every other transfer is cancelled before the error is raised, rather than continuing in the background
+async def run_transfers_async(list_files, transfer_file, transfers_in_progress = 100, queue_size = 200):
+
+    import asyncio
+
+    file_queue = asyncio.Queue(maxsize = queue_size)
+
+    results = {}
+
+    async def list_stage():
+
+        file_number = 0
+
+        async for file_name in list_files():
+
+            await file_queue.put((file_number, file_name))
+
+            file_number += 1
+
+        for _ in range(transfers_in_progress):
+
+            await file_queue.put(None)
+
+    async def transfer_stage():
+
+        while (queued_file := await file_queue.get()) is not None:
+
+            file_number, file_name = queued_file
+
+            results[file_number] = await transfer_file(file_name)
+
+    pipeline_tasks = [asyncio.ensure_future(list_stage())] + [asyncio.ensure_future(transfer_stage()) for _ in range(transfers_in_progress)]
+
+    try:
+
+        await asyncio.gather(*pipeline_tasks)
+
+    except BaseException:
+
+        for pipeline_task in pipeline_tasks:
+
+            pipeline_task.cancel()
+
+        # Wait for every task to be cancelled, so that no transfer is still running once the error is raised
+        await asyncio.gather(*pipeline_tasks, return_exceptions = True)
+
+        raise
+
+    return [results[file_number] for file_number in sorted(results)]
+
+
+# Define the function that compares transferring files 1 at a time with run_transfers_async, using local stand-ins rather than connecting to a source
+    # Each network request, such as listing 1 page of file names, downloading a file or deleting a file, is replaced by waiting request_seconds
+        # The sequential transfers wait on each network request in turn, which is how the AWS S3, Azure Blob Storage and SFTP templates transfer files
+    # Returns the number of seconds each method took, using the number of transfers in progress for the asyncio method
+def benchmark_transfers(file_count = 1000, request_seconds = 0.02, page_size = 1000, transfer_counts = (1, 10, 100), delete_source_files = True):
+
+    import asyncio
+
+    file_names = [f"file_{file_number}.csv" for file_number in range(file_count)]
+
+    # The number of network requests per file, which is the download and the delete
+    requests_per_file = 2 if delete_source_files else 1
+
+    transfer_seconds = {}
+
+    transfer_start_time = time.perf_counter()
+
+    for page_start in range(0, file_count, page_size):
+
+        time.sleep(request_seconds)
+
+        for file_name in file_names[page_start:page_start + page_size]:
+
+            for _ in range(requests_per_file):
+
+                time.sleep(request_seconds)
+
+    transfer_seconds["sequential"] = time.perf_counter() - transfer_start_time
+
+    print(f"{'sequential':>16}: {transfer_seconds['sequential']:,.2f} seconds")
+
+    async def list_files():
+
+        for page_start in range(0, file_count, page_size):
+
+            await asyncio.sleep(request_seconds)
+
+            for file_name in file_names[page_start:page_start + page_size]:
+
+                yield file_name
+
+    async def transfer_file(file_name):
+
+        for _ in range(requests_per_file):
+
+            await asyncio.sleep(request_seconds)
+
+        return file_name
+
+    for transfers_in_progress in transfer_counts:
+
+        transfer_start_time = time.perf_counter()
+
+        if asyncio.run(run_transfers_async(list_files, transfer_file, transfers_in_progress, queue_size = 2 * transfers_in_progress)) != file_names:
+
+            raise RuntimeError("The asyncio transfers did not return every file in the order the files were listed")
+
+        transfer_seconds[transfers_in_progress] = time.perf_counter() - transfer_start_time
+
+        print(f"{transfers_in_progress:>6} transfers: {transfer_seconds[transfers_in_progress]:,.2f} seconds, {transfer_seconds['sequential'] / transfer_seconds[transfers_in_progress]:,.2f}x")
+
+    return transfer_seconds
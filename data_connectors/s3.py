@@ -0,0 +1,231 @@
+"""
+    The s3 connector extracts the file(s) within an AWS S3 Bucket, using the steps from the "Connect to AWS S3 - Template - Initial" and "Connect to AWS S3 - Template - Incremental" files
+
+    Functions:
+
+        connect: Connect to the AWS S3 Bucket
+
+        list_files: List the file(s) within the AWS S3 Bucket that begin with the prefix, 1 page at a time
+
+        download_file: Download the data within 1 file in the AWS S3 Bucket into memory
+
+        extract_file: Load the data within 1 file in the AWS S3 Bucket into a Pandas DataFrame
+
+        extract_files: Load the data within multiple files in the AWS S3 Bucket into Pandas DataFrames at the same time
+
+        open_manifest: Open the manifest of the file(s) that have already been loaded, and retrieve the watermark
+
+        list_new_files: List the file(s) within the AWS S3 Bucket that have not been loaded, or have changed since they were loaded
+
+        record_loaded_files: Record the loaded file(s) within the manifest, and move the watermark
+"""
+
+
+# Used when working with and manipulating dates and times
+from datetime import datetime
+
+# Enables the ability to run the same function multiple times at the same time, using a pool of threads
+from concurrent.futures import ThreadPoolExecutor
+
+# Enables the ability to search for file names based on specified string pattern(s)
+import fnmatch
+
+# Enables the ability to treat data held in memory as a file
+import io
+
+# Enables the ability to create and query a SQLite database, which is stored within a single file
+import sqlite3
+
+# Enables the ability to load the data within each file into a Pandas DataFrame
+from . import files
+
+
+# boto3 is imported within the connect function, rather than when the connector is imported
+    # Importing boto3 takes longer than any other step within this connector, therefore it is only imported once it is needed
+
+
+# Define the function that connects to the AWS S3 Bucket
+    # The client can be shared by multiple threads, therefore 1 connection is allowed per thread
+def connect(aws_region_name, s3_access_id, s3_secret_access_key, max_workers = 8):
+
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
+        service_name = "s3"
+        ,region_name = aws_region_name
+        ,aws_access_key_id = s3_access_id
+        ,aws_secret_access_key = s3_secret_access_key
+        # Allow 1 connection to the AWS S3 Bucket per thread, so that threads do not wait on each other for a connection
+        ,config = Config(max_pool_connections = max_workers)
+    )
+
+
+# Define the function that lists the file(s) within the AWS S3 Bucket that begin with the prefix
+    # The file(s) are returned 1 at a time, as the name, ETag, size and last modified date of each file
+        # The pages are requested lazily, meaning each page is only requested once the previous page has been looped through
+    # AWS S3 lists files in alphabetical order, therefore:
+        # s3_start_after skips all file names that come before it
+        # s3_end_at stops the listing once a file name comes after it
+def list_files(s3_client, s3_bucket, s3_file_prefix = "", s3_start_after = "", s3_end_at = "", s3_page_size = 1000, s3_file_name_pattern = "*"):
+
+    s3_pages = s3_client.get_paginator("list_objects_v2").paginate(
+        Bucket = s3_bucket
+        ,Prefix = s3_file_prefix
+        ,StartAfter = s3_start_after
+        ,PaginationConfig = {"PageSize": s3_page_size}
+    )
+
+    for s3_page in s3_pages:
+
+        # Pages that do not contain any files do not include the "Contents" key
+        for s3_bucket_file in s3_page.get("Contents", []):
+
+            if s3_end_at and s3_bucket_file["Key"] > s3_end_at:
+
+                return
+
+            # Only return the files that match the specified pattern
+            if fnmatch.fnmatch(s3_bucket_file["Key"], s3_file_name_pattern):
+
+                yield s3_bucket_file
+
+
+# Define the function that downloads the data within 1 file in the AWS S3 Bucket into memory
+    # s3_bucket_file is either the file name, or the file returned by list_files
+    # Compressed files are downloaded as is, and are decompressed once they are loaded into a Pandas DataFrame, which keeps the data held in memory small
+    # Used as the download stage of a data pipeline, so that the next file is downloading while the current file is being loaded into a Pandas DataFrame
+def download_file(s3_client, s3_bucket, s3_bucket_file):
+
+    s3_key = s3_bucket_file["Key"] if isinstance(s3_bucket_file, dict) else s3_bucket_file
+
+    s3_file = s3_client.get_object(Bucket = s3_bucket, Key = s3_key)
+
+    return io.BytesIO(s3_file["Body"].read())
+
+
+# Define the function that loads the data within 1 file in the AWS S3 Bucket into a Pandas DataFrame
+    # The data is read directly from the AWS S3 Bucket as it is parsed, rather than downloading the entire file first
+        # If chunk_size is specified, an iterator is returned that loads chunk_size rows each time it is looped through
+        # Compressed files, such as .csv.gz or .csv.zst, are decompressed as the data is read from the AWS S3 Bucket
+def extract_file(s3_client, s3_bucket, s3_key, file_columns, sep = ",", names = None, chunk_size = None, engine = "c"):
+
+    s3_file = s3_client.get_object(Bucket = s3_bucket, Key = s3_key)
+
+    return files.read_file(s3_file["Body"], file_columns, sep = sep, names = names, chunk_size = chunk_size, engine = engine, file_name = s3_key)
+
+
+# Define the function that loads the data within multiple files in the AWS S3 Bucket into Pandas DataFrames at the same time
+    # The Pandas DataFrames are returned in the same order as s3_keys, no matter which file finishes first
+    # If parse_max_workers is specified, each file is downloaded by the pool of threads, then loaded into a Pandas DataFrame by a pool of parse_max_workers processes
+        # Use when loading the files uses 100% of 1 CPU, as each thread can only use 1 CPU at a time
+def extract_files(s3_client, s3_bucket, s3_keys, file_columns, sep = ",", names = None, max_workers = 8, parse_max_workers = None, engine = "c"):
+
+    with ThreadPoolExecutor(max_workers = max_workers) as executor:
+
+        if parse_max_workers:
+
+            return files.parse_files(
+                # Up to 2 files per thread are downloaded ahead of the processes, rather than every file being downloaded into memory straight away
+                (file_data.getvalue() for file_data in files.map_in_order(executor, lambda s3_key: download_file(s3_client, s3_bucket, s3_key), s3_keys, 2 * max_workers))
+                ,file_columns
+                ,sep = sep
+                ,names = names
+                ,max_workers = parse_max_workers
+                ,engine = engine
+            )
+
+        return list(executor.map(
+            lambda s3_key: extract_file(s3_client, s3_bucket, s3_key, file_columns, sep = sep, names = names, engine = engine)
+            ,s3_keys
+        ))
+
+
+# Define the function that opens the manifest of the file(s) that have already been loaded, and retrieves the watermark
+    # The manifest is a SQLite database file, which is created automatically the first time it is opened
+        # The file must be stored in a location that is kept between each execution of the data pipeline, such as a mounted storage volume
+    # Returns the connection to the manifest and the watermark, which is the last file name that has been loaded for the AWS S3 Bucket and prefix
+def open_manifest(manifest_path, s3_bucket, s3_file_prefix):
+
+    manifest_conn = sqlite3.connect(manifest_path)
+
+    manifest_conn.execute("""
+        CREATE TABLE IF NOT EXISTS s3_manifest (
+            bucket TEXT NOT NULL
+            ,key TEXT NOT NULL
+            ,etag TEXT NOT NULL
+            ,size INTEGER NOT NULL
+            ,last_modified TEXT NOT NULL
+            ,loaded_at TEXT NOT NULL
+            ,PRIMARY KEY (bucket, key)
+        )
+    """)
+
+    manifest_conn.execute("""
+        CREATE TABLE IF NOT EXISTS s3_watermark (
+            bucket TEXT NOT NULL
+            ,prefix TEXT NOT NULL
+            ,last_key TEXT NOT NULL
+            ,PRIMARY KEY (bucket, prefix)
+        )
+    """)
+
+    watermark_row = manifest_conn.execute(
+        "SELECT last_key FROM s3_watermark WHERE bucket = ? AND prefix = ?"
+        ,(s3_bucket, s3_file_prefix)
+    ).fetchone()
+
+    return manifest_conn, "" if watermark_row is None else watermark_row[0]
+
+
+# Define the function that lists the file(s) within the AWS S3 Bucket that have not been loaded, or have changed since they were loaded
+    # The ETag changes whenever the data within the file changes, which allows us to identify files that have changed since they were loaded
+def list_new_files(s3_client, manifest_conn, s3_bucket, s3_file_prefix, s3_start_after = "", s3_page_size = 1000, s3_file_name_pattern = "*"):
+
+    for s3_bucket_file in list_files(s3_client, s3_bucket, s3_file_prefix, s3_start_after, s3_page_size = s3_page_size, s3_file_name_pattern = s3_file_name_pattern):
+
+        manifest_row = manifest_conn.execute(
+            "SELECT etag FROM s3_manifest WHERE bucket = ? AND key = ?"
+            ,(s3_bucket, s3_bucket_file["Key"])
+        ).fetchone()
+
+        if manifest_row is None or manifest_row[0] != s3_bucket_file["ETag"]:
+
+            yield s3_bucket_file
+
+
+# Define the function that records the loaded file(s) within the manifest, and moves the watermark to the last file name that has been loaded
+    # Only record the files once the data has been loaded into the destination location
+        # The watermark is never moved backwards
+def record_loaded_files(manifest_conn, s3_bucket, s3_file_prefix, loaded_s3_file_list):
+
+    manifest_conn.executemany(
+        """
+            INSERT OR REPLACE INTO s3_manifest (bucket, key, etag, size, last_modified, loaded_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """
+        ,[
+            (
+                s3_bucket
+                ,s3_bucket_file["Key"]
+                ,s3_bucket_file["ETag"]
+                ,s3_bucket_file["Size"]
+                ,s3_bucket_file["LastModified"].isoformat()
+                ,datetime.now().isoformat()
+            )
+            for s3_bucket_file in loaded_s3_file_list
+        ]
+    )
+
+    if len(loaded_s3_file_list) != 0:
+
+        manifest_conn.execute(
+            """
+                INSERT INTO s3_watermark (bucket, prefix, last_key)
+                VALUES (?, ?, ?)
+                ON CONFLICT (bucket, prefix) DO UPDATE SET last_key = MAX(last_key, excluded.last_key)
+            """
+            ,(s3_bucket, s3_file_prefix, max(s3_bucket_file["Key"] for s3_bucket_file in loaded_s3_file_list))
+        )
+
+    manifest_conn.commit()
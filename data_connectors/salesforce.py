@@ -0,0 +1,483 @@
+"""
+    The salesforce connector queries Salesforce objects, using the steps from the "Connect to Salesforce - Template" file
+
+    Functions:
+
+        connect: Connect to Salesforce
+
+        describe: Retrieve the Salesforce object metadata, using the metadata cache
+
+        get_soql_fields: Create the list of fields within the Salesforce object metadata, which is used within the SELECT clause of the SOQL query
+
+        get_soql_dtypes: Create the data type of the Pandas DataFrame column for each field, along with the list of date fields
+
+        convert_dtypes: Convert the columns within a Pandas DataFrame to the data types of the Salesforce object fields
+
+        get_soql_query: Write the SOQL query that extracts the fields from the Salesforce object
+
+        query: Query the Salesforce object using the REST API, collecting the values for each column as each record is returned
+
+        benchmark_query: Measure the peak memory and time taken by query, compared with loading the list of records into a Pandas DataFrame
+
+        read_bulk_page: Load 1 page of the Bulk API 2.0 results into a Pandas DataFrame
+
+        bulk_query: Query the Salesforce object using the Bulk API 2.0
+
+        query_changes: Query the records changed between 2 date times, splitting the date times into slices of time that are queried at the same time
+
+        open_watermark: Open the watermark database, and retrieve the date time that the last extraction ended at
+
+        save_watermark: Save the date time that the extraction ended at, once the data has been loaded into the destination location
+"""
+
+
+# Used when working with and manipulating dates and times
+from datetime import datetime, timedelta, timezone
+
+# Enables the ability to run the same function multiple times at the same time, using a pool of threads
+from concurrent.futures import ThreadPoolExecutor
+
+# Enables the ability to create the date format used within the If-Modified-Since request header
+from email.utils import formatdate
+
+# Enables the ability to treat data held in memory as a file
+import io
+
+# Enables the ability to read and write JSON files
+import json
+
+# Enables the ability to interact with the file system, such as verifying if a file exists
+import os
+
+# Enables the ability to create and query a SQLite database, which is stored within a single file
+import sqlite3
+
+# Enables the ability to pause the data pipeline for a specified number of seconds
+import time
+
+
+# simple_salesforce and pandas are imported within each function, rather than when the connector is imported
+    # This prevents the metadata cache and watermark functions from waiting on simple_salesforce and pandas to be imported
+
+
+# The format of date times within SOQL queries, such as 2024-01-31T00:00:00Z
+SOQL_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# The data type of the Pandas DataFrame column for each Salesforce field type
+    # Salesforce field types that are not listed are kept as strings
+SALESFORCE_FIELD_DTYPES = {
+    "boolean": "boolean"
+    ,"int": "Int64"
+    ,"double": "Float64"
+    ,"currency": "Float64"
+    ,"percent": "Float64"
+}
+
+
+# Define the function that connects to Salesforce
+    # session_id is optional, and is used to authenticate the Salesforce connection without logging in again
+def connect(instance_url, username, password, security_token, consumer_key, consumer_secret, session_id = None):
+
+    from simple_salesforce import Salesforce
+
+    return Salesforce(
+        instance_url = instance_url
+        ,username = username
+        ,password = password
+        ,security_token = security_token
+        ,consumer_key = consumer_key
+        ,consumer_secret = consumer_secret
+        ,session_id = session_id
+    )
+
+
+# Define the function that retrieves the Salesforce object metadata, using the metadata cache
+    # The metadata is cached within 1 JSON file per Salesforce environment and Salesforce object, within describe_cache_path
+        # The cached metadata is used without an API call until it is older than describe_cache_ttl_seconds
+            # Salesforce is then asked whether the metadata has changed, using the If-Modified-Since request header, and only returns the metadata again if it has changed
+def describe(sf, soql_object, describe_cache_path, describe_cache_ttl_seconds = 86400):
+
+    describe_cache_file = os.path.join(describe_cache_path, f"{sf.sf_instance}_{soql_object}.json")
+
+    describe_cache = None
+
+    if os.path.exists(describe_cache_file):
+
+        with open(describe_cache_file) as describe_cache_json:
+
+            describe_cache = json.load(describe_cache_json)
+
+    if describe_cache is not None and time.time() - describe_cache["cached_at"] <= describe_cache_ttl_seconds:
+
+        return describe_cache["describe"]
+
+    describe_response = sf.session.get(
+        f"{sf.base_url}sobjects/{soql_object}/describe"
+        ,headers = {
+            **sf.headers
+            ,**({"If-Modified-Since": describe_cache["last_modified"]} if describe_cache else {})
+        }
+    )
+
+    # Salesforce returns a 304 status code if the metadata has not changed, therefore the cached metadata is still correct
+    if describe_response.status_code == 304:
+
+        describe_cache["cached_at"] = time.time()
+
+    else:
+
+        describe_response.raise_for_status()
+
+        describe_cache = {
+            "cached_at": time.time()
+            ,"last_modified": describe_response.headers.get("Last-Modified", formatdate(usegmt = True))
+            ,"describe": describe_response.json()
+        }
+
+    with open(describe_cache_file, "w") as describe_cache_json:
+
+        json.dump(describe_cache, describe_cache_json)
+
+    return describe_cache["describe"]
+
+
+# Define the function that creates the list of fields within the Salesforce object metadata
+    # Address and location fields are excluded, as they are a combination of other fields that are already included, such as BillingCity and BillingState
+def get_soql_fields(desc_sf_obj):
+
+    return [field["name"] for field in desc_sf_obj["fields"] if field["type"] not in ("address", "location")]
+
+
+# Define the function that creates the data type of the Pandas DataFrame column for each field, along with the list of date and date time fields
+def get_soql_dtypes(desc_sf_obj):
+
+    soql_dtypes = {
+        field["name"]: SALESFORCE_FIELD_DTYPES[field["type"]]
+        for field in desc_sf_obj["fields"]
+        if field["type"] in SALESFORCE_FIELD_DTYPES
+    }
+
+    soql_date_fields = [field["name"] for field in desc_sf_obj["fields"] if field["type"] in ("date", "datetime")]
+
+    return soql_dtypes, soql_date_fields
+
+
+# Define the function that converts the columns within a Pandas DataFrame to the data types of the Salesforce object fields
+    # Salesforce returns all date times in UTC
+def convert_dtypes(df, soql_dtypes, soql_date_fields):
+
+    import pandas as pd
+
+    df = df.astype({field: dtype for field, dtype in soql_dtypes.items() if field in df.columns})
+
+    for soql_date_field in soql_date_fields:
+
+        if soql_date_field in df.columns:
+
+            df[soql_date_field] = pd.to_datetime(df[soql_date_field], utc = True)
+
+    return df
+
+
+# Define the function that writes the SOQL query that extracts the fields from the Salesforce object
+    # soql_where is optional, and is the condition within the WHERE clause of the SOQL query
+def get_soql_query(soql_object, soql_fields, soql_where = None):
+
+    soql_query = f"SELECT {', '.join(soql_fields)} FROM {soql_object}"
+
+    if soql_where:
+
+        soql_query = f"{soql_query} WHERE {soql_where}"
+
+    return soql_query
+
+
+# Define the function that queries the Salesforce object using the REST API, collecting the values for each column as each record is returned
+    # Only 1 page of 2,000 records is held in memory at a time, rather than every record
+        # The Pandas DataFrame is created once from the lists of values, with 1 column per field in the same order as soql_fields
+    # include_deleted uses the queryAll endpoint, which also returns the deleted records within the Salesforce recycle bin
+def query(sf, soql_object, soql_fields, soql_where = None, include_deleted = False):
+
+    import pandas as pd
+
+    soql_columns = {soql_field: [] for soql_field in soql_fields}
+
+    # The parts of each field name are used to find the value of fields from related Salesforce objects, such as "Owner.Name"
+    soql_column_appenders = [
+        (soql_field.split("."), soql_columns[soql_field].append)
+        for soql_field in soql_fields
+    ]
+
+    for soql_record in sf.query_all_iter(get_soql_query(soql_object, soql_fields, soql_where), include_deleted = include_deleted):
+
+        for soql_field_parts, append_value in soql_column_appenders:
+
+            soql_value = soql_record
+
+            # If a related Salesforce object does not exist for the record, the value of the field is None
+            for soql_field_part in soql_field_parts:
+
+                soql_value = soql_value.get(soql_field_part) if soql_value is not None else None
+
+            append_value(soql_value)
+
+    return pd.DataFrame(soql_columns, columns = soql_fields)
+
+
+# Define the function that measures the peak memory and time taken by query, compared with loading the list of records into a Pandas DataFrame
+    # The records are generated by a stand-in for query_all_iter rather than queried from Salesforce, therefore only the memory and time taken within Python are measured
+        # Each record is a new dictionary with an attributes dictionary, field_count fields and 1 field from a related Salesforce object, as returned by simple_salesforce
+    # The records method holds every record in memory, then loads the records into a Pandas DataFrame and drops the attributes columns, which was used by earlier versions of the Salesforce template
+    # Returns a list of the peak MB, the MB of the Pandas DataFrame and the number of seconds taken by each method, for each number of records
+        # tracemalloc slows down both methods, therefore compare the number of seconds between the methods rather than with a query of Salesforce
+def benchmark_query(record_counts = (1000000, 10000000), field_count = 10):
+
+    from types import SimpleNamespace
+    import tracemalloc
+
+    import pandas as pd
+
+    soql_object = "Account"
+
+    soql_fields = ["Id"] + [f"Field_{field_number}__c" for field_number in range(field_count)] + ["Owner.Name"]
+
+    def get_stand_in_sf(record_count):
+
+        def query_all_iter(soql_query, include_deleted = False):
+
+            for record_number in range(record_count):
+
+                soql_record = {"attributes": {"type": soql_object, "url": f"/services/data/v59.0/sobjects/{soql_object}/{record_number:018d}"}, "Id": f"{record_number:018d}"}
+
+                # Half of the fields are text and half of the fields are numbers
+                for field_number in range(field_count):
+
+                    soql_record[f"Field_{field_number}__c"] = f"value_{record_number % 1000}" if field_number % 2 == 0 else record_number * 0.5
+
+                soql_record["Owner"] = {"attributes": {"type": "User"}, "Name": f"owner_{record_number % 100}"}
+
+                yield soql_record
+
+        return SimpleNamespace(query_all_iter = query_all_iter)
+
+    def query_records(sf):
+
+        soql_records = list(sf.query_all_iter(get_soql_query(soql_object, soql_fields)))
+
+        # The attributes columns are dropped by selecting only the fields within soql_fields
+        return pd.json_normalize(soql_records)[soql_fields]
+
+    query_methods = {
+        "records": query_records
+        ,"columns": lambda sf: query(sf, soql_object, soql_fields)
+    }
+
+    benchmark_results = []
+
+    print(f"{'records':>12} {'method':>8} {'peak MB':>10} {'df MB':>10} {'seconds':>9}")
+
+    for record_count in record_counts:
+
+        for query_method, query_function in query_methods.items():
+
+            tracemalloc.start()
+
+            benchmark_start_time = time.perf_counter()
+
+            try:
+
+                df = query_function(get_stand_in_sf(record_count))
+
+                benchmark_seconds = time.perf_counter() - benchmark_start_time
+
+                benchmark_peak_bytes = tracemalloc.get_traced_memory()[1]
+
+            finally:
+
+                tracemalloc.stop()
+
+            if len(df) != record_count or list(df.columns) != soql_fields:
+
+                raise RuntimeError(f"The {query_method} method did not return every record and field")
+
+            benchmark_results.append({
+                "records": record_count
+                ,"method": query_method
+                ,"peak_bytes": benchmark_peak_bytes
+                ,"df_bytes": int(df.memory_usage(deep = True).sum())
+                ,"seconds": benchmark_seconds
+            })
+
+            print(f"{record_count:>12,} {query_method:>8} {benchmark_peak_bytes / 1048576:>10,.1f} {benchmark_results[-1]['df_bytes'] / 1048576:>10,.1f} {benchmark_seconds:>8.2f}s")
+
+            del df
+
+    return benchmark_results
+
+
+# Define the function that loads 1 page of the Bulk API 2.0 results into a Pandas DataFrame
+    # A page without any data, such as the results of a SOQL query that matched no records, is returned as an empty Pandas DataFrame
+        # pd.read_csv raises an EmptyDataError for a page without any data, as the page does not contain the column names
+def read_bulk_page(bulk_page_content):
+
+    import pandas as pd
+
+    if not bulk_page_content.strip():
+
+        return pd.DataFrame()
+
+    return pd.read_csv(io.BytesIO(bulk_page_content))
+
+
+# Define the function that queries the Salesforce object using the Bulk API 2.0
+    # Use this function for Salesforce objects that contain millions of records
+        # The next page of results is downloaded while the previous pages are being loaded into Pandas DataFrames, up to max_workers pages at a time
+def bulk_query(sf, soql_query, include_deleted = False, max_records = 100000, poll_seconds = 5, max_workers = 4):
+
+    import pandas as pd
+
+    bulk_job = sf.session.post(
+        f"{sf.base_url}jobs/query"
+        ,headers = sf.headers
+        ,json = {
+            "operation": "queryAll" if include_deleted else "query"
+            ,"query": soql_query
+        }
+    )
+
+    bulk_job.raise_for_status()
+
+    bulk_job_id = bulk_job.json()["id"]
+
+    while True:
+
+        bulk_job_state = sf.session.get(
+            f"{sf.base_url}jobs/query/{bulk_job_id}"
+            ,headers = sf.headers
+        ).json()["state"]
+
+        if bulk_job_state == "JobComplete":
+
+            break
+
+        if bulk_job_state in ("Failed", "Aborted"):
+
+            raise RuntimeError(f"The Bulk API 2.0 query job {bulk_job_id} did not complete successfully. Job state: {bulk_job_state}")
+
+        time.sleep(poll_seconds)
+
+    with ThreadPoolExecutor(max_workers = max_workers) as executor:
+
+        bulk_page_list = []
+
+        bulk_locator = None
+
+        # Loop through each page of results, until Salesforce returns "null" as the locator for the next page
+        while bulk_locator != "null":
+
+            bulk_page = sf.session.get(
+                f"{sf.base_url}jobs/query/{bulk_job_id}/results"
+                ,headers = {**sf.headers, "Accept": "text/csv"}
+                ,params = {
+                    "maxRecords": max_records
+                    ,**({"locator": bulk_locator} if bulk_locator else {})
+                }
+            )
+
+            bulk_page.raise_for_status()
+
+            bulk_page_list.append(executor.submit(read_bulk_page, bulk_page.content))
+
+            bulk_locator = bulk_page.headers["Sforce-Locator"]
+
+        return pd.concat([bulk_page_df.result() for bulk_page_df in bulk_page_list], ignore_index = True)
+
+
+# Define the function that queries the records changed after extract_start and up to extract_end, using the REST API
+    # The date times are split into slices of slice_days days, which are queried at the same time, up to max_workers slices at a time
+        # Use for large backfills, such as the first extraction of the Salesforce object
+    # watermark_field is the field that identifies when each record was last changed
+        # SystemModstamp is preferred over LastModifiedDate, as SystemModstamp is indexed by Salesforce and also changes when Salesforce changes the record
+def query_changes(sf, soql_object, soql_fields, extract_start, extract_end, watermark_field = "SystemModstamp", slice_days = 30, max_workers = 4, include_deleted = False):
+
+    import pandas as pd
+
+    soql_slices = []
+
+    soql_slice_start = extract_start
+
+    while soql_slice_start < extract_end:
+
+        soql_slice_end = min(soql_slice_start + timedelta(days = slice_days), extract_end)
+
+        soql_slices.append((soql_slice_start, soql_slice_end))
+
+        soql_slice_start = soql_slice_end
+
+    def query_slice(soql_slice):
+
+        soql_slice_start, soql_slice_end = soql_slice
+
+        return query(
+            sf
+            ,soql_object
+            ,soql_fields
+            ,f"{watermark_field} > {soql_slice_start:{SOQL_DATETIME_FORMAT}} AND {watermark_field} <= {soql_slice_end:{SOQL_DATETIME_FORMAT}}"
+            ,include_deleted
+        )
+
+    with ThreadPoolExecutor(max_workers = max_workers) as executor:
+
+        soql_slice_data = list(executor.map(query_slice, soql_slices))
+
+    if len(soql_slice_data) == 0:
+
+        return pd.DataFrame(columns = soql_fields)
+
+    return pd.concat(soql_slice_data, ignore_index = True)
+
+
+# Define the function that opens the watermark database, and retrieves the date time that the last extraction of the Salesforce object ended at
+    # The watermark is a SQLite database file, which is created automatically the first time it is opened
+        # The file must be stored in a location that is kept between each execution of the data pipeline, such as a mounted storage volume
+    # Returns the connection to the watermark database and the watermark, which is None if the Salesforce object has not been extracted before
+def open_watermark(watermark_path, sf_instance, soql_object):
+
+    watermark_conn = sqlite3.connect(watermark_path)
+
+    watermark_conn.execute("""
+        CREATE TABLE IF NOT EXISTS sf_watermark (
+            instance TEXT NOT NULL
+            ,object TEXT NOT NULL
+            ,last_modstamp TEXT NOT NULL
+            ,PRIMARY KEY (instance, object)
+        )
+    """)
+
+    watermark_row = watermark_conn.execute(
+        "SELECT last_modstamp FROM sf_watermark WHERE instance = ? AND object = ?"
+        ,(sf_instance, soql_object)
+    ).fetchone()
+
+    if watermark_row is None:
+
+        return watermark_conn, None
+
+    return watermark_conn, datetime.strptime(watermark_row[0], SOQL_DATETIME_FORMAT).replace(tzinfo = timezone.utc)
+
+
+# Define the function that saves the date time that the extraction ended at, which becomes the watermark for the next extraction
+    # Only save the watermark once the data has been loaded into the destination location
+        # The watermark is never moved backwards
+def save_watermark(watermark_conn, sf_instance, soql_object, extract_end):
+
+    watermark_conn.execute(
+        """
+            INSERT INTO sf_watermark (instance, object, last_modstamp)
+            VALUES (?, ?, ?)
+            ON CONFLICT (instance, object) DO UPDATE SET last_modstamp = MAX(last_modstamp, excluded.last_modstamp)
+        """
+        ,(sf_instance, soql_object, f"{extract_end:{SOQL_DATETIME_FORMAT}}")
+    )
+
+    watermark_conn.commit()
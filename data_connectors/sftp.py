@@ -0,0 +1,235 @@
+"""
+    The sftp connector downloads the file(s) within a SFTP file path, using the steps from the "Connect to SFTP - Template" file
+
+    Functions:
+
+        connect: Open a SSH connection to the SFTP SSH server
+
+        list_files: List the file(s) within the SFTP file path that match the specified pattern
+
+        download_file: Download the data within 1 SFTP file into memory, sending multiple requests before waiting for a response
+
+        extract_file: Load the data within 1 SFTP file into a Pandas DataFrame, reading the data straight from the SFTP file as it is parsed
+
+        download_stage: Create the download stage of a data pipeline, using a separate SFTP channel per thread
+
+        extract_files: Load the data within multiple SFTP files into Pandas DataFrames at the same time, using a separate SFTP channel per thread
+
+        benchmark_download_files: Measure how long downloading the SFTP file(s) takes for each number of SFTP channels and each block size
+
+        delete_files: Delete the SFTP file(s) that have been loaded into the destination location
+"""
+
+
+# Enables the ability to run the same function multiple times at the same time, using a pool of threads
+from concurrent.futures import ThreadPoolExecutor
+
+# Enables the ability to create functions that are used within a with block
+from contextlib import contextmanager
+
+# Enables the ability to search for file names based on specified string pattern(s)
+import fnmatch
+
+# Enables the ability to treat data held in memory as a file
+import io
+
+# Enables the ability to store a separate value for each thread
+import threading
+
+# Enables the ability to measure how long each number of SFTP channels and each block size takes
+import time
+
+# Enables the ability to load the data within each file into a Pandas DataFrame
+from . import files
+
+
+# paramiko is imported within the connect function, rather than when the connector is imported
+    # The SSHClient returned by the connect function is used by the remaining functions, therefore they do not import paramiko
+
+
+# Define the function that opens a SSH connection to the SFTP SSH server
+    # window_size is the number of bytes the SFTP can send over each SFTP channel before waiting for the data pipeline to confirm that it has received the data
+        # A larger window speeds up downloads when the SFTP is slow to respond, such as when the SFTP is far away
+    # Use ssh_client.open_sftp() to establish a SFTP client object, and ssh_client.close() to close the SSH connection
+def connect(hostname, port, username, password, window_size = 134217728):
+
+    import paramiko
+
+    ssh_client = paramiko.SSHClient()
+
+    # Set the policy for handling unknown host keys to automatically add the host keys to the known hosts file
+    ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+    ssh_client.connect(
+        hostname = hostname
+        ,port = port
+        ,username = username
+        ,password = password
+        ,look_for_keys = False
+    )
+
+    # Set the window size for every SFTP channel that is established from this point onwards
+    ssh_client.get_transport().default_window_size = window_size
+
+    return ssh_client
+
+
+# Define the function that lists the file(s) within the SFTP file path that match the specified pattern
+def list_files(sftp, sftp_file_path, sftp_file_name_pattern = "*"):
+
+    return fnmatch.filter(sftp.listdir(sftp_file_path), sftp_file_name_pattern)
+
+
+# Define the function that downloads the data within 1 SFTP file into memory
+    # readv sends up to max_requests requests of block_size bytes before waiting for a response, rather than waiting on each block before requesting the next block
+        # paramiko splits any request larger than 32768 bytes into multiple requests
+        # Requires paramiko 3.3 or higher
+def download_file(sftp, sftp_file, block_size = 32768, max_requests = 64):
+
+    with sftp.open(sftp_file, "rb") as remote_file:
+
+        file_size = remote_file.stat().st_size
+
+        file_blocks = [
+            (block_start, min(block_size, file_size - block_start))
+            for block_start in range(0, file_size, block_size)
+        ]
+
+        return io.BytesIO(b"".join(remote_file.readv(file_blocks, max_concurrent_prefetch_requests = max_requests)))
+
+
+# Define the function that loads the data within 1 SFTP file into a Pandas DataFrame, reading the data straight from the SFTP file as it is parsed
+    # prefetch requests the blocks of the SFTP file in the background, up to max_requests at a time, while the previous blocks are being parsed
+    # If chunk_size is specified, an iterator is returned that loads chunk_size rows each time it is looped through
+        # The SFTP file is closed once every chunk has been looped through
+    # Compressed files, such as .csv.gz or .csv.zst, are decompressed as the data is read from the SFTP file
+def extract_file(sftp, sftp_file, file_columns, sep = ",", names = None, chunk_size = None, engine = "c", max_requests = 64):
+
+    remote_file = sftp.open(sftp_file, "rb")
+
+    remote_file.prefetch(max_concurrent_requests = max_requests)
+
+    if chunk_size is None:
+
+        with remote_file:
+
+            return files.read_file(remote_file, file_columns, sep = sep, names = names, engine = engine, file_name = sftp_file)
+
+    def read_chunks():
+
+        with remote_file:
+
+            yield from files.read_file(remote_file, file_columns, sep = sep, names = names, chunk_size = chunk_size, engine = engine, file_name = sftp_file)
+
+    return read_chunks()
+
+
+# Define the function that creates the download stage of a data pipeline, which downloads the data within 1 SFTP file into memory each time it is called
+    # Each thread establishes its own SFTP channel over the same SSH connection, as SFTP channels cannot be shared by multiple threads at the same time
+        # Each SFTP channel is opened over the same SSH connection, therefore no additional logins are required
+    # Each SFTP channel is closed once the with block is exited
+@contextmanager
+def download_stage(ssh_client, sftp_file_path, block_size = 32768, max_requests = 64):
+
+    sftp_thread_data = threading.local()
+
+    sftp_channel_list = []
+
+    def download_sftp_file(sftp_file):
+
+        if not hasattr(sftp_thread_data, "sftp"):
+
+            sftp_thread_data.sftp = ssh_client.open_sftp()
+
+            sftp_channel_list.append(sftp_thread_data.sftp)
+
+        return download_file(sftp_thread_data.sftp, f"{sftp_file_path}/{sftp_file}", block_size, max_requests)
+
+    try:
+
+        yield download_sftp_file
+
+    finally:
+
+        # Close each SFTP channel that was established by the pool of threads
+        for sftp_channel in sftp_channel_list:
+
+            sftp_channel.close()
+
+
+# Define the function that loads the data within multiple SFTP files into Pandas DataFrames at the same time, using a separate SFTP channel per thread
+    # The Pandas DataFrames are returned in the same order as sftp_file_list, no matter which file finishes downloading first
+    # If parse_max_workers is specified, each file is downloaded by the pool of threads, then loaded into a Pandas DataFrame by a pool of parse_max_workers processes
+        # Use when the SFTP is fast enough that loading the files uses 100% of 1 CPU, such as a SFTP on the same network
+def extract_files(ssh_client, sftp_file_path, sftp_file_list, file_columns, sep = ",", names = None, max_channels = 4, block_size = 32768, max_requests = 64, parse_max_workers = None, engine = "c"):
+
+    with download_stage(ssh_client, sftp_file_path, block_size, max_requests) as download_sftp_file:
+
+        with ThreadPoolExecutor(max_workers = max_channels) as executor:
+
+            if parse_max_workers:
+
+                return files.parse_files(
+                    # Up to 2 files per SFTP channel are downloaded ahead of the processes, rather than every file being downloaded into memory straight away
+                    (file_data.getvalue() for file_data in files.map_in_order(executor, download_sftp_file, sftp_file_list, 2 * max_channels))
+                    ,file_columns
+                    ,sep = sep
+                    ,names = names
+                    ,max_workers = parse_max_workers
+                    ,engine = engine
+                )
+
+            return list(executor.map(
+                lambda sftp_file: files.read_file(download_sftp_file(sftp_file), file_columns, sep = sep, names = names, engine = engine, file_name = sftp_file)
+                ,sftp_file_list
+            ))
+
+
+# Define the function that measures how long downloading the SFTP file(s) takes for each number of SFTP channels and each block size
+    # The files are only downloaded, rather than loaded into Pandas DataFrames, therefore only the time taken by the SFTP and the network is measured
+        # Every file is downloaded once per number of SFTP channels and block size, therefore use a sample of the SFTP file(s) with a similar size to the files being loaded
+    # Returns a list of the number of seconds and MB per second for each number of SFTP channels and block size
+        # Use the smallest number of SFTP channels and block size where the MB per second stops increasing, as each SFTP channel adds load onto the SFTP SSH server
+def benchmark_download_files(ssh_client, sftp_file_path, sftp_file_list, channel_counts = (1, 2, 4, 8), block_sizes = (32768, 262144, 1048576), max_requests = 64):
+
+    benchmark_results = []
+
+    print(f"{'block size':>10} {'channels':>9} {'MB':>10} {'seconds':>9} {'MB/sec':>9}")
+
+    for block_size in block_sizes:
+
+        for max_channels in channel_counts:
+
+            benchmark_start_time = time.perf_counter()
+
+            with download_stage(ssh_client, sftp_file_path, block_size, max_requests) as download_sftp_file:
+
+                with ThreadPoolExecutor(max_workers = max_channels) as executor:
+
+                    download_bytes = sum(
+                        file_data.getbuffer().nbytes
+                        for file_data in files.map_in_order(executor, download_sftp_file, sftp_file_list, 2 * max_channels)
+                    )
+
+            benchmark_seconds = time.perf_counter() - benchmark_start_time
+
+            benchmark_results.append({
+                "block_size": block_size
+                ,"max_channels": max_channels
+                ,"bytes": download_bytes
+                ,"seconds": benchmark_seconds
+                ,"mb_per_second": download_bytes / 1048576 / benchmark_seconds if benchmark_seconds else 0.0
+            })
+
+            print(f"{block_size:>10,} {max_channels:>9} {download_bytes / 1048576:>10,.1f} {benchmark_seconds:>9.2f} {benchmark_results[-1]['mb_per_second']:>9,.1f}")
+
+    return benchmark_results
+
+
+# Define the function that deletes the SFTP file(s) that have been loaded into the destination location
+    # This prevents the same file from being loaded into the destination multiple times, which will create duplicate data
+def delete_files(sftp, sftp_file_path, loaded_file_list):
+
+    for sftp_file in loaded_file_list:
+
+        sftp.remove(f"{sftp_file_path}/{sftp_file}")
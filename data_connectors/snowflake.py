@@ -0,0 +1,312 @@
+"""
+    The snowflake connector queries and writes data into Snowflake, using the steps from the "Connect to Snowflake - Template" file
+
+    Classes:
+
+        ConnectionPool: A pool of connections to the Snowflake data warehouse, which are reused by multiple SQL queries
+
+    Functions:
+
+        get_parquet_schema: Widen the numeric data types of the first Arrow batch, so that every later batch can be written using the same schema
+
+        write_parquet: Stream the result set of a SQL query into a Parquet file, 1 Arrow batch at a time
+
+        write_dataframe: Write the data from a Pandas DataFrame into a Snowflake table, using write_pandas
+
+        run_queries: Run multiple SQL queries at the same time using a pool of threads, 1 connection from the pool of connections per SQL query
+
+        run_queries_async: Submit multiple SQL queries to Snowflake as asynchronous SQL queries, in the order of their dependencies
+"""
+
+
+# Enables the ability to run the same function multiple times at the same time, using a pool of threads
+from concurrent.futures import ThreadPoolExecutor
+
+# Enables the ability to create functions that are used within a with block
+from contextlib import contextmanager
+
+# Enables the ability to share a pool of connections between multiple threads
+import queue
+
+# Enables the ability to measure how long each connection within the pool has been idle
+import time
+
+
+# snowflake.connector is imported within each function, rather than when the connector is imported
+    # Importing snowflake.connector takes longer than any other step within this connector, therefore it is only imported once it is needed
+
+
+# A pool of connections to the Snowflake data warehouse
+    # Connecting to Snowflake takes longer than most small SQL queries, therefore each connection is reused by multiple SQL queries
+        # connection_parameters are the credentials and settings used for each connection, such as user, password, account, role, warehouse, database and schema
+            # The role, warehouse, database and schema are assigned when connecting, rather than running separate USE commands after connecting
+    # Connections that have been idle for longer than health_check_seconds are verified with Snowflake when checked out
+class ConnectionPool:
+
+    def __init__(self, pool_size = 4, health_check_seconds = 300, **connection_parameters):
+
+        self.pool_size = pool_size
+
+        self.health_check_seconds = health_check_seconds
+
+        # Keeps each connection logged in while the connection is idle within the pool, rather than the session expiring after 4 hours
+        self.connection_parameters = {"client_session_keep_alive": True, **connection_parameters}
+
+        # The pool starts with empty slots, therefore connections are only created once they are needed
+            # The most recently used connection is handed out first, which keeps the number of idle connections small
+        self.pool = queue.LifoQueue(maxsize = pool_size)
+
+        for _ in range(pool_size):
+
+            self.pool.put((None, None))
+
+    # Verify if a connection within the pool can still be used
+    def is_healthy(self, dw_conn, last_used):
+
+        import snowflake.connector
+
+        if dw_conn is None or dw_conn.is_closed():
+
+            return False
+
+        if time.monotonic() - last_used < self.health_check_seconds:
+
+            return True
+
+        try:
+
+            with dw_conn.cursor() as health_check_cur:
+
+                health_check_cur.execute("SELECT 1")
+
+            return True
+
+        except snowflake.connector.errors.Error:
+
+            return False
+
+    # Check out a connection from the pool, then return the connection to the pool after the with block is exited
+        # If all of the connections are checked out, wait until a connection is returned to the pool
+    @contextmanager
+    def connection(self):
+
+        import snowflake.connector
+
+        dw_conn, last_used = self.pool.get()
+
+        try:
+
+            if not self.is_healthy(dw_conn, last_used):
+
+                if dw_conn is not None:
+
+                    dw_conn.close()
+
+                dw_conn = None
+
+                dw_conn = snowflake.connector.connect(**self.connection_parameters)
+
+            yield dw_conn
+
+        finally:
+
+            self.pool.put((dw_conn, time.monotonic()))
+
+    # Close all of the connections within the pool
+        # Only close the connections once all of the SQL queries have completed
+    def close(self):
+
+        while not self.pool.empty():
+
+            dw_conn, last_used = self.pool.get()
+
+            if dw_conn is not None:
+
+                dw_conn.close()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc_info):
+
+        self.close()
+
+
+# Define the function that widens the numeric data types of the schema of the first Arrow batch
+    # Snowflake returns each batch of a NUMBER column using the smallest data type that fits the values within the batch, such as int8 within 1 batch and int64 within a later batch
+        # The Parquet file uses 1 schema for every batch, therefore each integer column is widened to int64 and each decimal column is widened to the largest precision
+    # Integer columns stay int64 by default, even though INTEGER columns within Snowflake are NUMBER(38,0), as decimal128 columns are loaded into Pandas DataFrames as Python Decimal objects, which use far more memory
+        # A batch with a value that does not fit into int64 raises an ArrowInvalid error when it is cast, rather than writing an incorrect value
+    # If wide_integers_as_decimal is True, integer columns with a precision larger than 18 digits within cursor_description are widened to decimal128 instead
+        # cursor_description is the description of the cursor, which contains the precision of each NUMBER column
+def get_parquet_schema(arrow_schema, cursor_description = None, wide_integers_as_decimal = False):
+
+    import pyarrow as pa
+
+    column_precisions = {column[0]: column[4] for column in cursor_description or []} if wide_integers_as_decimal else {}
+
+    parquet_fields = []
+
+    for arrow_field in arrow_schema:
+
+        if pa.types.is_integer(arrow_field.type):
+
+            column_precision = column_precisions.get(arrow_field.name) or 0
+
+            arrow_field = arrow_field.with_type(pa.decimal128(column_precision, 0) if column_precision > 18 else pa.int64())
+
+        elif pa.types.is_decimal(arrow_field.type):
+
+            arrow_field = arrow_field.with_type(pa.decimal128(38, arrow_field.type.scale))
+
+        parquet_fields.append(arrow_field)
+
+    return pa.schema(parquet_fields, metadata = arrow_schema.metadata)
+
+
+# Define the function that streams the result set of the SQL query executed by the cursor into a Parquet file, 1 Arrow batch at a time
+    # Only the batches being processed and the chunks being downloaded are held in memory at a time
+    # wide_integers_as_decimal is passed into get_parquet_schema, which writes integer columns with a precision larger than 18 digits as decimal128 rather than int64
+    # Returns the number of rows written into the Parquet file
+        # No Parquet file is created if the result set is empty
+def write_parquet(cur, parquet_file_path, wide_integers_as_decimal = False):
+
+    import pyarrow.parquet as pq
+
+    parquet_writer = None
+
+    parquet_row_count = 0
+
+    try:
+
+        for arrow_batch in cur.fetch_arrow_batches():
+
+            if parquet_writer is None:
+
+                parquet_writer = pq.ParquetWriter(parquet_file_path, get_parquet_schema(arrow_batch.schema, cur.description, wide_integers_as_decimal))
+
+            # Cast each batch into the widened schema, as later batches can use a smaller or larger data type than the first batch
+                # safe = True raises an error for any value that does not fit into the widened data type, rather than writing an incorrect value
+            parquet_writer.write_table(arrow_batch.cast(parquet_writer.schema, safe = True))
+
+            parquet_row_count += arrow_batch.num_rows
+
+    finally:
+
+        if parquet_writer is not None:
+
+            parquet_writer.close()
+
+    return parquet_row_count
+
+
+# Define the function that writes the data from a Pandas DataFrame into a Snowflake table
+    # write_pandas splits the Pandas DataFrame into compressed Parquet files of chunk_size rows
+        # The Parquet files are uploaded into the stage of the Snowflake table, parallel files at a time, using the PUT command
+            # All of the Parquet files are then loaded into the Snowflake table using 1 COPY INTO command
+    # If auto_create_table is True, the Snowflake table is created using the columns and data types of the Pandas DataFrame, when the table does not already exist
+    # Returns the number of rows written and the number of rows written per second
+def write_dataframe(dw_conn, df, table_name, chunk_size = 100000, parallel = 4, overwrite = False, auto_create_table = False):
+
+    from snowflake.connector.pandas_tools import write_pandas
+
+    write_start_time = time.perf_counter()
+
+    write_success, write_chunk_count, write_row_count, write_output = write_pandas(
+        conn = dw_conn
+        ,df = df
+        ,table_name = table_name
+        ,chunk_size = chunk_size
+        ,compression = "snappy"
+        ,parallel = parallel
+        ,auto_create_table = auto_create_table
+        ,overwrite = overwrite
+    )
+
+    write_seconds = time.perf_counter() - write_start_time
+
+    if not write_success:
+
+        raise RuntimeError(f"The data could not be written into the {table_name} Snowflake table: {write_output}")
+
+    return write_row_count, write_row_count / write_seconds if write_seconds else 0.0
+
+
+# Define the function that runs multiple SQL queries at the same time using a pool of threads, 1 connection from the pool of connections per SQL query
+    # sql_queries is a dictionary of the SQL queries, using a name to identify each SQL query
+    # Returns a dictionary of the Pandas DataFrame for each SQL query, using the name of each SQL query
+def run_queries(snowflake_pool, sql_queries):
+
+    def run_query(sql):
+
+        with snowflake_pool.connection() as dw_conn:
+
+            with dw_conn.cursor() as cur:
+
+                cur.execute(sql)
+
+                return cur.fetch_pandas_all()
+
+    with ThreadPoolExecutor(max_workers = snowflake_pool.pool_size) as executor:
+
+        return dict(zip(sql_queries, executor.map(run_query, sql_queries.values())))
+
+
+# Define the function that submits multiple SQL queries to Snowflake as asynchronous SQL queries, using 1 connection
+    # sql_dependencies is a dictionary of the SQL queries that must complete before each SQL query is submitted
+        # SQL queries that are not listed do not depend on any other SQL query, therefore they are submitted straight away
+    # Up to max_queries SQL queries are running within Snowflake at the same time
+    # Returns a dictionary of the Pandas DataFrame for each SQL query, using the name of each SQL query
+def run_queries_async(dw_conn, sql_queries, sql_dependencies = None, max_queries = 8, poll_seconds = 1):
+
+    sql_dependencies = sql_dependencies or {}
+
+    sql_data = {}
+
+    sql_waiting_list = list(sql_queries)
+
+    sql_running = {}
+
+    while sql_waiting_list or sql_running:
+
+        for sql_name in list(sql_waiting_list):
+
+            if len(sql_running) >= max_queries:
+
+                break
+
+            if all(sql_dependency in sql_data for sql_dependency in sql_dependencies.get(sql_name, [])):
+
+                with dw_conn.cursor() as cur:
+
+                    cur.execute_async(sql_queries[sql_name])
+
+                    sql_running[sql_name] = cur.sfqid
+
+                sql_waiting_list.remove(sql_name)
+
+        if not sql_running:
+
+            raise ValueError(f"The dependencies of the following SQL queries can not be met: {sql_waiting_list}")
+
+        time.sleep(poll_seconds)
+
+        for sql_name, sql_query_id in list(sql_running.items()):
+
+            # Stop the data pipeline if the SQL query failed
+            sql_status = dw_conn.get_query_status_throw_if_error(sql_query_id)
+
+            if dw_conn.is_still_running(sql_status):
+
+                continue
+
+            with dw_conn.cursor() as cur:
+
+                cur.get_results_from_sfqid(sql_query_id)
+
+                sql_data[sql_name] = cur.fetch_pandas_all()
+
+            del sql_running[sql_name]
+
+    return sql_data
@@ -0,0 +1,5 @@
+"""
+    The tests of the data connectors, which use local stand-ins rather than connecting to S3, Azure Blob Storage, SFTP or Snowflake
+
+    Run the tests using: python -m unittest discover data_connectors
+"""
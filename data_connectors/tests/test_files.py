@@ -0,0 +1,293 @@
+"""
+    Tests of the files connector, using files created in memory rather than downloaded from a source
+"""
+
+
+import bz2
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import io
+import threading
+import time
+import unittest
+
+from data_connectors import files
+
+try:
+
+    import pandas as pd
+    import pyarrow
+
+except ImportError:
+
+    pd = None
+
+try:
+
+    import zstandard
+
+except ImportError:
+
+    zstandard = None
+
+
+# A stand-in for a file that can only be read once, such as the StreamingBody returned by AWS S3
+    # Only read is available, therefore the first bytes can not be read again using seek
+class NonSeekableFile:
+
+    def __init__(self, file_bytes):
+
+        self.file_data = io.BytesIO(file_bytes)
+
+    def read(self, size = -1):
+
+        return self.file_data.read(size)
+
+
+class MapInOrderTest(unittest.TestCase):
+
+    # No more than max_in_progress items are taken from items before the oldest result is used, and the results keep the order of items
+    def test_items_in_progress_are_bounded(self):
+
+        items_taken = []
+
+        items_lock = threading.Lock()
+
+        max_items_ahead = 0
+
+        def get_items():
+
+            for item_number in range(40):
+
+                with items_lock:
+
+                    items_taken.append(item_number)
+
+                yield item_number
+
+        def double_item(item_number):
+
+            time.sleep((item_number % 3) / 1000)
+
+            return item_number * 2
+
+        results = []
+
+        with ThreadPoolExecutor(max_workers = 4) as executor:
+
+            for result in files.map_in_order(executor, double_item, get_items(), 8):
+
+                results.append(result)
+
+                max_items_ahead = max(max_items_ahead, len(items_taken) - len(results))
+
+        self.assertEqual(results, [item_number * 2 for item_number in range(40)])
+
+        self.assertLessEqual(max_items_ahead, 8)
+
+    # The error of a failed item is raised when its result is reached
+    def test_failed_item_raises_error(self):
+
+        def check_item(item_number):
+
+            if item_number == 3:
+
+                raise ValueError("The item could not be processed")
+
+            return item_number
+
+        with ThreadPoolExecutor(max_workers = 2) as executor:
+
+            with self.assertRaises(ValueError):
+
+                list(files.map_in_order(executor, check_item, range(10), 4))
+
+
+class CompressionTest(unittest.TestCase):
+
+    file_bytes = b"name,amount\n" + b"".join(f"name_{row_number},{row_number}.5\n".encode() for row_number in range(1000))
+
+    # The compression is identified from the extension of the file name, without reading the file
+    def test_compression_from_file_name(self):
+
+        for file_name, compression in (("data.csv.gz", "gzip"), ("data.CSV.BZ2", "bz2"), ("data.csv.zst", "zstd")):
+
+            file_data = NonSeekableFile(b"")
+
+            self.assertEqual(files.get_compression(file_data, file_name), (compression, file_data))
+
+    # The compression is identified from the first bytes of a file that can only be read once, and the returned file still starts at the first byte
+    def test_compression_from_non_seekable_file(self):
+
+        for compressed_bytes, compression in ((gzip.compress(self.file_bytes), "gzip"), (bz2.compress(self.file_bytes), "bz2"), (self.file_bytes, None)):
+
+            file_compression, file_data = files.get_compression(NonSeekableFile(compressed_bytes), "data.csv")
+
+            self.assertEqual(file_compression, compression)
+
+            self.assertEqual(file_data.read(), compressed_bytes)
+
+    # The compression is identified from the first bytes of a seekable file, which is moved back to where it was
+    def test_compression_from_seekable_file(self):
+
+        file_data = io.BytesIO(gzip.compress(self.file_bytes))
+
+        self.assertEqual(files.get_compression(file_data), ("gzip", file_data))
+
+        self.assertEqual(file_data.tell(), 0)
+
+    # PrefixedFile returns the bytes that were already read, followed by the rest of the file, no matter the size of each read
+    def test_prefixed_file(self):
+
+        prefixed_file = files.PrefixedFile(b"abcd", NonSeekableFile(b"efghij"))
+
+        self.assertEqual([prefixed_file.read(3) for _ in range(4)], [b"abc", b"d", b"efg", b"hij"])
+
+        self.assertEqual(prefixed_file.read(3), b"")
+
+    # Compressed files are decompressed as they are read, from bytes or from a file that can only be read once
+    def test_open_decompressed(self):
+
+        for compressed_bytes in (gzip.compress(self.file_bytes), bz2.compress(self.file_bytes), self.file_bytes):
+
+            self.assertEqual(files.open_decompressed(compressed_bytes).read(), self.file_bytes)
+
+            self.assertEqual(files.open_decompressed(NonSeekableFile(compressed_bytes)).read(), self.file_bytes)
+
+        # A file with multiple gzip members, such as files written in multiple parts, is read as 1 file
+        self.assertEqual(files.open_decompressed(gzip.compress(self.file_bytes[:100]) + gzip.compress(self.file_bytes[100:])).read(), self.file_bytes)
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_open_decompressed_zstd(self):
+
+        compressed_bytes = zstandard.ZstdCompressor().compress(self.file_bytes)
+
+        self.assertEqual(files.open_decompressed(NonSeekableFile(compressed_bytes), "data.csv.zst").read(), self.file_bytes)
+
+        self.assertEqual(files.open_decompressed(NonSeekableFile(compressed_bytes)).read(), self.file_bytes)
+
+    # Each output compression has a matching extension, while Parquet and Feather files keep their own extension
+    def test_output_extension(self):
+
+        self.assertEqual(files.get_output_extension("csv", "gzip"), ".csv.gz")
+        self.assertEqual(files.get_output_extension("csv", "bz2"), ".csv.bz2")
+        self.assertEqual(files.get_output_extension("csv", "zstd"), ".csv.zst")
+        self.assertEqual(files.get_output_extension("csv", None), ".csv")
+        self.assertEqual(files.get_output_extension("parquet", "zstd"), ".parquet")
+
+    # Compressed CSV files written by write_output are read back by read_file with the same data
+    @unittest.skipIf(pd is None, "pandas and pyarrow are not installed")
+    def test_write_output_round_trip(self):
+
+        file_columns = {"name": "string[pyarrow]", "amount": "Float64"}
+
+        df = files.read_file(io.BytesIO(self.file_bytes), file_columns)
+
+        for output_compression, decompress in (("gzip", gzip.decompress), ("bz2", bz2.decompress)):
+
+            output_bytes = files.write_output(df, "csv", output_compression).getvalue()
+
+            self.assertEqual(files.get_compression(io.BytesIO(output_bytes))[0], output_compression)
+
+            self.assertEqual(len(decompress(output_bytes).splitlines()), 1001)
+
+            pd.testing.assert_frame_equal(files.read_file(NonSeekableFile(output_bytes), file_columns), df)
+
+            pd.testing.assert_frame_equal(files.read_file(NonSeekableFile(output_bytes), file_columns, engine = "pyarrow", file_name = f"data{files.get_output_extension('csv', output_compression)}"), df)
+
+
+class GetParseEngineTest(unittest.TestCase):
+
+    # The "pyarrow" engine is kept for the options it supports
+    def test_supported_options_keep_pyarrow(self):
+
+        self.assertEqual(files.get_parse_engine("pyarrow", ","), "pyarrow")
+
+        self.assertEqual(files.get_parse_engine("pyarrow", "|", chunk_size = 1000), "pyarrow")
+
+        self.assertEqual(files.get_parse_engine("c", ","), "c")
+
+    # names is only supported by the "pyarrow" engine when the file is streamed using pyarrow.csv.open_csv
+    def test_names_falls_back_when_loading_entire_file(self):
+
+        self.assertEqual(files.get_parse_engine("pyarrow", ",", ["name", "amount"]), "c")
+
+        self.assertEqual(files.get_parse_engine("pyarrow", ",", ["name", "amount"], 1000), "pyarrow")
+
+    # Options that the "pyarrow" engine does not support fall back to the "c" engine
+    def test_unsupported_options_fall_back(self):
+
+        self.assertEqual(files.get_parse_engine("pyarrow", "||"), "c")
+
+        self.assertEqual(files.get_parse_engine("pyarrow", ",", nrows = 10), "c")
+
+        self.assertEqual(files.get_parse_engine("pyarrow", ",", chunk_size = 1000, skiprows = 1), "c")
+
+
+@unittest.skipIf(pd is None, "pandas and pyarrow are not installed")
+class ReadFileTest(unittest.TestCase):
+
+    file_columns = {"name": "string[pyarrow]", "amount": "Float64", "count": "Int64"}
+
+    file_names = ["name", "unused", "amount", "count"]
+
+    file_rows = b"a,x,1.5,1\nb,y,,2\nc,z,3.25,\n"
+
+    # Load the same file using both engines, loading the entire file and streaming the file in chunks, then verify that every Pandas DataFrame matches
+    def assert_engines_match(self, file_data, names):
+
+        all_data = []
+
+        for engine in ("c", "pyarrow"):
+
+            all_data.append(files.read_file(io.BytesIO(file_data), self.file_columns, names = names, engine = engine))
+
+            df_chunks = list(files.read_file(io.BytesIO(file_data), self.file_columns, names = names, chunk_size = 2, engine = engine))
+
+            self.assertEqual([len(df_chunk) for df_chunk in df_chunks], [2, 1])
+
+            all_data.append(pd.concat(df_chunks, ignore_index = True))
+
+        for df in all_data:
+
+            self.assertEqual(list(df.columns), list(self.file_columns))
+
+            self.assertEqual({column_name: str(column_dtype) for column_name, column_dtype in df.dtypes.items()}, {column_name: str(pd.api.types.pandas_dtype(column_dtype)) for column_name, column_dtype in self.file_columns.items()})
+
+            pd.testing.assert_frame_equal(df, all_data[0])
+
+        self.assertEqual(all_data[0]["name"].tolist(), ["a", "b", "c"])
+
+        self.assertTrue(pd.isna(all_data[0]["amount"].iloc[1]))
+
+    def test_engines_match_with_header(self):
+
+        self.assert_engines_match(b"name,unused,amount,count\n" + self.file_rows, None)
+
+    def test_engines_match_with_names(self):
+
+        self.assert_engines_match(self.file_rows, self.file_names)
+
+
+@unittest.skipIf(pd is None, "pandas and pyarrow are not installed")
+class ParseFilesTest(unittest.TestCase):
+
+    # The Pandas DataFrames are returned in the same order as the files, using the data types within file_columns
+    def test_parse_files_keeps_order(self):
+
+        file_columns = {"name": "string[pyarrow]", "amount": "Float64"}
+
+        all_file_data = [f"name,amount,unused\nfile_{file_number},{file_number}.5,x\n".encode() for file_number in range(6)]
+
+        all_data = files.parse_files(iter(all_file_data), file_columns, max_workers = 2)
+
+        self.assertEqual([df["name"].iloc[0] for df in all_data], [f"file_{file_number}" for file_number in range(6)])
+
+        self.assertEqual(list(all_data[0].columns), list(file_columns))
+
+        self.assertEqual(str(all_data[0]["amount"].dtype), "Float64")
+
+
+if __name__ == "__main__":
+
+    unittest.main()
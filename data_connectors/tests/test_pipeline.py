@@ -0,0 +1,221 @@
+"""
+    Tests of the pipeline connector, using local stand-ins rather than connecting to a source
+"""
+
+
+import asyncio
+import threading
+import time
+import unittest
+
+from data_connectors import pipeline
+
+
+# Define the function used by the stage that runs within a pool of processes
+    # Functions passed into a pool of processes must be defined at the top level of a module, so that they can be pickled
+def square_item(item):
+
+    return item * item
+
+
+class RunPipelineTest(unittest.TestCase):
+
+    # The results are returned in the same order as the source, even though the stages complete the items in any order
+    def test_results_keep_source_order(self):
+
+        def delay_item(item):
+
+            time.sleep((item % 4) / 1000)
+
+            return item
+
+        results, pipeline_stats = pipeline.run_pipeline(
+            range(40)
+            ,[
+                pipeline.Stage("delay", delay_item, max_workers = 4)
+                ,pipeline.Stage("double", lambda item: item * 2, max_workers = 3)
+            ]
+            ,queue_size = 2
+        )
+
+        self.assertEqual(results, [item * 2 for item in range(40)])
+
+        self.assertEqual([stats["items"] for stats in pipeline_stats.values()], [40, 40])
+
+    # An empty source returns no results, rather than waiting forever
+    def test_empty_source(self):
+
+        results, pipeline_stats = pipeline.run_pipeline(iter([]), [pipeline.Stage("double", lambda item: item * 2, max_workers = 2)])
+
+        self.assertEqual(results, [])
+
+        self.assertEqual(pipeline_stats["double"]["items"], 0)
+
+    # A stage that fails stops the data pipeline, and the error is raised once every thread has stopped
+    def test_stage_error_is_raised(self):
+
+        sink_items = []
+
+        def check_item(item):
+
+            if item == 5:
+
+                raise ValueError("The item could not be processed")
+
+            return item
+
+        pipeline_threads = threading.active_count()
+
+        with self.assertRaises(ValueError):
+
+            pipeline.run_pipeline(
+                range(1000)
+                ,[
+                    pipeline.Stage("check", check_item, max_workers = 2)
+                    ,pipeline.Stage("sink", sink_items.append)
+                ]
+                ,queue_size = 2
+            )
+
+        # The data pipeline stops shortly after the error, rather than processing every item
+        self.assertLess(len(sink_items), 1000)
+
+        self.assertEqual(threading.active_count(), pipeline_threads)
+
+    # A source that fails stops the data pipeline, and the error is raised
+    def test_source_error_is_raised(self):
+
+        def read_items():
+
+            yield 1
+
+            raise OSError("The source could not be listed")
+
+        with self.assertRaises(OSError):
+
+            pipeline.run_pipeline(read_items(), [pipeline.Stage("double", lambda item: item * 2)])
+
+    # A stage can run within a pool of processes
+    def test_process_stage(self):
+
+        results, _ = pipeline.run_pipeline(
+            range(10)
+            ,[
+                pipeline.Stage("square", square_item, max_workers = 2, use_processes = True)
+                ,pipeline.Stage("double", lambda item: item * 2)
+            ]
+        )
+
+        self.assertEqual(results, [item * item * 2 for item in range(10)])
+
+    # A slow sink stops the source from reading ahead, as each queue holds up to queue_size items
+    def test_queue_depth_is_bounded(self):
+
+        queue_size = 3
+
+        items_read = []
+
+        items_written = []
+
+        def read_items():
+
+            for item in range(60):
+
+                items_read.append(item)
+
+                yield item
+
+        def write_item(item):
+
+            time.sleep(0.002)
+
+            items_written.append(item)
+
+            # The source can only be ahead of the sink by the items within each queue, plus the items being processed by each stage and the item being placed into the first queue
+            self.assertLessEqual(len(items_read) - len(items_written), 2 * queue_size + 2 + 1)
+
+            return item
+
+        results, pipeline_stats = pipeline.run_pipeline(
+            read_items()
+            ,[
+                pipeline.Stage("transform", lambda item: item)
+                ,pipeline.Stage("sink", write_item)
+            ]
+            ,queue_size = queue_size
+        )
+
+        self.assertEqual(results, list(range(60)))
+
+        for stats in pipeline_stats.values():
+
+            self.assertLessEqual(stats["max_queue_depth"], queue_size)
+
+        # The sink is the slowest stage, therefore the queue in front of the sink fills up
+        self.assertGreater(pipeline_stats["sink"]["max_queue_depth"], 0)
+
+
+class RunTransfersAsyncTest(unittest.TestCase):
+
+    # The results are returned in the order the files were listed, even though the transfers complete in any order
+    def test_results_keep_listing_order(self):
+
+        async def list_files():
+
+            for file_number in range(50):
+
+                yield file_number
+
+        async def transfer_file(file_number):
+
+            await asyncio.sleep((50 - file_number) / 10000)
+
+            return file_number * 2
+
+        self.assertEqual(asyncio.run(pipeline.run_transfers_async(list_files, transfer_file, transfers_in_progress = 8, queue_size = 4)), [file_number * 2 for file_number in range(50)])
+
+    # A failed transfer cancels every other transfer before the error is raised, rather than leaving them running in the background
+    def test_failed_transfer_cancels_other_transfers(self):
+
+        cancelled_transfers = []
+
+        async def list_files():
+
+            for file_number in range(20):
+
+                yield file_number
+
+        async def transfer_file(file_number):
+
+            if file_number == 0:
+
+                await asyncio.sleep(0.01)
+
+                raise ValueError("The file could not be downloaded")
+
+            try:
+
+                await asyncio.sleep(10)
+
+            except asyncio.CancelledError:
+
+                cancelled_transfers.append(file_number)
+
+                raise
+
+        async def run_and_count_tasks():
+
+            with self.assertRaises(ValueError):
+
+                await pipeline.run_transfers_async(list_files, transfer_file, transfers_in_progress = 4, queue_size = 4)
+
+            return len(asyncio.all_tasks())
+
+        self.assertEqual(asyncio.run(run_and_count_tasks()), 1)
+
+        self.assertEqual(sorted(cancelled_transfers), [1, 2, 3])
+
+
+if __name__ == "__main__":
+
+    unittest.main()
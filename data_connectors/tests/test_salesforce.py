@@ -0,0 +1,147 @@
+"""
+    Tests of the salesforce connector, using a stand-in Salesforce session that emulates the Bulk API 2.0 endpoints rather than connecting to Salesforce
+"""
+
+
+from types import SimpleNamespace
+import unittest
+
+from data_connectors import salesforce
+
+try:
+
+    import pandas as pd
+
+except ImportError:
+
+    pd = None
+
+
+# A stand-in for the response returned by the requests session
+class StandInResponse:
+
+    def __init__(self, json_data = None, content = b"", headers = None):
+
+        self.json_data = json_data
+
+        self.content = content
+
+        self.headers = headers or {}
+
+    def json(self):
+
+        return self.json_data
+
+    def raise_for_status(self):
+
+        pass
+
+
+# A stand-in for the requests session used by simple_salesforce, which emulates the Bulk API 2.0 query endpoints
+    # job_states are returned in order each time the state of the query job is requested
+    # result_pages are the CSV data and the locator of the next page for each page of results, in order
+class StandInBulkSession:
+
+    def __init__(self, job_states, result_pages = ()):
+
+        self.job_states = list(job_states)
+
+        self.result_pages = list(result_pages)
+
+        self.requests = []
+
+    def post(self, url, headers = None, json = None):
+
+        self.requests.append(("POST", url, json))
+
+        return StandInResponse({"id": "750000000000001"})
+
+    def get(self, url, headers = None, params = None):
+
+        self.requests.append(("GET", url, params))
+
+        if url.endswith("/results"):
+
+            page_content, page_locator = self.result_pages.pop(0)
+
+            return StandInResponse(content = page_content, headers = {"Sforce-Locator": page_locator})
+
+        return StandInResponse({"state": self.job_states.pop(0)})
+
+
+# Create a stand-in for the Salesforce connection, which only provides the attributes used by bulk_query
+def get_stand_in_sf(bulk_session):
+
+    return SimpleNamespace(session = bulk_session, base_url = "https://example.my.salesforce.com/services/data/v59.0/", headers = {"Authorization": "Bearer token"})
+
+
+@unittest.skipIf(pd is None, "pandas is not installed")
+class BulkQueryTest(unittest.TestCase):
+
+    # The state of the query job is polled until the job is complete, then each page is downloaded until the locator is "null"
+    def test_polls_job_and_pages_results(self):
+
+        bulk_session = StandInBulkSession(
+            ["UploadComplete", "InProgress", "JobComplete"]
+            ,[
+                (b"Id,Name\n001,Acme\n002,Globex\n", "page2")
+                ,(b"Id,Name\n003,Initech\n", "page3")
+                ,(b"Id,Name\n004,Umbrella\n", "null")
+            ]
+        )
+
+        df = salesforce.bulk_query(get_stand_in_sf(bulk_session), "SELECT Id, Name FROM Account", include_deleted = True, max_records = 2, poll_seconds = 0)
+
+        self.assertEqual(df["Name"].tolist(), ["Acme", "Globex", "Initech", "Umbrella"])
+
+        self.assertEqual(bulk_session.requests[0][2], {"operation": "queryAll", "query": "SELECT Id, Name FROM Account"})
+
+        self.assertEqual(len([request for request in bulk_session.requests if not request[1].endswith("/results") and request[0] == "GET"]), 3)
+
+        result_params = [request[2] for request in bulk_session.requests if request[1].endswith("/results")]
+
+        self.assertEqual(result_params, [{"maxRecords": 2}, {"maxRecords": 2, "locator": "page2"}, {"maxRecords": 2, "locator": "page3"}])
+
+    # A query job that failed or was aborted raises an error, rather than downloading the results
+    def test_failed_or_aborted_job_raises_error(self):
+
+        for bulk_job_state in ("Failed", "Aborted"):
+
+            bulk_session = StandInBulkSession(["InProgress", bulk_job_state])
+
+            with self.assertRaises(RuntimeError):
+
+                salesforce.bulk_query(get_stand_in_sf(bulk_session), "SELECT Id FROM Account", poll_seconds = 0)
+
+            self.assertFalse(any(request[1].endswith("/results") for request in bulk_session.requests))
+
+    # A page without any data is loaded as an empty Pandas DataFrame, rather than raising an EmptyDataError
+    def test_empty_result_pages(self):
+
+        bulk_session = StandInBulkSession(["JobComplete"], [(b"Id,Name\n001,Acme\n", "page2"), (b"", "null")])
+
+        df = salesforce.bulk_query(get_stand_in_sf(bulk_session), "SELECT Id, Name FROM Account", poll_seconds = 0)
+
+        self.assertEqual(df["Name"].tolist(), ["Acme"])
+
+        bulk_session = StandInBulkSession(["JobComplete"], [(b"", "null")])
+
+        self.assertTrue(salesforce.bulk_query(get_stand_in_sf(bulk_session), "SELECT Id FROM Account", poll_seconds = 0).empty)
+
+
+@unittest.skipIf(pd is None, "pandas is not installed")
+class BenchmarkQueryTest(unittest.TestCase):
+
+    # Both methods are measured for each number of records, and collecting the values for each column uses less memory than holding every record
+    def test_benchmark_query(self):
+
+        benchmark_results = salesforce.benchmark_query(record_counts = (100, 2000), field_count = 4)
+
+        self.assertEqual([(result["records"], result["method"]) for result in benchmark_results], [(100, "records"), (100, "columns"), (2000, "records"), (2000, "columns")])
+
+        self.assertLess(benchmark_results[3]["peak_bytes"], benchmark_results[2]["peak_bytes"])
+
+
+if __name__ == "__main__":
+
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+    Tests of the sftp connector, using a stand-in SSH client that serves files held in memory rather than connecting to a SFTP SSH server
+"""
+
+
+import threading
+import unittest
+
+from data_connectors import sftp
+
+
+# A stand-in for an open SFTP file, which returns each requested block of the file
+class StandInRemoteFile:
+
+    def __init__(self, file_data):
+
+        self.file_data = file_data
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc_info):
+
+        pass
+
+    def stat(self):
+
+        return type("FileStat", (), {"st_size": len(self.file_data)})
+
+    def readv(self, file_blocks, max_concurrent_prefetch_requests = None):
+
+        for block_start, block_size in file_blocks:
+
+            yield self.file_data[block_start:block_start + block_size]
+
+
+# A stand-in for a SFTP channel
+class StandInSFTP:
+
+    def __init__(self, sftp_files, ssh_client):
+
+        self.sftp_files = sftp_files
+
+        self.ssh_client = ssh_client
+
+    def open(self, sftp_file, mode):
+
+        return StandInRemoteFile(self.sftp_files[sftp_file])
+
+    def close(self):
+
+        with self.ssh_client.channel_lock:
+
+            self.ssh_client.open_channels -= 1
+
+
+# A stand-in for a SSH connection, which counts the SFTP channels that are open
+class StandInSSHClient:
+
+    def __init__(self, sftp_files):
+
+        self.sftp_files = sftp_files
+
+        self.channel_lock = threading.Lock()
+
+        self.open_channels = 0
+
+    def open_sftp(self):
+
+        with self.channel_lock:
+
+            self.open_channels += 1
+
+        return StandInSFTP(self.sftp_files, self)
+
+
+class BenchmarkDownloadFilesTest(unittest.TestCase):
+
+    # Every file is downloaded in full for each number of SFTP channels and block size, and every SFTP channel is closed afterwards
+    def test_every_combination_downloads_every_file(self):
+
+        ssh_client = StandInSSHClient({f"inbound/file_{file_number}.csv": bytes(100000 + file_number) for file_number in range(5)})
+
+        benchmark_results = sftp.benchmark_download_files(
+            ssh_client
+            ,"inbound"
+            ,[f"file_{file_number}.csv" for file_number in range(5)]
+            ,channel_counts = (1, 3)
+            ,block_sizes = (32768, 65536)
+        )
+
+        self.assertEqual([(result["block_size"], result["max_channels"]) for result in benchmark_results], [(32768, 1), (32768, 3), (65536, 1), (65536, 3)])
+
+        self.assertTrue(all(result["bytes"] == sum(100000 + file_number for file_number in range(5)) for result in benchmark_results))
+
+        self.assertEqual(ssh_client.open_channels, 0)
+
+
+if __name__ == "__main__":
+
+    unittest.main()
@@ -0,0 +1,458 @@
+"""
+    Tests of the snowflake connector, using stand-in connections and cursors rather than connecting to Snowflake
+"""
+
+
+import os
+import tempfile
+import unittest
+
+from data_connectors import snowflake
+
+try:
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+except ImportError:
+
+    pa = None
+
+try:
+
+    import pandas as pd
+    from snowflake.connector import pandas_tools
+
+except ImportError:
+
+    pd = None
+
+
+# A stand-in for a Snowflake cursor, which returns each Arrow batch in order
+    # description follows the Snowflake cursor description: name, type_code, display_size, internal_size, precision, scale, is_nullable
+class StandInCursor:
+
+    def __init__(self, arrow_batches, description = None):
+
+        self.arrow_batches = arrow_batches
+
+        self.description = description
+
+    def fetch_arrow_batches(self):
+
+        return iter(self.arrow_batches)
+
+
+# A stand-in for the cursor used by write_pandas, which records each SQL statement and each staged Parquet file rather than running them
+    # Newer versions of snowflake-connector-python upload each Parquet file using cursor._upload, while older versions run a PUT command using cursor.execute
+        # Both are recorded as a PUT statement
+class StandInWriteCursor:
+
+    def __init__(self, connection):
+
+        self.connection = connection
+
+        self.sql = ""
+
+    def execute(self, sql, params = None, **kwargs):
+
+        self.sql = " ".join(sql.split())
+
+        self.connection.statements.append((self.sql, params))
+
+        if self.sql.startswith("PUT "):
+
+            self.stage_file(self.sql.split()[1], kwargs.get("options", {}))
+
+        return self
+
+    def _upload(self, local_file_name, stage_location, options):
+
+        self.connection.statements.append((f"PUT {local_file_name} {stage_location}", None))
+
+        self.stage_file(local_file_name, options)
+
+    # Record the number of rows within each staged Parquet file, as the file is removed once it has been uploaded
+    def stage_file(self, local_file_name, options):
+
+        file_path = local_file_name.strip("'").replace("file://", "", 1)
+
+        self.connection.staged_files.append({"rows": pq.read_metadata(file_path).num_rows, "options": options})
+
+    def fetchall(self):
+
+        if "infer_schema" in self.sql:
+
+            return [(column_name, "NUMBER(38,0)") for column_name in self.connection.column_names]
+
+        if self.sql.startswith("COPY INTO"):
+
+            return [
+                (f"file{file_number}.txt", self.connection.copy_status, staged_file["rows"], staged_file["rows"], 1, 0, None, None, None, None)
+                for file_number, staged_file in enumerate(self.connection.staged_files)
+            ]
+
+        return []
+
+    def close(self):
+
+        pass
+
+    def _log_telemetry_job_data(self, *args):
+
+        pass
+
+
+# A stand-in for a Snowflake connection, which collects the SQL statements and staged Parquet files of every cursor
+    # copy_status is returned by COPY INTO for each staged Parquet file, such as "LOADED" or "LOAD_FAILED"
+class StandInWriteConnection:
+
+    def __init__(self, column_names, copy_status = "LOADED"):
+
+        self.column_names = column_names
+
+        self.copy_status = copy_status
+
+        self.statements = []
+
+        self.staged_files = []
+
+        self._session_parameters = {}
+
+    def cursor(self):
+
+        return StandInWriteCursor(self)
+
+    # The SQL statements that start with the keyword, in the order they were run
+    def get_statements(self, keyword):
+
+        return [(sql, params) for sql, params in self.statements if sql.startswith(keyword)]
+
+
+@unittest.skipIf(pd is None or pa is None, "snowflake-connector-python[pandas] is not installed")
+class WriteDataframeTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.df = pd.DataFrame({"ID": range(5), "NAME": ["a", "b", "c", "d", "e"]})
+
+        self.dw_conn = StandInWriteConnection(list(self.df.columns))
+
+    # Each chunk is staged as a separate Parquet file using PUT, then every Parquet file is loaded using 1 COPY INTO command
+    def test_put_and_copy_statements(self):
+
+        write_row_count, write_rows_per_second = snowflake.write_dataframe(self.dw_conn, self.df, "TARGET_TABLE", chunk_size = 2, parallel = 3)
+
+        self.assertEqual(write_row_count, 5)
+
+        self.assertEqual(len(self.dw_conn.get_statements("PUT ")), 3)
+
+        self.assertEqual([staged_file["rows"] for staged_file in self.dw_conn.staged_files], [2, 2, 1])
+
+        self.assertTrue(all(staged_file["options"].get("parallel", 3) == 3 for staged_file in self.dw_conn.staged_files))
+
+        copy_statements = self.dw_conn.get_statements("COPY INTO")
+
+        self.assertEqual(len(copy_statements), 1)
+
+        self.assertIn("TYPE=PARQUET", copy_statements[0][0])
+
+        self.assertIn("COMPRESSION=snappy", copy_statements[0][0])
+
+        self.assertIn("TARGET_TABLE", str(copy_statements[0]))
+
+        # The Snowflake table is neither created nor truncated by default
+        self.assertFalse(any("TABLE IF NOT EXISTS" in sql or sql.startswith("TRUNCATE") for sql, _ in self.dw_conn.statements))
+
+        self.assertGreater(write_rows_per_second, 0)
+
+    # auto_create_table creates the Snowflake table when it does not already exist, before the COPY INTO command
+    def test_auto_create_table_is_passed_through(self):
+
+        snowflake.write_dataframe(self.dw_conn, self.df, "TARGET_TABLE", auto_create_table = True)
+
+        statements = [sql for sql, _ in self.dw_conn.statements]
+
+        create_table_number = next(statement_number for statement_number, sql in enumerate(statements) if "TABLE IF NOT EXISTS" in sql)
+
+        copy_number = next(statement_number for statement_number, sql in enumerate(statements) if sql.startswith("COPY INTO"))
+
+        self.assertLess(create_table_number, copy_number)
+
+    # overwrite replaces the existing data within the Snowflake table, by truncating the table before the COPY INTO command
+    def test_overwrite_is_passed_through(self):
+
+        snowflake.write_dataframe(self.dw_conn, self.df, "TARGET_TABLE", overwrite = True)
+
+        statements = [sql for sql, _ in self.dw_conn.statements]
+
+        truncate_number = next(statement_number for statement_number, sql in enumerate(statements) if sql.startswith("TRUNCATE"))
+
+        copy_number = next(statement_number for statement_number, sql in enumerate(statements) if sql.startswith("COPY INTO"))
+
+        self.assertLess(truncate_number, copy_number)
+
+    # A Parquet file that is not loaded stops the data pipeline
+    def test_unsuccessful_load_raises_error(self):
+
+        dw_conn = StandInWriteConnection(list(self.df.columns), copy_status = "LOAD_FAILED")
+
+        with self.assertRaises(RuntimeError):
+
+            snowflake.write_dataframe(dw_conn, self.df, "TARGET_TABLE")
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class WriteParquetTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.parquet_file_path = os.path.join(self.temp_dir.name, "result.parquet")
+
+    def tearDown(self):
+
+        self.temp_dir.cleanup()
+
+    # The first batch uses int8, while later batches need int16 and int64 for the same NUMBER(18,0) column
+    def test_mixed_width_integers(self):
+
+        cur = StandInCursor(
+            [
+                pa.table({"ID": pa.array([1, 2], pa.int8()), "NAME": ["a", "b"]})
+                ,pa.table({"ID": pa.array([300, None], pa.int16()), "NAME": ["c", None]})
+                ,pa.table({"ID": pa.array([2 ** 40], pa.int64()), "NAME": ["d"]})
+            ]
+            ,[("ID", 0, None, None, 18, 0, True), ("NAME", 2, None, None, None, None, True)]
+        )
+
+        self.assertEqual(snowflake.write_parquet(cur, self.parquet_file_path), 5)
+
+        parquet_table = pq.read_table(self.parquet_file_path)
+
+        self.assertEqual(parquet_table.schema.field("ID").type, pa.int64())
+        self.assertEqual(parquet_table.column("ID").to_pylist(), [1, 2, 300, None, 2 ** 40])
+
+    # A NUMBER(38,0) column, such as an INTEGER column, is written as int64 by default, including batches returned as decimal128 with values that fit into int64
+    def test_wide_precision_integers_default_to_int64(self):
+
+        cur = StandInCursor(
+            [
+                pa.table({"ID": pa.array([1], pa.int8())})
+                ,pa.table({"ID": pa.array([2 ** 40], pa.decimal128(38, 0))})
+            ]
+            ,[("ID", 0, None, None, 38, 0, True)]
+        )
+
+        self.assertEqual(snowflake.write_parquet(cur, self.parquet_file_path), 2)
+
+        parquet_table = pq.read_table(self.parquet_file_path)
+
+        self.assertEqual(parquet_table.schema.field("ID").type, pa.int64())
+        self.assertEqual(parquet_table.column("ID").to_pylist(), [1, 2 ** 40])
+
+    # A value that does not fit into int64 raises an error, rather than writing an incorrect value
+    def test_integer_overflow_raises_error(self):
+
+        cur = StandInCursor(
+            [
+                pa.table({"ID": pa.array([1], pa.int8())})
+                ,pa.table({"ID": pa.array([10 ** 30], pa.decimal128(38, 0))})
+            ]
+            ,[("ID", 0, None, None, 38, 0, True)]
+        )
+
+        with self.assertRaises(pa.ArrowInvalid):
+
+            snowflake.write_parquet(cur, self.parquet_file_path)
+
+    # wide_integers_as_decimal writes integer columns with a precision larger than 18 digits as decimal128, which holds every NUMBER(38,0) value
+    def test_wide_precision_integers_as_decimal(self):
+
+        cur = StandInCursor(
+            [
+                pa.table({"ID": pa.array([1], pa.int8()), "COUNT": pa.array([1], pa.int8())})
+                ,pa.table({"ID": pa.array([10 ** 30], pa.decimal128(38, 0)), "COUNT": pa.array([300], pa.int16())})
+            ]
+            ,[("ID", 0, None, None, 38, 0, True), ("COUNT", 0, None, None, 9, 0, True)]
+        )
+
+        self.assertEqual(snowflake.write_parquet(cur, self.parquet_file_path, wide_integers_as_decimal = True), 2)
+
+        parquet_table = pq.read_table(self.parquet_file_path)
+
+        self.assertEqual(parquet_table.schema.field("ID").type, pa.decimal128(38, 0))
+        self.assertEqual(parquet_table.schema.field("COUNT").type, pa.int64())
+        self.assertEqual([int(value) for value in parquet_table.column("ID").to_pylist()], [1, 10 ** 30])
+
+    # The first batch uses a small decimal precision, while a later batch needs a larger precision with the same scale
+    def test_mixed_precision_decimals(self):
+
+        cur = StandInCursor(
+            [
+                pa.table({"AMOUNT": pa.array(["1.25"], pa.string()).cast(pa.decimal128(4, 2))})
+                ,pa.table({"AMOUNT": pa.array(["123456789012345678.50"], pa.string()).cast(pa.decimal128(20, 2))})
+            ]
+            ,[("AMOUNT", 0, None, None, 38, 2, True)]
+        )
+
+        self.assertEqual(snowflake.write_parquet(cur, self.parquet_file_path), 2)
+
+        self.assertEqual(pq.read_table(self.parquet_file_path).schema.field("AMOUNT").type, pa.decimal128(38, 2))
+
+    # No Parquet file is created if the result set is empty
+    def test_empty_result_set(self):
+
+        self.assertEqual(snowflake.write_parquet(StandInCursor([]), self.parquet_file_path), 0)
+
+        self.assertFalse(os.path.exists(self.parquet_file_path))
+
+
+# A stand-in for a Snowflake connection that runs asynchronous SQL queries
+    # query_polls is the number of times the status of each SQL query is checked before the SQL query completes, which simulates the time each SQL query takes
+    # failed_queries are the SQL queries that fail once they complete
+    # Each submitted and completed SQL query is recorded in events, in order, along with the most SQL queries running at the same time
+class StandInAsyncConnection:
+
+    def __init__(self, query_polls, failed_queries = ()):
+
+        self.query_polls = dict(query_polls)
+
+        self.failed_queries = set(failed_queries)
+
+        self.events = []
+
+        self.running_queries = set()
+
+        self.max_running_queries = 0
+
+    def cursor(self):
+
+        return StandInAsyncCursor(self)
+
+    def get_query_status_throw_if_error(self, sql_query_id):
+
+        if self.query_polls[sql_query_id] > 0:
+
+            self.query_polls[sql_query_id] -= 1
+
+            return "RUNNING"
+
+        self.running_queries.discard(sql_query_id)
+
+        if sql_query_id in self.failed_queries:
+
+            raise RuntimeError(f"{sql_query_id} failed")
+
+        return "SUCCESS"
+
+    def is_still_running(self, sql_status):
+
+        return sql_status == "RUNNING"
+
+
+# A stand-in for the cursor of StandInAsyncConnection
+    # The query id of each SQL query is the SQL query itself, and the result of each SQL query is its query id
+class StandInAsyncCursor:
+
+    def __init__(self, connection):
+
+        self.connection = connection
+
+        self.sfqid = None
+
+    def execute_async(self, sql):
+
+        self.sfqid = sql
+
+        self.connection.events.append(("submit", sql))
+
+        self.connection.running_queries.add(sql)
+
+        self.connection.max_running_queries = max(self.connection.max_running_queries, len(self.connection.running_queries))
+
+    def get_results_from_sfqid(self, sql_query_id):
+
+        self.sfqid = sql_query_id
+
+        self.connection.events.append(("complete", sql_query_id))
+
+    def fetch_pandas_all(self):
+
+        return self.sfqid
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc_info):
+
+        pass
+
+
+class RunQueriesAsyncTest(unittest.TestCase):
+
+    # Each SQL query is only submitted once all of its dependencies have completed
+    def test_dependency_order(self):
+
+        sql_queries = {"orders": "orders", "customers": "customers", "order_totals": "order_totals", "report": "report"}
+
+        sql_dependencies = {"order_totals": ["orders"], "report": ["order_totals", "customers"]}
+
+        dw_conn = StandInAsyncConnection({"orders": 3, "customers": 1, "order_totals": 2, "report": 0})
+
+        sql_data = snowflake.run_queries_async(dw_conn, sql_queries, sql_dependencies, poll_seconds = 0)
+
+        self.assertEqual(sql_data, {sql_name: sql_name for sql_name in sql_queries})
+
+        for sql_name, sql_dependency_names in sql_dependencies.items():
+
+            for sql_dependency in sql_dependency_names:
+
+                self.assertLess(dw_conn.events.index(("complete", sql_dependency)), dw_conn.events.index(("submit", sql_name)))
+
+        # SQL queries without dependencies are submitted straight away, before any SQL query completes
+        self.assertEqual(dw_conn.events[:2], [("submit", "orders"), ("submit", "customers")])
+
+    # No more than max_queries SQL queries run at the same time, and the next SQL query is submitted as soon as a running SQL query completes
+    def test_max_queries(self):
+
+        query_polls = {f"query_{query_number}": query_number % 3 for query_number in range(10)}
+
+        dw_conn = StandInAsyncConnection(query_polls)
+
+        sql_data = snowflake.run_queries_async(dw_conn, {sql_name: sql_name for sql_name in query_polls}, max_queries = 3, poll_seconds = 0)
+
+        self.assertEqual(sql_data, {sql_name: sql_name for sql_name in query_polls})
+
+        self.assertEqual(dw_conn.max_running_queries, 3)
+
+        self.assertEqual([sql_name for event, sql_name in dw_conn.events if event == "submit"], list(query_polls))
+
+    # A dependency that is not one of the SQL queries, or a circular dependency, raises an error rather than waiting forever
+    def test_unmet_dependency_raises_error(self):
+
+        for sql_dependencies in ({"report": ["missing"]}, {"orders": ["report"], "report": ["orders"]}):
+
+            dw_conn = StandInAsyncConnection({"orders": 1, "report": 0})
+
+            with self.subTest(sql_dependencies = sql_dependencies), self.assertRaisesRegex(ValueError, "report"):
+
+                snowflake.run_queries_async(dw_conn, {"orders": "orders", "report": "report"}, sql_dependencies, poll_seconds = 0)
+
+    # A failed SQL query stops the remaining SQL queries from being submitted
+    def test_failed_query_raises_error(self):
+
+        dw_conn = StandInAsyncConnection({"orders": 0, "report": 0}, failed_queries = ["orders"])
+
+        with self.assertRaisesRegex(RuntimeError, "orders failed"):
+
+            snowflake.run_queries_async(dw_conn, {"orders": "orders", "report": "report"}, {"report": ["orders"]}, poll_seconds = 0)
+
+        self.assertNotIn(("submit", "report"), dw_conn.events)
+
+
+if __name__ == "__main__":
+
+    unittest.main()